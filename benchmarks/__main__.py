@@ -0,0 +1,105 @@
+"""Run the benchmark suite and compare it with the stored baseline.
+
+    python -m benchmarks                     # full suite, compare with benchmarks/baseline.json
+    python -m benchmarks --quick             # skip the largest sizes
+    python -m benchmarks -k "batch.*" -k "viz.*"
+    python -m benchmarks --update-baseline   # accept the current numbers
+    python -m benchmarks --tolerance 0.3 --tolerance-for "viz.*=0.5"
+
+Exits with status 1 when any benchmark is slower than its baseline by more than its tolerance.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+os.chdir(ROOT)
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from benchmarks import cases  # noqa: E402,F401  (registers the benchmarks)
+from benchmarks import harness  # noqa: E402
+
+BASELINE = Path("benchmarks/baseline.json")
+RESULTS_DIR = Path("benchmarks/results")
+DEFAULT_TOLERANCE = 0.25
+
+
+def _tolerance_override(text: str):
+    pattern, _, value = text.rpartition("=")
+    if not pattern:
+        raise argparse.ArgumentTypeError("expected PATTERN=TOLERANCE, e.g. 'viz.*=0.5'")
+    return pattern, float(value)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--filter", action="append", default=[], metavar="GLOB", help="only benchmarks whose id matches (repeatable)")
+    parser.add_argument("--quick", action="store_true", help="skip the largest sizes")
+    parser.add_argument("--list", action="store_true", help="list benchmark ids and exit")
+    parser.add_argument("--out", type=Path, help="results file (default benchmarks/results/<time>.json)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=None, help=f"allowed slowdown on median time (default: baseline file, else {DEFAULT_TOLERANCE})")
+    parser.add_argument("--tolerance-for", type=_tolerance_override, action="append", default=[], metavar="GLOB=TOL")
+    parser.add_argument("--update-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--no-compare", action="store_true")
+    parser.add_argument("-v", "--verbose", action="store_true", help="keep application INFO logging on the console")
+    args = parser.parse_args(argv)
+
+    selected = harness.select(args.filter, quick=args.quick)
+    if args.list:
+        for _, bench_id, _ in selected:
+            print(bench_id)
+        return 0
+    if not selected:
+        print("No benchmarks match.", file=sys.stderr)
+        return 2
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    results = harness.run(selected)
+    out = args.out or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    doc = harness.write_results(results, out, args.quick)
+    print(f"\nResults written to {out}")
+
+    status = 0
+    if not args.no_compare and args.baseline.exists():
+        base_doc = harness.load_results(args.baseline)
+        overrides = {**base_doc.get("tolerances", {}), **dict(args.tolerance_for)}
+        tolerance = args.tolerance if args.tolerance is not None else base_doc.get("tolerance", DEFAULT_TOLERANCE)
+        rows = harness.compare(results, base_doc["results"], tolerance, overrides)
+        print()
+        print(harness.format_comparison(rows))
+        mismatch = harness.environment_mismatch(doc["environment"], base_doc.get("environment", {}))
+        if mismatch:
+            print(f"\nNote: baseline was recorded with a different {', '.join(mismatch)}; timings may not be comparable.")
+        regressions = [r["id"] for r in rows if r["status"] in ("REGRESSION", "error")]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s)/error(s): {', '.join(regressions)}")
+            status = 1
+    elif not args.no_compare and not args.update_baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+
+    if args.update_baseline:
+        previous = harness.load_results(args.baseline) if args.baseline.exists() else {}
+        merged = {**previous.get("results", {}), **{k: v for k, v in results.items() if "error" not in v}}
+        base_doc = {
+            **doc,
+            "results": merged,
+            "tolerance": previous.get("tolerance", DEFAULT_TOLERANCE),
+            "tolerances": previous.get("tolerances", {}),
+        }
+        args.baseline.write_text(json.dumps(base_doc, indent=1), encoding="utf-8")
+        print(f"Baseline updated: {args.baseline} ({len(results)} benchmark(s))")
+        status = 0
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
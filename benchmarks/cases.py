@@ -0,0 +1,275 @@
+import io
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import benchmark
+from src.model_loader import MODEL_PATH
+from utils.warmup import COVER_TYPE_MAP
+
+BATCH_SIZES = (1_000, 100_000, 1_000_000)
+HISTORY_SIZES = (1_000, 10_000, 100_000)
+CHART_ROWS = 100_000
+SEED = 42
+
+
+# --- Inputs: seeded, so every run times the same work ---
+def _model():
+    from utils.model import get_model
+    return get_model(MODEL_PATH)
+
+
+def _inputs():
+    return {
+        "elevation": 2596, "aspect": 51, "slope": 3, "horz_dist_hydro": 258, "vert_dist_hydro": 0,
+        "horz_dist_road": 510, "horz_dist_fire": 6279, "hillshade_9am": 221, "hillshade_noon": 232,
+        "hillshade_3pm": 148, "wilderness_area": "Wilderness_Area1", "soil_type": "Soil_Type29",
+    }
+
+
+def batch_frame(n: int, seed: int = SEED) -> pd.DataFrame:
+    """``n`` valid rows in the model's feature order, one-hot groups set exactly once."""
+    from utils.randomizer import random_batch
+    return random_batch(n, seed=seed, with_id=False)[_model().get_booster().feature_names]
+
+
+def _probabilities():
+    from utils.data import prepare_input_data
+    from utils.model import predict_cover_type
+    return predict_cover_type(_model(), prepare_input_data(_inputs()))[1]
+
+
+def _predictions(n: int, seed: int = SEED) -> np.ndarray:
+    return np.random.default_rng(seed).integers(1, 8, n)
+
+
+# --- Single prediction ---
+@benchmark("data.prepare_input_data")
+def prepare_input_data(_):
+    from utils.data import prepare_input_data
+    inputs = _inputs()
+    return lambda: prepare_input_data(inputs)
+
+
+@benchmark("model.predict_single")
+def predict_single(_):
+    from utils.data import prepare_input_data
+    from utils.model import predict_cover_type
+    model, X = _model(), prepare_input_data(_inputs())
+    return lambda: predict_cover_type(model, X)
+
+
+# --- Generated batch inputs (utils/randomizer) ---
+@benchmark("data.random_batch", sizes=BATCH_SIZES, unit="rows", quick_sizes=BATCH_SIZES[:2])
+def data_random_batch(n):
+    from utils.randomizer import random_batch
+    return lambda: random_batch(n, seed=SEED)
+
+
+@benchmark("data.random_batch_training", sizes=BATCH_SIZES, unit="rows", quick_sizes=BATCH_SIZES[:2])
+def data_random_batch_training(n):
+    from src.dataset import TRAIN_PATH
+    from utils.dataset_profile import load_profile
+    from utils.randomizer import random_batch
+    profile = load_profile(TRAIN_PATH)
+    return lambda: random_batch(n, seed=SEED, profile=profile)
+
+
+@benchmark("data.write_random_batch", sizes=(BATCH_SIZES[1],), unit="rows")
+def data_write_random_batch(n):
+    from utils.randomizer import write_random_batch
+    tmp = tempfile.TemporaryDirectory()
+    path = Path(tmp.name) / "batch.csv"
+    return lambda _keep=tmp: write_random_batch(path, n, seed=SEED)
+
+
+# --- Batch prediction (mirrors src/batch.py) ---
+@benchmark("batch.validate", sizes=BATCH_SIZES, unit="rows", quick_sizes=BATCH_SIZES[:2])
+def batch_validate(n):
+    from utils.data import invalid_onehot_rows
+    data = batch_frame(n)
+
+    def call():
+        invalid_onehot_rows(data, "Soil_Type")
+        invalid_onehot_rows(data, "Wilderness_Area")
+    return call
+
+
+@benchmark("batch.predict", sizes=BATCH_SIZES, unit="rows", quick_sizes=BATCH_SIZES[:2])
+def batch_predict(n):
+    model, data = _model(), batch_frame(n)
+
+    def call():
+        predictions = model.predict(data).astype(int) + 1
+        return [COVER_TYPE_MAP.get(int(i), "Unknown") for i in predictions]
+    return call
+
+
+# --- Charts: the PNG each page saves, no Streamlit preview ---
+@benchmark("viz.radar")
+def viz_radar(_):
+    from utils.viz import plot_probability_radar_chart
+    probs = _probabilities()
+    return lambda: plot_probability_radar_chart(probs, COVER_TYPE_MAP, save_path=io.BytesIO(), preview=False)
+
+
+@benchmark("viz.patch_grid")
+def viz_patch_grid(_):
+    from utils.viz import plot_patch_grid
+    probs = _probabilities()
+    return lambda: plot_patch_grid(probs, COVER_TYPE_MAP, save_path=io.BytesIO(), preview=False)
+
+
+@benchmark("viz.prediction_probabilities")
+def viz_prediction_probabilities(_):
+    from utils.viz import plot_prediction_probabilities
+    probs = _probabilities()
+    return lambda: plot_prediction_probabilities(probs, COVER_TYPE_MAP, save_path=io.BytesIO(), preview=False)
+
+
+@benchmark("viz.batch_bar", sizes=(CHART_ROWS,), unit="rows")
+def viz_batch_bar(n):
+    from utils.viz import plot_batch_bar_chart
+    predictions = _predictions(n)
+    return lambda: plot_batch_bar_chart(predictions, COVER_TYPE_MAP, save_path=io.BytesIO(), preview=False)
+
+
+@benchmark("viz.batch_pie", sizes=(CHART_ROWS,), unit="rows")
+def viz_batch_pie(n):
+    from utils.viz import plot_batch_pie_chart
+    predictions = _predictions(n)
+    return lambda: plot_batch_pie_chart(predictions, COVER_TYPE_MAP, save_path=io.BytesIO(), preview=False)
+
+
+@benchmark("viz.feature_boxplots", sizes=(CHART_ROWS,), unit="rows")
+def viz_feature_boxplots(n):
+    from utils.viz import plot_feature_boxplots
+    data, predictions = batch_frame(n), _predictions(n)
+    return lambda: plot_feature_boxplots(data, predictions, COVER_TYPE_MAP, save_path=io.BytesIO(), preview=False)
+
+
+@benchmark("viz.correlation_heatmap")
+def viz_correlation_heatmap(_):
+    from src.dataset import TRAIN_PATH
+    from utils.dataset_profile import load_profile
+    from utils.viz import plot_correlation_heatmap
+    profile = load_profile(TRAIN_PATH)
+    return lambda: plot_correlation_heatmap(profile["correlation"], profile["numeric"]).to_json()
+
+
+@benchmark("viz.class_feature_summary")
+def viz_class_feature_summary(_):
+    from src.dataset import TRAIN_PATH
+    from utils.dataset_profile import load_profile
+    from utils.viz import plot_class_feature_summary
+    profile = load_profile(TRAIN_PATH)
+    return lambda: plot_class_feature_summary(profile["classes"], 0, profile["numeric"][0], COVER_TYPE_MAP).to_json()
+
+
+# --- PDF report, with the three chart PNGs a single prediction saves ---
+@benchmark("pdf.single_patch")
+def pdf_single_patch(_):
+    from utils.pdf import generate_single_patch_pdf
+    from utils.viz import plot_patch_grid, plot_prediction_probabilities, plot_probability_radar_chart
+
+    tmp = tempfile.TemporaryDirectory()
+    probs, charts = _probabilities(), []
+    for name, plot in (("radar", plot_probability_radar_chart), ("grid", plot_patch_grid), ("bar", plot_prediction_probabilities)):
+        path = Path(tmp.name) / f"{name}.png"
+        plot(probs, COVER_TYPE_MAP, save_path=path, preview=False)
+        charts.append(str(path))
+    predicted = int(np.argmax(probs)) + 1
+
+    def call(_keep=tmp):
+        return generate_single_patch_pdf(_inputs(), predicted, COVER_TYPE_MAP[predicted], list(probs), COVER_TYPE_MAP, charts=charts)
+    return call
+
+
+# --- History store at growing sizes (fresh SQLite file per size, no legacy import, no run folders read) ---
+def _history_record(i: int, start: datetime) -> dict:
+    return {
+        "timestamp": (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"),
+        "inputs": _inputs(),
+        "prediction": int(i % 7) + 1,
+        "prediction_name": COVER_TYPE_MAP[int(i % 7) + 1],
+        "confidence": 50 + (i % 50),
+        "path": f"Saved_Predictions/single/bench_{i}",
+    }
+
+
+def _history_batch_record(i: int, start: datetime) -> dict:
+    # --- class_counts inline, so aggregating never falls back to reading the run's CSV ---
+    return {
+        "timestamp": (start + timedelta(minutes=10 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+        "file": f"bench_{i}.csv",
+        "rows": 1000,
+        "path": f"Saved_Predictions/batch/bench_{i}",
+        "class_counts": {str(c): 1000 // 7 + (c <= 1000 % 7) for c in range(1, 8)},
+    }
+
+
+def _history_store(n: int):
+    from utils.history_store import HistoryStore
+
+    tmp = tempfile.TemporaryDirectory()
+    store = HistoryStore(Path(tmp.name) / "history.db", legacy_file=None)
+    conn = store._connect()
+    start = datetime(2024, 1, 1)
+    conn.execute("BEGIN IMMEDIATE")
+    for i in range(n):
+        store._insert(conn, "single", _history_record(i, start))
+    for i in range(n // 10):
+        store._insert(conn, "batch", _history_batch_record(i, start))
+    conn.execute("COMMIT")
+    store.compact()
+    return tmp, store
+
+
+@benchmark("history.append", sizes=HISTORY_SIZES, quick_sizes=HISTORY_SIZES[:2])
+def history_append(n):
+    tmp, store = _history_store(n)
+    record = _history_record(n, datetime(2030, 1, 1))
+    return lambda _keep=tmp: store.append("single", record)
+
+
+@benchmark("history.page_first", sizes=HISTORY_SIZES, quick_sizes=HISTORY_SIZES[:2])
+def history_page_first(n):
+    tmp, store = _history_store(n)
+    return lambda _keep=tmp: store.page("single", limit=25)
+
+
+@benchmark("history.page_deep", sizes=HISTORY_SIZES, quick_sizes=HISTORY_SIZES[:2])
+def history_page_deep(n):
+    tmp, store = _history_store(n)
+    row = store._connect().execute("SELECT ts, id FROM records WHERE tab = 'single' ORDER BY ts, id LIMIT 1 OFFSET 25").fetchone()
+    cursor = (row["ts"], row["id"])
+    return lambda _keep=tmp: store.page("single", limit=25, before=cursor)
+
+
+@benchmark("history.search", sizes=HISTORY_SIZES, quick_sizes=HISTORY_SIZES[:2])
+def history_search(n):
+    tmp, store = _history_store(n)
+    return lambda _keep=tmp: store.page("single", text="Krummholz", limit=25)
+
+
+@benchmark("history.search_rare", sizes=HISTORY_SIZES, quick_sizes=HISTORY_SIZES[:2])
+def history_search_rare(n):
+    # --- One minute of saves: a handful of hits, served from the trigram index ---
+    tmp, store = _history_store(n)
+    text = _history_record(n // 2, datetime(2024, 1, 1))["timestamp"][:16]
+    return lambda _keep=tmp: store.page("single", text=text, limit=25)
+
+
+@benchmark("history.summary", sizes=HISTORY_SIZES, quick_sizes=HISTORY_SIZES[:2])
+def history_summary(n):
+    tmp, store = _history_store(n)
+    return lambda _keep=tmp: store.summary("single")
+
+
+@benchmark("history.load_all", sizes=HISTORY_SIZES, unit="records", quick_sizes=HISTORY_SIZES[:2])
+def history_load_all(n):
+    tmp, store = _history_store(n)
+    return lambda _keep=tmp: store.load("single")
@@ -0,0 +1,47 @@
+"""Write a large random batch-upload file for benchmarking and load testing.
+
+    python -m benchmarks.generate 1000000 batch_1m.csv
+    python -m benchmarks.generate 5000000 batch_5m.parquet --training-distribution --seed 7
+
+Rows are generated and written in chunks, so memory stays flat whatever the size.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+INVOKED_FROM = Path.cwd()
+os.chdir(ROOT)
+sys.path.insert(0, str(ROOT))
+
+from utils.randomizer import CHUNK_ROWS, write_random_batch  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.generate", description=__doc__.splitlines()[0])
+    parser.add_argument("rows", type=int)
+    parser.add_argument("out", type=Path, help=".csv or .parquet")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--training-distribution", action="store_true", help="match the training data's feature distributions")
+    parser.add_argument("--no-id", action="store_true", help="omit the S_No column")
+    args = parser.parse_args(argv)
+
+    profile = None
+    if args.training_distribution:
+        from src.dataset import TRAIN_PATH
+        from utils.dataset_profile import load_profile
+        profile = load_profile(TRAIN_PATH)
+
+    out = args.out if args.out.is_absolute() else INVOKED_FROM / args.out
+    start = time.perf_counter()
+    write_random_batch(out, args.rows, args.chunk_rows, args.seed, profile, with_id=not args.no_id)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {args.rows:,} rows to {out} in {elapsed:.1f}s ({args.rows / elapsed:,.0f} rows/s, {out.stat().st_size / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
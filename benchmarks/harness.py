@@ -0,0 +1,214 @@
+import fnmatch
+import gc
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+
+# --- Results schema; bump when fields change meaning ---
+SCHEMA_VERSION = 1
+MIN_REPEATS = 5
+MAX_REPEATS = 50
+MIN_TIME_S = 1.0
+MAX_TIME_S = 10.0
+SAMPLE_FLOOR_S = 0.005
+MAX_NUMBER = 1 << 16
+
+_registry: list = []
+
+
+class Benchmark:
+    """A named case; ``build(size)`` does the setup and returns the zero-argument call to time."""
+
+    def __init__(self, name: str, build, sizes=(None,), unit: str | None = None, quick_sizes=None):
+        self.name = name
+        self.build = build
+        self.sizes = tuple(sizes)
+        self.quick_sizes = tuple(quick_sizes) if quick_sizes is not None else self.sizes
+        self.unit = unit
+
+    def ids(self, quick: bool = False) -> list:
+        return [(self.id(size), size) for size in (self.quick_sizes if quick else self.sizes)]
+
+    def id(self, size) -> str:
+        return self.name if size is None else f"{self.name}[{size}]"
+
+
+def benchmark(name: str, sizes=(None,), unit: str | None = None, quick_sizes=None):
+    """Register ``build(size)`` as a benchmark; ``unit`` names what ``size`` counts (e.g. rows)."""
+    def decorator(build):
+        _registry.append(Benchmark(name, build, sizes, unit, quick_sizes))
+        return build
+    return decorator
+
+
+def registered() -> list:
+    return list(_registry)
+
+
+def select(patterns=None, quick: bool = False) -> list:
+    """(benchmark, id, size) triples whose id matches any glob in ``patterns`` (all when empty)."""
+    picked = []
+    for bench in _registry:
+        for bench_id, size in bench.ids(quick):
+            if not patterns or any(fnmatch.fnmatch(bench_id, p) for p in patterns):
+                picked.append((bench, bench_id, size))
+    return picked
+
+
+def measure(call) -> dict:
+    """Per-call timings of ``call`` after one warm-up run.
+
+    Like ``timeit.Timer.autorange``, fast calls are looped within each sample
+    (doubling until a sample takes SAMPLE_FLOOR_S) so timer overhead does not
+    dominate. Sampling stops once MIN_REPEATS samples and MIN_TIME_S are
+    collected, or at MAX_REPEATS / MAX_TIME_S, so the million-row cases are
+    timed once after warm-up.
+    """
+    def sample(number: int) -> float:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            call()
+        return time.perf_counter() - t0
+
+    call()
+    started = time.perf_counter()
+    number, elapsed = 1, sample(1)
+    while elapsed < SAMPLE_FLOOR_S and number < MAX_NUMBER:
+        number *= 2
+        elapsed = sample(number)
+    samples = [elapsed / number]
+    while len(samples) < MAX_REPEATS:
+        spent = time.perf_counter() - started
+        if spent >= MAX_TIME_S or (len(samples) >= MIN_REPEATS and spent >= MIN_TIME_S):
+            break
+        samples.append(sample(number) / number)
+    arr = np.asarray(samples)
+    return {
+        "repeats": len(samples),
+        "number": number,
+        "median_s": float(np.median(arr)),
+        "min_s": float(arr.min()),
+        "mean_s": float(arr.mean()),
+        "p95_s": float(np.quantile(arr, 0.95)),
+    }
+
+
+def run(selected, progress=print) -> dict:
+    results = {}
+    for bench, bench_id, size in selected:
+        try:
+            call = bench.build(size)
+            stats = measure(call)
+        except Exception as exc:
+            results[bench_id] = {"error": f"{type(exc).__name__}: {exc}"}
+            progress(f"{bench_id:<45} ERROR {exc}")
+            continue
+        finally:
+            call = None
+            gc.collect()
+        if bench.unit and size:
+            stats.update(unit=bench.unit, items=size, throughput=size / stats["median_s"])
+        results[bench_id] = stats
+        extra = f"  {stats['throughput']:>14,.0f} {bench.unit}/s" if "throughput" in stats else ""
+        progress(f"{bench_id:<45} {stats['median_s'] * 1000:>10.3f} ms  ({stats['repeats']}x{stats['number']}){extra}")
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment() -> dict:
+    versions = {}
+    for dist in ("numpy", "pandas", "xgboost", "scikit-learn", "matplotlib", "plotly", "kaleido", "fpdf", "streamlit"):
+        try:
+            versions[dist] = metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            continue
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "commit": _git_commit(),
+        "packages": versions,
+    }
+
+
+def write_results(results: dict, path: Path, quick: bool) -> dict:
+    doc = {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "quick": quick,
+        "environment": environment(),
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(doc, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+    return doc
+
+
+def load_results(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as fh:
+        doc = json.load(fh)
+    if doc.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"{path} has results schema {doc.get('schema')}, expected {SCHEMA_VERSION}")
+    return doc
+
+
+def tolerance_for(bench_id: str, default: float, overrides: dict) -> float:
+    """Most specific (longest) matching glob in ``overrides`` wins."""
+    matches = [p for p in overrides if fnmatch.fnmatch(bench_id, p)]
+    return overrides[max(matches, key=len)] if matches else default
+
+
+def compare(current: dict, baseline: dict, default_tolerance: float, overrides: dict) -> list:
+    """Per-benchmark verdicts on median time: ok, faster, REGRESSION, new or error."""
+    rows = []
+    for bench_id, stats in current.items():
+        base = baseline.get(bench_id)
+        tol = tolerance_for(bench_id, default_tolerance, overrides)
+        if "error" in stats:
+            status, ratio = "error", None
+        elif base is None or "median_s" not in base:
+            status, ratio = "new", None
+        else:
+            ratio = stats["median_s"] / base["median_s"]
+            status = "REGRESSION" if ratio > 1 + tol else "faster" if ratio < 1 - tol else "ok"
+        rows.append({"id": bench_id, "status": status, "ratio": ratio, "tolerance": tol,
+                     "median_s": stats.get("median_s"), "baseline_s": base.get("median_s") if base else None})
+    return rows
+
+
+def format_comparison(rows: list) -> str:
+    lines = [f"{'benchmark':<45} {'baseline':>11} {'current':>11} {'ratio':>7} {'tol':>5}  status"]
+    for r in rows:
+        base = f"{r['baseline_s'] * 1000:.3f}ms" if r["baseline_s"] is not None else "-"
+        cur = f"{r['median_s'] * 1000:.3f}ms" if r["median_s"] is not None else "-"
+        ratio = f"{r['ratio']:.2f}x" if r["ratio"] is not None else "-"
+        lines.append(f"{r['id']:<45} {base:>11} {cur:>11} {ratio:>7} {r['tolerance']:>5.0%}  {r['status']}")
+    return "\n".join(lines)
+
+
+def environment_mismatch(current: dict, baseline: dict) -> list:
+    """Fields that make a timing comparison unreliable when they differ."""
+    keys = ("python", "machine", "cpus")
+    diffs = [k for k in keys if current.get(k) != baseline.get(k)]
+    for dist in ("numpy", "pandas", "xgboost"):
+        if current.get("packages", {}).get(dist) != baseline.get("packages", {}).get(dist):
+            diffs.append(dist)
+    return diffs
+
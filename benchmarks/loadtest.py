@@ -0,0 +1,301 @@
+"""Drive N concurrent app sessions headlessly and report rerun latency per scenario.
+
+    python -m benchmarks.loadtest --sessions 8 --duration 60
+    python -m benchmarks.loadtest --scenario single --scenario batch --batch-rows 5000 --out load.json
+
+Each session is a Streamlit AppTest running main.py in this process, so the
+sessions share the model, caches and background threads just as browser tabs
+on one server do (minus websocket and browser time). The app runs in a scratch
+working directory that links to the repo's read-only assets, so predictions
+and history written during the test never touch the real Saved_Predictions
+or history database.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from benchmarks.harness import environment  # noqa: E402
+
+# --- Written by the app at runtime; everything else is linked from the repo ---
+WRITABLE = {"Saved_Predictions", "logs", ".cache", "static", "dataset", "benchmarks", ".git", "__pycache__"}
+DATASET_WRITABLE = {".cache", "history.db", "history.db-wal", "history.db-shm", "history_backup"}
+PAGES = ("About", "Dataset Preview", "Single Patch Prediction", "Batch Prediction", "History")
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class StepFailed(Exception):
+    pass
+
+
+def prepare_workdir(workdir: Path) -> Path:
+    """Symlink forest of the repo with fresh directories for everything the app writes."""
+    workdir.mkdir(parents=True, exist_ok=True)
+    for entry in ROOT.iterdir():
+        if entry.name not in WRITABLE and not (workdir / entry.name).exists():
+            (workdir / entry.name).symlink_to(entry, target_is_directory=entry.is_dir())
+    for name in ("Saved_Predictions", "logs", "dataset"):
+        (workdir / name).mkdir(exist_ok=True)
+    for entry in (ROOT / "dataset").iterdir():
+        if entry.name not in DATASET_WRITABLE and not (workdir / "dataset" / entry.name).exists():
+            (workdir / "dataset" / entry.name).symlink_to(entry, target_is_directory=entry.is_dir())
+    return workdir
+
+
+# --- Session driver ---
+class Session:
+    """One simulated user: an AppTest plus timing of every rerun it triggers."""
+
+    def __init__(self, index: int, scenario: str, args, recorder):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.scenario = scenario
+        self.args = args
+        self.rng = random.Random(args.seed + index)
+        self.recorder = recorder
+        self.iteration = 0
+        self.at = AppTest.from_file(str(Path.cwd() / "main.py"), default_timeout=args.timeout)
+
+    def step(self, name: str, action) -> None:
+        """Apply ``action`` (which ends in a rerun) and record its latency and outcome."""
+        t0 = time.perf_counter()
+        error = None
+        try:
+            action()
+            if self.at.exception:
+                error = self.at.exception[0].value.splitlines()[0][:200]
+            elif self.at.error:
+                error = str(self.at.error[0].value)[:200]
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"[:200]
+        self.recorder.record(self, name, time.perf_counter() - t0, error)
+        if error:
+            raise StepFailed(error)
+
+    def _button(self, label_part: str):
+        for button in self.at.button:
+            if label_part in str(button.label):
+                return button
+        raise StepFailed(f"no button labelled {label_part!r}")
+
+    def navigate(self, page: str) -> None:
+        self.step(f"open {page}", lambda: self.at.sidebar.selectbox(key="active_tab").select(page).run())
+
+    # --- Scenarios ---
+    def navigation(self) -> None:
+        for page in self.rng.sample(PAGES, len(PAGES)):
+            self.navigate(page)
+
+    def single(self) -> None:
+        self.navigate("Single Patch Prediction")
+        self.step("randomize", lambda: self._button("Randomize").click().run())
+        self.step("predict", lambda: self._button("Predict").click().run())
+
+    def batch(self) -> None:
+        self.navigate("Batch Prediction")
+        data = self.args.batch_csv
+        self.step("upload", lambda: self.at.get("file_uploader")[0].set_value(("load.csv", data, "text/csv")).run())
+        self.step("predict", lambda: self._button("Predict Cover Types").click().run())
+
+    def history(self) -> None:
+        self.navigate("History")
+        size = self.rng.choice((10, 25, 50))
+        self.step("page size", lambda: self.at.selectbox(key="history_page_size").select(size).run())
+        for _ in range(3):
+            older = [b for b in self.at.button if b.key == "history_single_older" and not b.disabled]
+            if not older:
+                break
+            self.step("older page", lambda: older[0].click().run())
+
+    def run(self, deadline: float, iterations: int | None) -> None:
+        self.step("start", self.at.run)
+        while time.time() < deadline and (iterations is None or self.iteration < iterations):
+            try:
+                getattr(self, self.scenario)()
+            except StepFailed:
+                pass
+            self.iteration += 1
+
+
+class Recorder:
+    def __init__(self, include_first: bool):
+        self.include_first = include_first
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(lambda: defaultdict(int))
+        self.iterations = defaultdict(int)
+
+    def record(self, session: Session, step: str, seconds: float, error: str | None) -> None:
+        if session.iteration == 0 and not self.include_first:
+            return
+        with self.lock:
+            self.samples[(session.scenario, step)].append(seconds)
+            if error:
+                self.errors[(session.scenario, step)][error] += 1
+
+    def report(self, wall: float) -> dict:
+        scenarios = {}
+        with self.lock:
+            keys = sorted(self.samples)
+            for scenario in sorted({k[0] for k in keys}):
+                steps = {}
+                all_samples, all_errors = [], 0
+                for _, step in (k for k in keys if k[0] == scenario):
+                    arr = np.asarray(self.samples[(scenario, step)])
+                    errors = sum(self.errors[(scenario, step)].values())
+                    all_samples.extend(arr.tolist())
+                    all_errors += errors
+                    steps[step] = _latency(arr) | {"errors": errors, "error_messages": dict(self.errors[(scenario, step)])}
+                arr = np.asarray(all_samples)
+                scenarios[scenario] = _latency(arr) | {
+                    "errors": all_errors,
+                    "error_rate": all_errors / len(arr) if len(arr) else 0.0,
+                    "reruns_per_s": len(arr) / wall if wall else 0.0,
+                    "iterations": self.iterations[scenario],
+                    "steps": steps,
+                }
+        return scenarios
+
+
+def _latency(arr: np.ndarray) -> dict:
+    if not len(arr):
+        return {"count": 0}
+    qs = np.quantile(arr, QUANTILES)
+    return {"count": int(len(arr)), "mean_s": float(arr.mean()), "max_s": float(arr.max()),
+            **{f"p{int(q * 100)}_s": float(v) for q, v in zip(QUANTILES, qs)}}
+
+
+def _batch_csv(rows: int, seed: int, training: bool) -> bytes:
+    """The upload every batch session sends: a template-shaped CSV of ``rows`` generated rows."""
+    from utils.randomizer import random_batch
+
+    profile = None
+    if training:
+        from src.dataset import TRAIN_PATH
+        from utils.dataset_profile import load_profile
+        profile = load_profile(TRAIN_PATH)
+    return random_batch(rows, seed=seed, profile=profile).to_csv(index=False).encode()
+
+
+def _format(report: dict, wall: float, sessions: int) -> str:
+    lines = [f"{sessions} session(s), {wall:.1f}s wall time", "",
+             f"{'scenario / step':<34} {'reruns':>7} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'rerun/s':>8}"]
+    for scenario, stats in report.items():
+        if not stats["count"]:
+            continue
+        lines.append(f"{scenario:<34} {stats['count']:>7} {stats['error_rate']:>5.0%} "
+                     f"{stats['p50_s']:>7.2f}s {stats['p95_s']:>7.2f}s {stats['p99_s']:>7.2f}s {stats['max_s']:>7.2f}s {stats['reruns_per_s']:>8.2f}")
+        for step, s in stats["steps"].items():
+            lines.append(f"  {step:<32} {s['count']:>7} {s['errors']:>5} {s['p50_s']:>7.2f}s {s['p95_s']:>7.2f}s {s['p99_s']:>7.2f}s {s['max_s']:>7.2f}s")
+            for message, n in s["error_messages"].items():
+                lines.append(f"      ! {n}x {message}")
+    return "\n".join(lines)
+
+
+def _share_runtime() -> None:
+    """Let concurrent AppTests share one mock Runtime.
+
+    AppTest installs a mock ``Runtime._instance`` for each run and clears it
+    afterwards, which assumes one test at a time; with several sessions in
+    flight the first to finish would pull it out from under the others. The
+    most recent mock stays in place instead.
+    """
+    from streamlit.runtime.runtime import Runtime
+
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last["runtime"] = cls._instance
+            return cls._instance
+        if "runtime" in last:
+            return last["runtime"]
+        raise RuntimeError("Runtime hasn't been created!")
+
+    def exists(cls):
+        return cls._instance is not None or "runtime" in last
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(exists)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--scenario", action="append", choices=("navigation", "single", "batch", "history"),
+                        help="scenarios to mix, assigned to sessions round-robin (default: all)")
+    parser.add_argument("--duration", type=float, default=60, help="seconds each session keeps going")
+    parser.add_argument("--iterations", type=int, default=None, help="stop each session after this many scenario runs")
+    parser.add_argument("--ramp", type=float, default=1.0, help="seconds between session starts")
+    parser.add_argument("--batch-rows", type=int, default=1000)
+    parser.add_argument("--training-distribution", action="store_true", help="draw batch rows from the training data's distributions")
+    parser.add_argument("--timeout", type=float, default=120, help="per-rerun timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--include-first", action="store_true", help="count each session's first (cold) iteration")
+    parser.add_argument("--workdir", type=Path, help="scratch directory for the app (default: a temporary one)")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch directory")
+    parser.add_argument("--out", type=Path, help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or ["navigation", "single", "batch", "history"]
+    env = environment()
+    workdir = prepare_workdir(args.workdir or Path(tempfile.mkdtemp(prefix="forest-load-")))
+    os.chdir(workdir)
+    sys.path.insert(0, str(workdir))
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    args.batch_csv = _batch_csv(args.batch_rows, args.seed, args.training_distribution) if "batch" in scenarios else b""
+    _share_runtime()
+
+    recorder = Recorder(args.include_first)
+    sessions = [Session(i, scenarios[i % len(scenarios)], args, recorder) for i in range(args.sessions)]
+    started = time.time()
+    deadline = started + args.duration + args.ramp * len(sessions)
+    threads = []
+    for session in sessions:
+        thread = threading.Thread(target=session.run, args=(deadline, args.iterations), name=f"load-{session.index}", daemon=True)
+        thread.start()
+        threads.append(thread)
+        time.sleep(args.ramp)
+    for thread in threads:
+        thread.join()
+    wall = time.time() - started
+    for session in sessions:
+        recorder.iterations[session.scenario] += session.iteration
+
+    report = recorder.report(wall)
+    print(_format(report, wall, len(sessions)))
+    if args.out:
+        out = args.out if args.out.is_absolute() else ROOT / args.out
+        doc = {"created": datetime.now().isoformat(timespec="seconds"), "environment": env,
+               "config": {k: v for k, v in vars(args).items() if k not in ("batch_csv", "workdir", "out")} | {"scenarios": scenarios},
+               "wall_s": wall, "scenarios": report}
+        out.write_text(json.dumps(doc, indent=1, default=str), encoding="utf-8")
+        print(f"\nReport written to {out}")
+
+    if args.keep or args.workdir:
+        print(f"App working directory kept at {workdir}")
+    else:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 1 if any(s.get("errors") for s in report.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
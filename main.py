@@ -1,6 +1,9 @@
 import streamlit as st
 import time
 from utils.logger import log_error
+from utils.startup import timed_import, report_cold_start
+
+_run_started = time.perf_counter()
 
 st.set_page_config(
     page_title="Forest Cover Prediction",
@@ -10,70 +13,80 @@ st.set_page_config(
 
 # --- Loading modules ---
 try:
-    from src import (
-        about, batch, single, model_loader, sidebar, spinner, history, dataset
-    )
-    from utils.theme import home_style, apply_theme
-    from utils.theme import themed_divider
+    # --- Pages are imported on first navigation, see src/pages.py ---
+    model_loader = timed_import("src.model_loader")
+    sidebar = timed_import("src.sidebar")
+    spinner = timed_import("src.spinner")
+    warmup = timed_import("utils.warmup")
+    storage = timed_import("utils.storage")
+    perf = timed_import("utils.perf")
+    profiler = timed_import("utils.profiler")
+    memory = timed_import("utils.memory")
+    from utils.theme import apply_theme, themed_divider
 except Exception as e:
     log_error("Module import failed", e)
     st.stop()
 
-home_style()
+# --- Opt-in sampling profiler, one collapsed-stack file per rerun (FOREST_PROFILE=1 or ?profile=1) ---
+_profiling = profiler.enabled(st.query_params)
+if _profiling:
+    _rerun_action = profiler.start_rerun(st.session_state)
+
+# --- st.stop()/st.rerun() raise past the end of the script, so the sampler is stopped in finally ---
+try:
+    # --- Title & Description ---
+    st.title("🌳 Forest Cover Type Prediction System")
+    st.caption("Easily find the patterns of The tree types in different Parameters and different Entries.")
+    themed_divider()
+
+    # --- Theme state ---
+    if "theme" not in st.session_state: 
+        try: 
+            st.session_state["theme"] = sidebar.load_theme().lower()
+        except Exception: 
+            st.session_state["theme"] = "default"
 
-# --- Title & Description ---
-st.title("🌳 Forest Cover Type Prediction System")
-st.caption("Easily find the patterns of The tree types in different Parameters and different Entries.")
-themed_divider()
+    apply_theme(st.session_state["theme"])
 
-# --- Theme state ---
-if "theme" not in st.session_state: 
-    try: 
-        st.session_state["theme"] = sidebar.load_theme().lower()
-    except Exception: 
-        st.session_state["theme"] = "default"
+    # --- Sidebar ---
+    with st.sidebar:
+        sidebar.render_sidebar()
 
-apply_theme(st.session_state["theme"])
+    # --- Model, plotting and PDF warm-up (background, once per process) ---
+    warmup.start_warmup(model_loader.MODEL_PATH)
+    if not warmup.is_ready():
+        st.sidebar.caption("⏳ Warming up the model and charts in the background...")
 
-# --- Sidebar ---
-with st.sidebar:
-    sidebar.render_sidebar()
+    # --- Saved_Predictions retention / compression / dedup sweeper (background, once per process) ---
+    storage.start_sweeper()
+    perf.start_exporter()
+    memory.start_reporter()
 
-# --- Model Loading ---
-with st.spinner("🔄 Loading model and preparing environment..."):
-    time.sleep(1)
+    # --- Page Routing ---
     try:
-        model = model_loader.load_model_cached("model/xgb_model.pkl")
+        page = spinner.handle_spinner()
+        if page is not None:
+            with memory.page(st.session_state.active_tab):
+                page.show()
+        else:
+            st.info("ℹ️ Please select a section from the sidebar.")
     except Exception as e:
-        log_error("Model loading failed", e)
-        model = None
+        log_error("An error occurred while rendering this page", e)
 
-spinner.handle_spinner()
-
-# --- Page Routing ---
-try:
-    if st.session_state.active_tab == "About":
-        about.show()
-    elif st.session_state.active_tab == "Dataset Preview":
-        dataset.show()
-    elif st.session_state.active_tab == "Single Patch Prediction":
-        single.show()
-    elif st.session_state.active_tab == "Batch Prediction":
-        batch.show()
-    elif st.session_state.active_tab == "History":
-        history.show()
-    else:
-        st.info("ℹ️ Please select a section from the sidebar.")
-except Exception as e:
-    log_error("An error occurred while rendering this page", e)
+    # --- Footer ---
+    themed_divider()
+    st.markdown(
+        """
+        <div class="footer">
+            Developed with ❤️ by <b>Karmendra Srivastava</b> | Trained in Jupyter Notebook
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
 
-# --- Footer ---
-themed_divider()
-st.markdown(
-    """
-    <div class="footer">
-        Developed with ❤️ by <b>Karmendra Srivastava</b> | Trained in Jupyter Notebook
-    </div>
-    """,
-    unsafe_allow_html=True
-)
\ No newline at end of file
+    memory.track_session(st.session_state)
+    perf.record(f"app.rerun.{st.session_state.get('active_tab', 'About')}", time.perf_counter() - _run_started)
+finally:
+    if _profiling:
+        profiler.finish_rerun(st.session_state, st.session_state.get("active_tab", "About"), _rerun_action)
+report_cold_start(time.perf_counter() - _run_started)
\ No newline at end of file
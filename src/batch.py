@@ -1,7 +1,5 @@
 import streamlit as st
 import pandas as pd
-from utils.model import load_model
-from datetime import datetime
 import numpy as np
 from pathlib import Path
 from utils.viz import (
@@ -9,22 +7,19 @@ from utils.viz import (
         plot_batch_pie_chart,
         plot_feature_boxplots,
     )
+from utils.data import invalid_onehot_rows
+from utils.perf import span
+from utils.profiler import profiled_fragment
 from utils.template import get_csv_template
-from utils.theme import apply_batch_styles
+from utils.storage import ingest, new_run_dir, write_batch_summary
 from src.history import save_to_history
+from src.model_loader import MODEL_PATH, load_model_cached
 
 # --- Caching ---
-@st.cache_resource
-def load_model_cached(path):
-    return load_model(path)
-
 @st.cache_data
 def get_cached_template():
     return get_csv_template()
 
-apply_batch_styles()
-
-model = load_model_cached("model/xgb_model.pkl")
 SAVE_ROOT = Path("Saved_Predictions")
 
 cover_type_map = {
@@ -37,9 +32,8 @@ cover_type_map = {
         7: "Krummholz",
     }
 
-def show():
-    st.subheader("📄 Batch Prediction")
-    
+@profiled_fragment
+def _template_panel():
     with st.expander("📥 Download CSV Template"):
         st.markdown("Use this template to format your dataset properly before uploading.")
 
@@ -57,7 +51,9 @@ def show():
         )
 
         st.dataframe(template_df, use_container_width=True)
-    
+
+@profiled_fragment
+def _upload_panel():
     uploaded_file = st.file_uploader(
         "📂 Upload your dataset (CSV)", 
         type=["csv"], 
@@ -68,7 +64,8 @@ def show():
     if uploaded_file is not None:
         try:
             uploaded_file.seek(0)
-            data = pd.read_csv(uploaded_file)
+            with span("batch.parse_csv"):
+                data = pd.read_csv(uploaded_file)
             if data.empty:
                 st.warning("⚠️ The uploaded CSV file is empty.")
                 return
@@ -80,6 +77,8 @@ def show():
 
             # --- Prediction Button ---
             if st.button("Predict Cover Types"):
+                with span("batch.load_model"):
+                    model = load_model_cached(MODEL_PATH)
                 feature_columns = model.get_booster().feature_names
                 missing_cols = set(feature_columns) - set(data.columns)
                 
@@ -87,12 +86,12 @@ def show():
                     st.error(f"❌ Uploaded file is missing columns: {', '.join(sorted(missing_cols))}")
                     st.stop()
                 else:
-                    data = data[feature_columns].copy()
-                    soil_cols = [col for col in data.columns if col.startswith("Soil_Type")]
-                    wilderness_cols = [col for col in data.columns if col.startswith("Wilderness_Area")]
+                    with span("batch.validate"):
+                        data = data[feature_columns].copy()
+                        soil_cols, invalid_soil_rows = invalid_onehot_rows(data, "Soil_Type")
+                        wilderness_cols, invalid_wild_rows = invalid_onehot_rows(data, "Wilderness_Area")
 
                     # --- Validate soil ---
-                    invalid_soil_rows = data[soil_cols].sum(axis=1) != 1
                     if invalid_soil_rows.any():
                         bad_indices = data.index[invalid_soil_rows].tolist()
                         st.error("❌ Invalid Soil_Type encoding detected!")
@@ -103,7 +102,6 @@ def show():
                         st.stop()
 
                     # --- Validate wilderness ---
-                    invalid_wild_rows = data[wilderness_cols].sum(axis=1) != 1
                     if invalid_wild_rows.any():
                         bad_indices = data.index[invalid_wild_rows].tolist()
                         st.error("❌ Invalid Wilderness_Area encoding detected!")
@@ -115,7 +113,7 @@ def show():
 
                 # --- Prediction ---
                 try:
-                    with st.spinner("🔄 Predicting Cover Types..."):
+                    with st.spinner("🔄 Predicting Cover Types..."), span("batch.inference"):
                         predictions = model.predict(data).astype(int) + 1
                         predicted_classes = [cover_type_map.get(int(i), "Unknown") for i in predictions]
                 except Exception as e:
@@ -138,19 +136,20 @@ def show():
                 st.dataframe(data.head(), use_container_width=True)
                 st.markdown("</div>", unsafe_allow_html=True)
                 
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                save_dir = SAVE_ROOT / "batch" / timestamp
-                save_dir.mkdir(parents=True, exist_ok=True)
+                save_dir = new_run_dir("batch")
                 
                 csv_path = save_dir / "predictions.csv"
-                data.to_csv(csv_path, index=False, encoding="utf-8")
+                with span("batch.write_csv"):
+                    data.to_csv(csv_path, index=False, encoding="utf-8")
+                    write_batch_summary(data, save_dir)
 
                 # --- Visualizations
                 viz_tab1, viz_tab2, viz_tab3 = st.tabs(["📊 Bar Chart", "🥧 Pie Chart", "📦 Boxplots"])
 
                 with viz_tab1:
                     try:
-                        fig_bar = plot_batch_bar_chart(predictions, cover_type_map, save_path=save_dir / "bar.png")
+                        with span("batch.chart.bar"):
+                            fig_bar = plot_batch_bar_chart(predictions, cover_type_map, save_path=save_dir / "bar.png")
                         if fig_bar is not None:
                             st.plotly_chart(fig_bar, use_container_width=True)
                     except Exception as e:
@@ -159,7 +158,8 @@ def show():
                 # Pie chart
                 with viz_tab2:
                     try:
-                        fig_pie = plot_batch_pie_chart(predictions, cover_type_map, save_path=save_dir / "pie.png")
+                        with span("batch.chart.pie"):
+                            fig_pie = plot_batch_pie_chart(predictions, cover_type_map, save_path=save_dir / "pie.png")
                         if fig_pie is not None:
                             st.plotly_chart(fig_pie, use_container_width=True)
                     except Exception as e:
@@ -167,23 +167,22 @@ def show():
 
                 with viz_tab3:
                     try:
-                        fig_box = plot_feature_boxplots(data, predictions, cover_type_map, save_path=save_dir / "box.png")
-                        try:
-                            import matplotlib.pyplot as plt
-                            if fig_box is not None:
-                                st.pyplot(fig_box)
-                        except Exception:
-                            pass
+                        with span("batch.chart.boxplots"):
+                            plot_feature_boxplots(data, predictions, cover_type_map, save_path=save_dir / "box.png")
                     except Exception as e:
                         st.warning(f"Could not render/save feature boxplots: {e}")
                 
+                with span("batch.dedupe"):
+                    ingest(save_dir)
                 try:
-                    save_to_history("batch", {
-                        "file": uploaded_file.name,
-                        "rows": int(len(data)),
-                        "path": str(save_dir),
-                        "predictions_preview": (predictions[:10].tolist() if hasattr(predictions, "tolist") else list(predictions)[:10])
-                    })
+                    with span("batch.history_save"):
+                        save_to_history("batch", {
+                            "file": uploaded_file.name,
+                            "rows": int(len(data)),
+                            "path": str(save_dir),
+                            "class_counts": {str(k): int(v) for k, v in zip(*np.unique(predictions, return_counts=True))},
+                            "predictions_preview": (predictions[:10].tolist() if hasattr(predictions, "tolist") else list(predictions)[:10])
+                        })
                     st.success("The Records have been saved successfully and are available in History → Batch.")
                 except Exception as e:
                     st.error(f"⚠️ Failed to save batch history: {e}")
@@ -195,4 +194,9 @@ def show():
         except UnicodeDecodeError:
             st.error("❌ File encoding not supported. Please upload a UTF-8 encoded CSV.")
         except Exception as e:
-            st.error(f"❌ Unexpected error while reading the file: {str(e)}")
\ No newline at end of file
+            st.error(f"❌ Unexpected error while reading the file: {str(e)}")
+
+def show():
+    st.subheader("📄 Batch Prediction")
+    _template_panel()
+    _upload_panel()
@@ -1,13 +1,148 @@
 import os, datetime
+import numpy as np
 import pandas as pd
 import streamlit as st
-from utils.data import load_processed_data
+from utils.columnar import ColumnarDataset, intersect_rows, open_columnar
+from utils.dataset_profile import load_profile
+from utils.logger import log_error
+from utils.profiler import profiled_fragment
+from utils.viz import plot_class_feature_summary, plot_correlation_heatmap
 
-@st.cache_data
-def _load_feature_df(path: str) -> pd.DataFrame:
-    df = load_processed_data(path)
-    df.columns = [str(c).strip() for c in df.columns]
-    return df
+TRAIN_PATH = "Problem Statement/train.csv"
+PAGE_SIZES = (20, 50, 100, 250)
+COVER_TYPE_MAP = {
+    1: "Spruce/Fir",
+    2: "Lodgepole Pine",
+    3: "Ponderosa Pine",
+    4: "Cottonwood/Willow",
+    5: "Aspen",
+    6: "Douglas-fir",
+    7: "Krummholz",
+}
+
+def _labels_ds(ds: ColumnarDataset):
+    """The training file carries Cover_Type for the same rows, in the same order."""
+    try:
+        labels = open_columnar(TRAIN_PATH)
+        return labels if labels.n_rows == ds.n_rows and "Cover_Type" in labels.columns else None
+    except Exception as exc:
+        log_error("dataset._labels_ds", exc)
+        return None
+
+def _filter_rows(ds: ColumnarDataset, labels) -> np.ndarray | None:
+    """Row ids matching the filter widgets, from precomputed indexes; None means no filter."""
+    flag_cols = {
+        "Wilderness area": [c for c in ds.columns if c.startswith("Wilderness_Area")],
+        "Soil type": [c for c in ds.columns if c.startswith("Soil_Type")],
+    }
+    numeric_cols = [c for c in ds.columns if not any(c in cols for cols in flag_cols.values())]
+    row_sets = []
+
+    with st.expander("🔍 Filters"):
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            if labels is not None:
+                covers = st.multiselect("Cover type", list(COVER_TYPE_MAP), format_func=COVER_TYPE_MAP.get, key="ds_filter_cover")
+                if covers:
+                    row_sets.append(labels.value_rows("Cover_Type", covers))
+        for col, (label, cols) in zip((c2, c3), flag_cols.items()):
+            with col:
+                chosen = st.multiselect(label, cols, key=f"ds_filter_{label}")
+                if chosen:
+                    row_sets.append(np.unique(np.concatenate([ds.flag_rows(c) for c in chosen])))
+
+        for name in st.multiselect("Numeric ranges", numeric_cols, key="ds_filter_numeric"):
+            lo, hi = (int(v) for v in ds.value_range(name))
+            if lo < hi:
+                low, high = st.slider(name, lo, hi, (lo, hi), key=f"ds_range_{name}")
+                if (low, high) != (lo, hi):
+                    row_sets.append(ds.range_rows(name, low, high))
+    return intersect_rows(*row_sets)
+
+@profiled_fragment
+def _preview_panel(ds: ColumnarDataset):
+    st.markdown("### 👀 Data Preview")
+    labels = _labels_ds(ds)
+    rows = _filter_rows(ds, labels)
+    total = ds.n_rows if rows is None else len(rows)
+
+    selected_cols = st.multiselect("Columns", ds.columns, default=ds.columns[:10])
+    c1, c2, c3 = st.columns([1, 1, 2])
+    with c1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key="ds_page_size")
+    pages = max(1, -(-total // page_size))
+    with c2:
+        page = st.number_input("Page", 1, pages, 1, key="ds_page")
+    with c3:
+        st.markdown(f"<br>{total:,} matching rows · page {min(page, pages)} of {pages:,}", unsafe_allow_html=True)
+
+    # --- Only the visible page is read from the memory-mapped columns ---
+    start = (min(page, pages) - 1) * page_size
+    window = slice(start, start + page_size) if rows is None else rows[start:start + page_size]
+    preview_df = ds.frame(selected_cols, window)
+    if labels is not None and "Cover_Type" not in preview_df:
+        preview_df["Cover_Type"] = labels.frame(["Cover_Type"], window)["Cover_Type"].map(COVER_TYPE_MAP)
+    st.dataframe(preview_df, use_container_width=True)
+
+@profiled_fragment
+def _profile_panel():
+    st.markdown("### 📈 Dataset Profile")
+    try:
+        profile = load_profile(TRAIN_PATH)
+    except FileNotFoundError:
+        st.info(f"Profile unavailable: {TRAIN_PATH} not found.")
+        return
+    except Exception as exc:
+        log_error("dataset._profile_panel", exc)
+        st.warning("Could not build the dataset profile.")
+        return
+
+    st.caption(f"Training data: {profile['rows']:,} rows, computed once per file version.")
+    numeric = profile["numeric"]
+    tab_classes, tab_dist, tab_corr, tab_per_class = st.tabs(
+        ["🌲 Classes & Areas", "📊 Distributions", "🔗 Correlations", "📦 Per Cover Type"]
+    )
+    with tab_classes:
+        classes = profile.get("classes")
+        c1, c2 = st.columns(2)
+        if classes:
+            with c1:
+                st.markdown("**Cover type counts**")
+                st.bar_chart(pd.Series(classes["counts"], index=[COVER_TYPE_MAP.get(l, l) for l in classes["labels"]], name="Rows"))
+        with c2:
+            flag_counts = pd.Series(profile["flag_counts"], index=profile["flags"], name="Rows")
+            st.markdown("**Wilderness areas**")
+            st.bar_chart(flag_counts[flag_counts.index.str.startswith("Wilderness_Area")])
+        st.markdown("**Soil types**")
+        st.bar_chart(flag_counts[flag_counts.index.str.startswith("Soil_Type")])
+    with tab_dist:
+        stats = pd.DataFrame(
+            profile["quantiles"],
+            index=numeric,
+            columns=[f"p{int(q * 100)}" for q in profile["quantile_levels"]],
+        )
+        stats.insert(0, "std", profile["std"])
+        stats.insert(0, "mean", profile["mean"])
+        st.dataframe(stats, use_container_width=True)
+        feature = st.selectbox("Histogram", numeric, key="profile_hist_feature")
+        hist = profile["histograms"][feature]
+        st.bar_chart(pd.Series(hist["counts"], index=[f"{e:g}" for e in hist["edges"][:-1]], name=feature))
+    with tab_corr:
+        fig = plot_correlation_heatmap(profile["correlation"], numeric)
+        if fig is not None:
+            st.plotly_chart(fig, use_container_width=True)
+    with tab_per_class:
+        classes = profile.get("classes")
+        if not classes:
+            st.info("No Cover_Type column in the training data.")
+        else:
+            feature = st.selectbox("Feature", numeric, key="profile_class_feature")
+            fig = plot_class_feature_summary(classes, numeric.index(feature), feature, COVER_TYPE_MAP)
+            if fig is not None:
+                st.plotly_chart(fig, use_container_width=True)
+            means = pd.DataFrame(classes["mean"], index=[COVER_TYPE_MAP.get(l, l) for l in classes["labels"]], columns=numeric)
+            st.markdown("**Feature means per cover type**")
+            st.dataframe(means.round(1), use_container_width=True)
 
 def show():
     st.subheader("📊 Dataset Preview")
@@ -15,19 +150,20 @@ def show():
     feature_path = "dataset/new_forest_data.csv"
 
     try:
-        df = _load_feature_df(feature_path)
-        if df.empty:
+        # --- Converted once to memory-mapped, downcast columns under dataset/.cache ---
+        ds = open_columnar(feature_path)
+        if ds.n_rows == 0:
             st.warning("⚠️ Dataset is empty.")
             return
 
         file_info = os.stat(feature_path)
         c1, c2, c3, c4 = st.columns(4)
         with c1:
-            st.metric("📄 Rows", f"{df.shape[0]:,}")
+            st.metric("📄 Rows", f"{ds.n_rows:,}")
         with c2:
-            st.metric("🔢 Columns", f"{df.shape[1]}")
+            st.metric("🔢 Columns", f"{len(ds.columns)}")
         with c3:
-            st.metric("💾 Memory", f"{df.memory_usage().sum()/1_048_576:.2f} MB")
+            st.metric("💾 Memory", f"{ds.nbytes/1_048_576:.2f} MB")
         with c4:
             st.metric(
                 "🕒 Updated",
@@ -36,20 +172,14 @@ def show():
 
         with st.expander("⚙️ Columns & Data Types"):
             dtype_df = pd.DataFrame({
-                "Column": df.columns,
-                "Data type": df.dtypes.astype(str),
-                "Values Count": df.notnull().sum().values
+                "Column": ds.columns,
+                "Data type": ds.dtypes.values,
+                "Values Count": ds.non_null.values
             })
             st.dataframe(dtype_df, use_container_width=True, height=320)
 
-        # --- Data preview ---
-        st.markdown("### 👀 Data Preview")
-        row_count = st.slider("Rows", 5, df.shape[0], 20, step=5)
-        if row_count >= 1000:
-            st.warning("The Amount of Rows Selected May Cause Issues with the performance for low-end devices.")
-        selected_cols = st.multiselect("Columns", df.columns.tolist(), default=df.columns.tolist()[:10])
-        preview_df = df[selected_cols].head(row_count)
-        st.dataframe(preview_df, use_container_width=True)
+        _preview_panel(ds)
+        _profile_panel()
 
     except FileNotFoundError:
         st.error(f"❌ {feature_path} not found.")
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import io
 import json
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -10,18 +11,26 @@ import pandas as pd
 import streamlit as st
 
 from utils.logger import log_error, log_info
+from utils.history_store import get_history_store
+from utils.storage import artifact_path, concat_csv_artifacts, load_batch_summary, open_artifact
+from utils.export import EXPORT_TTL_S, build_history_zip
+from utils.perf import span
+from utils.profiler import profiled_fragment
 from utils.exceptions import AppError
 from utils.pdf import generate_single_patch_pdf
-from utils.colors import get_palette
 from utils.theme import themed_divider
 # -----------------------
 # Constants & Paths
 # -----------------------
-HISTORY_FILE: Path = Path("dataset/history.json")
-HISTORY_BACKUP_DIR: Path = Path("dataset/history_backup")
 SAVE_ROOT: Path = Path("Saved_Predictions")
 
-MAX_DISPLAY_RECORDS = 200
+TREND_DAYS = 30
+PAGE_SIZES = (10, 25, 50, 100)
+EXPORT_FORMATS = {
+    "single": ("CSV", "JSON", "ZIP (records, charts, PDFs)"),
+    "batch": ("Combined CSV", "JSON", "ZIP (records, charts, PDFs)"),
+}
+HISTORY_POLL_SECONDS = 10
 
 COVER_TYPE_MAP = {
     1: "Spruce/Fir",
@@ -60,85 +69,20 @@ def _sanitize_for_json(obj: Any) -> Any:
 
 
 # -----------------------
-# I/O & caching
+# I/O
 # -----------------------
-@st.cache_data(ttl=300)
-def _read_history_file() -> Dict[str, List[Dict[str, Any]]]:
-    try:
-        if HISTORY_FILE.exists():
-            with open(HISTORY_FILE, "r", encoding="utf-8") as fh:
-                data = json.load(fh)
-                if not isinstance(data, dict):
-                    raise ValueError("History file format invalid")
-                data.setdefault("single", [])
-                data.setdefault("batch", [])
-                for k in ("single", "batch"):
-                    if len(data[k]) > 5000:
-                        data[k] = data[k][-5000:]
-                return data
-        else:
-            return {"single": [], "batch": []}
-    except Exception as exc:
-        try:
-            HISTORY_BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = HISTORY_BACKUP_DIR / f"history_corrupt_{ts}.json"
-            HISTORY_FILE.rename(backup_path)
-            log_error("history._read_history_file", f"Corrupted history backed up to {backup_path}: {exc}")
-        except Exception as backup_exc:
-            log_error("history._read_history_file", f"Failed to backup corrupted history: {backup_exc}")
-        return {"single": [], "batch": []}
-
-
-def _write_history_file(data: Dict[str, List[Dict[str, Any]]]) -> None:
-    try:
-        HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        tmp = HISTORY_FILE.with_suffix(".tmp")
-        with open(tmp, "w", encoding="utf-8") as fh:
-            json.dump(data, fh, indent=2, default=_sanitize_for_json, ensure_ascii=False)
-        tmp.replace(HISTORY_FILE)
-        log_info("history._write_history_file", f"Wrote history to {HISTORY_FILE}")
-    except Exception as exc:
-        log_error("history._write_history_file", exc)
-        raise
-
-
-def _ensure_history_loaded() -> None:
-    if "history" not in st.session_state:
-        st.session_state.history = _read_history_file()
-
-def load_history() -> Dict[str, List[Dict[str, Any]]]:
-    try:
-        _ensure_history_loaded()
-        return st.session_state.history
-    except Exception as exc:
-        log_error("history.load_history", exc)
-        return {"single": [], "batch": []}
-
-
 def save_to_history(tab: str, record: Dict[str, Any]) -> None:
     try:
         if tab not in ("single", "batch"):
             raise ValueError("tab must be 'single' or 'batch'")
 
-        _ensure_history_loaded()
-
         # --- Normalize record and add timestamp server-side ---
         record = {**record}
         record.setdefault("timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         record = _sanitize_for_json(record)
 
-        st.session_state.history.setdefault(tab, []).append(record)
-
-        _write_history_file(st.session_state.history)
+        get_history_store().append(tab, record)
 
-        # --- update cached function by invalidating it ---
-        try:
-            if "_read_history_file" in st.cache_data.__wrapped__.__name__:
-                pass
-        except Exception:
-            # not critical; just log
-            log_info("history.save_to_history", "Unable to manually invalidate cache; relying on TTL.")
         log_info("history.save_to_history", f"Saved record to history tab={tab}")
     except Exception as exc:
         log_error("history.save_to_history", exc)
@@ -148,24 +92,62 @@ def save_to_history(tab: str, record: Dict[str, Any]) -> None:
 # -----------------------
 # History Viewer
 # -----------------------
-def _summary_metrics(records_single: List[Dict[str, Any]], records_batch: List[Dict[str, Any]]) -> None:
+# --- Metrics and trends read the store's running aggregates, never the records themselves ---
+def _summary_metrics(single: Dict[str, Dict[str, float]], batch: Dict[str, Dict[str, float]]) -> None:
     try:
-        total_single = len(records_single)
-        total_batch = len(records_batch)
-        avg_conf = 0.0
-        confidences = [r.get("confidence", 0) for r in records_single if isinstance(r.get("confidence", None), (int, float))]
-        if confidences:
-            avg_conf = sum(confidences) / len(confidences)
-
-        palette = get_palette(st.session_state.get("theme", "default"))
-        c1, c2, c3 = st.columns(3)
+        total_single = int(single.get("records", {}).get("", 0))
+        total_batch = int(batch.get("records", {}).get("", 0))
+        rows_scored = int(batch.get("rows", {}).get("", 0))
+        conf_n = single.get("confidence_n", {}).get("", 0)
+        avg_conf = single.get("confidence_sum", {}).get("", 0.0) / conf_n if conf_n else 0.0
+
+        c1, c2, c3, c4 = st.columns(4)
         c1.metric("Single Predictions", f"{total_single:,}")
         c2.metric("Batch Predictions", f"{total_batch:,}")
-        c3.metric("Avg. Confidence (Single)", f"{avg_conf:.2f}%")
+        c3.metric("Rows Scored (Batch)", f"{rows_scored:,}")
+        c4.metric("Avg. Confidence (Single)", f"{avg_conf:.2f}%")
     except Exception as exc:
         log_error("history._summary_metrics", exc)
 
 
+def _trend_charts(store, single: Dict[str, Dict[str, float]], batch: Dict[str, Dict[str, float]]) -> None:
+    try:
+        with st.expander("📈 Trends & Distributions"):
+            since = date.today() - timedelta(days=TREND_DAYS - 1)
+            daily = pd.DataFrame({
+                "Single": pd.Series(store.daily_totals("single", since=since), dtype=float),
+                "Batch": pd.Series(store.daily_totals("batch", since=since), dtype=float),
+                "Rows scored": pd.Series(store.daily_totals("batch", "rows", since=since), dtype=float),
+            }).fillna(0)
+            if daily.empty:
+                st.info(f"No predictions in the last {TREND_DAYS} days.")
+            else:
+                daily.index = pd.to_datetime(daily.index)
+                st.markdown(f"**Predictions per day (last {TREND_DAYS} days)**")
+                st.bar_chart(daily[["Single", "Batch"]])
+                st.markdown("**Rows scored per day**")
+                st.line_chart(daily[["Rows scored"]])
+
+            col1, col2 = st.columns(2)
+            with col1:
+                classes = pd.DataFrame({
+                    "Single": pd.Series(single.get("class", {}), dtype=float),
+                    "Batch rows": pd.Series(batch.get("class", {}), dtype=float),
+                }).fillna(0)
+                if not classes.empty:
+                    classes.index = [COVER_TYPE_MAP.get(int(k), k) for k in classes.index]
+                    st.markdown("**Predicted classes**")
+                    st.bar_chart(classes)
+            with col2:
+                bins = single.get("confidence_bin", {})
+                if bins:
+                    hist = pd.Series({f"{int(k)}–{int(k) + 10}%": v for k, v in sorted(bins.items())}, name="Single")
+                    st.markdown("**Confidence histogram (Single)**")
+                    st.bar_chart(hist)
+    except Exception as exc:
+        log_error("history._trend_charts", exc)
+
+
 def _export_records_as_csv(records: List[Dict[str, Any]], filename_prefix: str = "history") -> bytes:
     try:
         df = pd.DataFrame(records)
@@ -175,34 +157,136 @@ def _export_records_as_csv(records: List[Dict[str, Any]], filename_prefix: str =
         raise
 
 
-def show() -> None:
-    _ensure_history_loaded()
-
-    st.subheader("📜 Prediction History")
-    st.caption("Review, filter and export previously saved Single and Batch predictions.")
-    themed_divider()
-
-    single_records_all = st.session_state.history.get("single", [])[-MAX_DISPLAY_RECORDS:]
-    batch_records_all = st.session_state.history.get("batch", [])[-MAX_DISPLAY_RECORDS:]
-
-    # --- Top metrics ---
-    _summary_metrics(single_records_all, batch_records_all)
-
+# --- Keyset paging: a stack of "before" cursors per tab, so Newer just pops one ---
+def _page_state(tab: str, filters: tuple) -> Dict[str, Any]:
+    key = f"history_{tab}_page"
+    state = st.session_state.get(key)
+    if state is None or state["filters"] != filters:
+        state = {"filters": filters, "cursors": [None]}
+        st.session_state[key] = state
+    return state
+
+
+def _turn_page(tab: str, cursor: Optional[tuple]) -> None:
+    cursors = st.session_state[f"history_{tab}_page"]["cursors"]
+    if cursor is None:
+        cursors.pop()
+    else:
+        cursors.append(cursor)
+    st.session_state.pop(f"history_{tab}_select", None)
+
+
+def _paged_records(store, tab: str, search_text: str, date_from, date_to) -> List[Dict[str, Any]]:
+    """Render page controls for ``tab`` and return only the records on the visible page."""
+    page_size = st.session_state.get("history_page_size", PAGE_SIZES[1])
+    state = _page_state(tab, (search_text, date_from, date_to, page_size))
+    cursors = state["cursors"]
+
+    with span(f"history.page.{tab}"):
+        records, next_cursor = store.page(tab, search_text, date_from, date_to, limit=page_size, before=cursors[-1])
+
+    col_prev, col_info, col_next, col_size = st.columns([1.2, 3, 1.2, 1.5])
+    with col_prev:
+        st.button("⬅️ Newer", key=f"history_{tab}_newer", disabled=len(cursors) == 1,
+                  on_click=_turn_page, args=(tab, None))
+    with col_info:
+        first = (len(cursors) - 1) * page_size + 1
+        st.markdown(
+            f"Page **{len(cursors)}** · records {first:,}–{first + len(records) - 1:,} (most recent first)"
+            if records else "No matching records."
+        )
+    with col_next:
+        st.button("Older ➡️", key=f"history_{tab}_older", disabled=next_cursor is None,
+                  on_click=_turn_page, args=(tab, next_cursor))
+    with col_size:
+        st.selectbox("Per page", PAGE_SIZES, index=PAGE_SIZES.index(page_size),
+                     key="history_page_size", label_visibility="collapsed")
+    return records
+
+
+def _combine_batch_csvs(paths: List[Path]) -> bytes:
+    """Combined CSV of several batch runs, streamed file by file; pandas only for mismatched headers."""
+    buf = io.BytesIO()
+    try:
+        concat_csv_artifacts(paths, buf)
+    except ValueError:
+        buf = io.BytesIO()
+        pd.concat((pd.read_csv(p) for p in paths), ignore_index=True).to_csv(buf, index=False)
+    return buf.getvalue()
+
+
+def _export_panel(tab: str, records: List[Dict[str, Any]]) -> None:
+    """Export controls for the selected records. Nothing is serialised or read from disk until
+    "Prepare export" is clicked. ZIPs are written to disk and served from the static folder;
+    without static serving they fall back to an in-memory download capped by utils.export.INLINE_MAX_BYTES."""
+    formats = EXPORT_FORMATS[tab]
+    col_fmt, col_btn = st.columns([4, 2])
+    with col_fmt:
+        fmt = st.radio("Export format", formats, horizontal=True, key=f"history_{tab}_export_format")
+    with col_btn:
+        prepare = st.button("📦 Prepare export", key=f"history_{tab}_export")
+    if not prepare:
+        return
+
+    ts_now = datetime.now().strftime("%Y%m%d_%H%M%S")
+    prefix = f"{tab}_history_{ts_now}"
+    try:
+        with span(f"history.export.{fmt.split()[0].lower()}"):
+            if fmt == "ZIP (records, charts, PDFs)":
+                export = build_history_zip({tab: records}, f"{prefix}.zip")
+                size_mb = export["size"] / 1e6
+                if "url" in export:
+                    st.markdown(
+                        f'<a href="{export["url"]}" download="{prefix}.zip">⬇️ Download ZIP ({size_mb:.1f} MB)</a>',
+                        unsafe_allow_html=True,
+                    )
+                    st.caption(f"The link stays valid for {EXPORT_TTL_S // 60} minutes.")
+                elif "data" in export:
+                    st.download_button("⬇️ Download ZIP", export["data"], file_name=f"{prefix}.zip", mime="application/zip")
+                else:
+                    st.error(f"The ZIP would be {size_mb:.0f} MB, too large to download here. Narrow the search or date range.")
+            elif fmt == "Combined CSV":
+                csv_paths = [
+                    p for p in (artifact_path(Path(rec.get("path", "")) / "predictions.csv") for rec in records if rec.get("path"))
+                    if p is not None
+                ]
+                if not csv_paths:
+                    st.info("No saved prediction CSVs found for the selected records.")
+                    return
+                st.download_button("⬇️ Download Combined CSV", _combine_batch_csvs(csv_paths), file_name=f"batch_combined_{ts_now}.csv", mime="text/csv")
+            elif fmt == "CSV":
+                st.download_button("⬇️ Download CSV (Selected)", _export_records_as_csv(records), file_name=f"{prefix}.csv", mime="text/csv")
+            else:
+                json_bytes = json.dumps(records, indent=2, default=_sanitize_for_json)
+                st.download_button("⬇️ Download JSON (Selected)", json_bytes, file_name=f"{prefix}.json", mime="application/json")
+    except Exception as exc:
+        log_error(f"history._export_panel.{tab}", exc)
+        st.error("Could not prepare the export.")
+
+
+def _batch_summary_preview(summary: Dict[str, Any]) -> None:
+    columns = summary.get("columns", [])
+    st.markdown(f"**Preview (first {len(summary['head'])} rows)**")
+    st.dataframe(pd.DataFrame(summary["head"], columns=columns), use_container_width=True)
+    if summary.get("tail"):
+        st.markdown(f"**Last {len(summary['tail'])} rows**")
+        st.dataframe(pd.DataFrame(summary["tail"], columns=columns), use_container_width=True)
+    counts = summary.get("class_counts") or {}
+    if counts:
+        st.markdown("**Predicted classes**")
+        st.bar_chart(pd.Series({COVER_TYPE_MAP.get(int(k), k): v for k, v in counts.items()}, name="Rows"))
+
+
+# --- Filters, tab switches and record selection only rerun this fragment ---
+@profiled_fragment
+def _history_browser() -> None:
+    store = get_history_store()
     # --- Filters ---
     col_f1, _, col_f2, col_f3 = st.columns([3, 0.5, 2, 2])
     with col_f1:
-        all_labels = []
-        for rec in single_records_all + batch_records_all:
-            all_labels.append(rec.get("timestamp", ""))
-            all_labels.append(str(rec.get("file", "")))
-            all_labels.append(str(rec.get("prediction_name", "")))
-        all_labels = sorted({lbl for lbl in all_labels if lbl})
-
-        search_text = st.selectbox(
+        search_text = st.text_input(
             "🔎 Search",
-            options=[""] + all_labels, 
-            index=0,
-            help="Start typing to search by timestamp, file, or prediction name.",
+            help="Matches timestamp, file, prediction name or input values.",
         )
     with col_f2:
         date_from = st.date_input("From", value=None)
@@ -227,31 +311,10 @@ def show() -> None:
     if active_tab == TAB_LABELS[0]:
         if st.session_state.history_active_tab == TAB_LABELS[0]:
             st.markdown("### Recent Single Patch Records")
-            if not single_records_all:
+            if not store.count("single"):
                 st.info("No single patch history yet.")
             else:
-                filtered = []
-                for rec in reversed(single_records_all): 
-                    text_blob = json.dumps(rec, default=str).lower()
-                    if search_text and search_text.lower() not in text_blob:
-                        continue
-                    if date_from:
-                        try:
-                            ts = datetime.strptime(rec.get("timestamp", ""), "%Y-%m-%d %H:%M:%S")
-                            if ts.date() < date_from:
-                                continue
-                        except Exception:
-                            pass
-                    if date_to:
-                        try:
-                            ts = datetime.strptime(rec.get("timestamp", ""), "%Y-%m-%d %H:%M:%S")
-                            if ts.date() > date_to:
-                                continue
-                        except Exception:
-                            pass
-                    filtered.append(rec)
-
-                st.markdown(f"Showing **{len(filtered)}** records (most recent first)")
+                filtered = _paged_records(store, "single", search_text, date_from, date_to)
                 labels = [f"{r.get('timestamp','?')} — {r.get('prediction_name','-')}" for r in filtered]
                 selected = st.multiselect("Select records to export / preview", options=labels, key="history_single_select")
 
@@ -260,22 +323,7 @@ def show() -> None:
                     sel_records = [filtered[i] for i in sel_indices]
 
                     # --- Export options ---
-                    ts_now = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        try:
-                            csv_bytes = _export_records_as_csv(sel_records, filename_prefix=f"single_history_{ts_now}")
-                            st.download_button("⬇️ Download CSV (Selected)", csv_bytes, file_name=f"single_history_{ts_now}.csv", mime="text/csv")
-                        except Exception as e:
-                            log_error("history.show.single.csv", e)
-                            st.error("Could not prepare CSV.")
-                    with col2:
-                        try:
-                            json_bytes = json.dumps(sel_records, indent=2, default=_sanitize_for_json)
-                            st.download_button("⬇️ Download JSON (Selected)", json_bytes, file_name=f"single_history_{ts_now}.json", mime="application/json")
-                        except Exception as e:
-                            log_error("history.show.single.json", e)
-                            st.error("Could not prepare JSON.")
+                    _export_panel("single", sel_records)
 
                     st.markdown("### Preview / PDF Export")
                     for rec in sel_records:
@@ -293,19 +341,27 @@ def show() -> None:
                                 st.write("Probabilities (top 7):")
                                 st.write([round(float(x), 4) for x in (probs[:7] if isinstance(probs, (list, tuple)) else probs)])
 
-                            # --- PDF export per record ---
+                            # --- PDF export per record: the saved PDF, or generated on request ---
                             col_pdf1, col_pdf2, _ = st.columns([2, 4, 2])
                             with col_pdf1:
                                 try:
-                                    pdf_bytes = generate_single_patch_pdf(
-                                        user_inputs=rec.get("inputs", {}),
-                                        predicted_class=int(rec.get("prediction", 0)),
-                                        predicted_name=rec.get("prediction_name", "Unknown"),
-                                        probabilities=rec.get("probabilities", []),
-                                        cover_type_map=COVER_TYPE_MAP,
-                                        charts=[str(Path(rec.get("path", "")) / p) for p in ("radar.png", "grid.png", "bar.png")],
-                                    )
-                                    st.download_button(f"⬇️ PDF ({rec.get('timestamp')})", data=pdf_bytes, file_name=f"single_{rec.get('timestamp')}.pdf", mime="application/pdf")
+                                    saved_pdf = artifact_path(Path(rec.get("path", "")) / "prediction.pdf") if rec.get("path") else None
+                                    pdf_bytes = None
+                                    if saved_pdf is not None:
+                                        with open_artifact(saved_pdf) as fh:
+                                            pdf_bytes = fh.read()
+                                    elif st.button("📄 Generate PDF", key=f"history_pdf_{rec.get('timestamp')}"):
+                                        with span("history.pdf"):
+                                            pdf_bytes = generate_single_patch_pdf(
+                                                user_inputs=rec.get("inputs", {}),
+                                                predicted_class=int(rec.get("prediction", 0)),
+                                                predicted_name=rec.get("prediction_name", "Unknown"),
+                                                probabilities=rec.get("probabilities", []),
+                                                cover_type_map=COVER_TYPE_MAP,
+                                                charts=[str(Path(rec.get("path", "")) / p) for p in ("radar.png", "grid.png", "bar.png")],
+                                            )
+                                    if pdf_bytes is not None:
+                                        st.download_button(f"⬇️ PDF ({rec.get('timestamp')})", data=pdf_bytes, file_name=f"single_{rec.get('timestamp')}.pdf", mime="application/pdf")
                                 except Exception as e:
                                     log_error("history.show.single.pdf", e)
                                     st.warning("PDF generation failed for this record.")
@@ -327,31 +383,10 @@ def show() -> None:
     # --- Batch ---
     if active_tab == TAB_LABELS[1]:
         st.markdown("### Recent Batch Records")
-        if not batch_records_all:
+        if not store.count("batch"):
             st.info("No batch history yet.")
         else:
-            filtered_batch = []
-            for rec in reversed(batch_records_all):
-                text_blob = json.dumps(rec, default=str).lower()
-                if search_text and search_text.lower() not in text_blob:
-                    continue
-                if date_from:
-                    try:
-                        ts = datetime.strptime(rec.get("timestamp", ""), "%Y-%m-%d %H:%M:%S")
-                        if ts.date() < date_from:
-                            continue
-                    except Exception:
-                        pass
-                if date_to:
-                    try:
-                        ts = datetime.strptime(rec.get("timestamp", ""), "%Y-%m-%d %H:%M:%S")
-                        if ts.date() > date_to:
-                            continue
-                    except Exception:
-                        pass
-                filtered_batch.append(rec)
-
-            st.markdown(f"Showing **{len(filtered_batch)}** batch records (most recent first)")
+            filtered_batch = _paged_records(store, "batch", search_text, date_from, date_to)
 
             labels_b = [
                 f"{r.get('timestamp','?')} — {r.get('file', 'batch')}" for r in filtered_batch
@@ -368,53 +403,21 @@ def show() -> None:
                 sel_idx = [labels_b.index(lbl) for lbl in sel_b]
                 sel_recs = [filtered_batch[i] for i in sel_idx]
 
-                ts_now = datetime.now().strftime("%Y%m%d_%H%M%S")
                 with st.expander("📥 Export Selected Batch Records"):
-                    csv_frames = []
-                    json_list = []
-                    for rec in sel_recs:
-                        p = Path(rec.get("path", "")) / "predictions.csv"
-                        if p.exists():
-                            try:
-                                csv_frames.append(pd.read_csv(p))
-                            except Exception as exc:
-                                log_error("history.show.batch.read_csv", exc)
-                        else:
-                            if rec.get("predictions_preview"):
-                                json_list.append({"predictions_preview": rec.get("predictions_preview")})
-
-                    if csv_frames:
-                        try:
-                            combined = pd.concat(csv_frames, ignore_index=True)
-                            st.download_button(
-                                "⬇️ Download Combined CSV",
-                                combined.to_csv(index=False).encode("utf-8"),
-                                file_name=f"batch_combined_{ts_now}.csv",
-                                mime="text/csv",
-                            )
-                        except Exception as exc:
-                            log_error("history.show.batch.concat", exc)
-                            st.error("Failed to combine CSVs.")
-
-                    st.download_button(
-                        "⬇️ Download JSON (Selected Batch)",
-                        json.dumps(sel_recs, indent=2, default=_sanitize_for_json),
-                        file_name=f"batch_history_{ts_now}.json",
-                        mime="application/json",
-                    )
+                    _export_panel("batch", sel_recs)
 
                 for rec in sel_recs:
                     with st.expander(f"Batch: {rec.get('file','batch')} — {rec.get('timestamp')}"):
                         st.write(f"Rows processed: {rec.get('rows', 'Unknown')}")
-                        csv_path = Path(rec.get("path", "")) / "predictions.csv"
-                        if csv_path.exists():
-                            try:
-                                df_preview = pd.read_csv(csv_path)
-                                st.markdown("**Preview (first 10 rows)**")
-                                st.dataframe(df_preview.head(10), use_container_width=True)
-                            except Exception as exc:
-                                log_error("history.show.batch.preview", exc)
-                                st.warning("Could not read saved CSV for preview.")
+                        try:
+                            with span("history.batch_preview"):
+                                summary = load_batch_summary(rec.get("path", ""))
+                        except Exception as exc:
+                            log_error("history.show.batch.preview", exc)
+                            summary = None
+                            st.warning("Could not read saved CSV for preview.")
+                        if summary:
+                            _batch_summary_preview(summary)
                         else:
                             st.info("No saved CSV found for this record.")
 
@@ -431,5 +434,40 @@ def show() -> None:
             else:
                 st.info("Select one or more batch records above to preview/export.")
 
+
+# --- Polls the shared store's change token; other sessions' saves show up without a reload ---
+@profiled_fragment(run_every=HISTORY_POLL_SECONDS)
+def _new_records_notice() -> None:
+    try:
+        new = get_history_store().count_since(st.session_state.get("history_seen_version", 0))
+    except Exception as exc:
+        log_error("history._new_records_notice", exc)
+        return
+    if new:
+        parts = [f"{n} {tab}" for tab, n in sorted(new.items())]
+        col_msg, col_btn = st.columns([4, 1])
+        col_msg.info(f"🔔 New records saved since this view was loaded: {', '.join(parts)}.")
+        if col_btn.button("🔄 Refresh", key="history_refresh"):
+            st.rerun()
+
+
+def show() -> None:
+    st.subheader("📜 Prediction History")
+    st.caption("Review, filter and export previously saved Single and Batch predictions.")
+    themed_divider()
+
+    store = get_history_store()
+    st.session_state.history_seen_version = store.version()
+    with span("history.summary"):
+        single_summary, batch_summary = store.summary("single"), store.summary("batch")
+
+    _new_records_notice()
+
+    # --- Top metrics ---
+    _summary_metrics(single_summary, batch_summary)
+    _trend_charts(store, single_summary, batch_summary)
+
+    _history_browser()
+
     themed_divider()
-    st.info("Tip: If history seems out-of-sync, try reloading the page or restarting the app. The history file is stored at `dataset/history.json`.")
+    st.info("Tip: Records saved from other sessions are announced at the top of this page. The history is stored at `dataset/history.db`.")
@@ -1,10 +1,11 @@
 import streamlit as st
-from utils.model import load_model
+from utils.model import get_model
+
+MODEL_PATH = "model/xgb_model.pkl"
 
-@st.cache_resource
 def load_model_cached(path):
     try:
-        return load_model(path)
+        return get_model(path)
     except FileNotFoundError:
         st.error(f"❌ Model file not found at `{path}`.")
         st.stop()
@@ -0,0 +1,33 @@
+import sys
+
+from utils.startup import timed_import
+
+# --- Sidebar label -> page module, imported on first navigation ---
+PAGES = {
+    "About": "src.about",
+    "Dataset Preview": "src.dataset",
+    "Single Patch Prediction": "src.single",
+    "Batch Prediction": "src.batch",
+    "History": "src.history",
+}
+
+# --- Operator pages, listed only with ?perf=1 in the URL or FOREST_PERF_PAGE=1 ---
+HIDDEN_PAGES = {
+    "Performance": "src.performance",
+}
+
+def page_names(include_hidden: bool = False) -> list:
+    return list(PAGES) + (list(HIDDEN_PAGES) if include_hidden else [])
+
+def _module_name(name: str):
+    return PAGES.get(name) or HIDDEN_PAGES.get(name)
+
+def is_loaded(name: str) -> bool:
+    return _module_name(name) in sys.modules
+
+def load_page(name: str):
+    """Return the page module for a sidebar label, or None for an unknown label."""
+    module_name = _module_name(name)
+    if module_name is None:
+        return None
+    return timed_import(module_name)
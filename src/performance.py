@@ -0,0 +1,130 @@
+import pandas as pd
+import streamlit as st
+
+from utils import memory, perf, profiler, storage, warmup
+from utils.cache import ASSET_CACHE
+from utils.startup import import_report
+from utils.theme import themed_divider
+
+
+@profiler.profiled_fragment
+def _stage_table():
+    rows = perf.snapshot()
+    if not rows:
+        st.info("No stages recorded yet in this process. Use the app and come back.")
+        return
+
+    df = pd.DataFrame(rows).set_index("stage")
+    ms = df[["mean", "p50", "p95", "p99", "max"]] * 1000
+    st.dataframe(
+        pd.concat([df[["count", "errors"]], ms.round(1).add_suffix(" (ms)")], axis=1),
+        use_container_width=True,
+    )
+    st.markdown("**p95 per stage (ms)**")
+    st.bar_chart(ms["p95"])
+
+    col1, col2, _ = st.columns([2, 2, 4])
+    with col1:
+        st.download_button(
+            "⬇️ Prometheus metrics",
+            perf.prometheus_text(),
+            file_name="metrics.prom",
+            mime="text/plain",
+        )
+    with col2:
+        if st.button("♻️ Reset timings", key="perf_reset"):
+            perf.reset()
+            st.rerun(scope="fragment")
+
+
+@profiler.profiled_fragment
+def _memory_panel():
+    st.markdown("### 🧠 Memory")
+    data = memory.report()
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("RSS", "n/a" if data["rss_bytes"] is None else f"{data['rss_bytes'] / 1_048_576:.0f} MB")
+    c2.metric("Traced", "off" if data["traced_bytes"] is None else f"{data['traced_bytes'] / 1_048_576:.1f} MB")
+    c3.metric("Live figures", data["live_figures"], help=f"{data['figures_opened']:,} opened / {data['figures_closed']:,} closed via managed_figure")
+    c4.metric("Sessions", data["sessions"], help=f"{data['session_bytes_total'] / 1_048_576:.1f} MB of session state in total")
+    if data["traced_bytes"] is None:
+        st.caption("Set `FOREST_MEMTRACE=1` to record per-page allocation deltas and growth by source line.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**This session's state (KB)**")
+        sizes = memory.session_state_size(st.session_state)
+        st.dataframe(pd.Series(sizes, name="KB").div(1024).round(1), use_container_width=True)
+    with col2:
+        if data["pages"]:
+            st.markdown("**Traced delta per page render (KB)**")
+            pages = pd.DataFrame(data["pages"]).T
+            pages[["last", "total", "max"]] = (pages[["last", "total", "max"]] / 1024).round(1)
+            st.dataframe(pages, use_container_width=True)
+        growth = memory.top_growth()
+        if growth:
+            st.markdown("**Growth since start, by line**")
+            st.dataframe(pd.DataFrame(growth).set_index("where"), use_container_width=True)
+    st.json(data["caches"], expanded=False)
+
+
+def _profiles_panel():
+    st.markdown("### 🔥 Rerun profiles")
+    if not profiler.enabled(st.query_params):
+        st.caption("Off. Add `&profile=1` to the URL (or set `FOREST_PROFILE=1`) to sample every rerun.")
+    files = profiler.recent_profiles()
+    if not files:
+        st.info(f"No profiles in `{profiler.PROFILE_DIR}` yet.")
+        return
+    choice = st.selectbox("Profile (time_tab_action)", [p.name for p in files], key="perf_profile_file")
+    text = (profiler.PROFILE_DIR / choice).read_text(encoding="utf-8")
+    st.download_button("⬇️ Collapsed stacks", text, file_name=choice, mime="text/plain")
+    st.caption("Open in speedscope.app or pipe through `flamegraph.pl` for a flame graph.")
+
+
+def show():
+    st.subheader("⏱️ Performance")
+    st.caption(
+        f"Rolling window of the last {perf.WINDOW} samples per stage, this server process only. "
+        f"Also written to `{perf.METRICS_FILE}` every {perf.EXPORT_INTERVAL_S:g}s for the Prometheus textfile collector."
+    )
+    themed_divider()
+
+    _stage_table()
+    themed_divider()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("### 🗂️ Asset cache")
+        stats = ASSET_CACHE.stats()
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Entries", f"{stats['entries']:,}")
+        c2.metric("Size", f"{stats['bytes'] / 1_048_576:.1f} / {stats['max_bytes'] / 1_048_576:.0f} MB")
+        c3.metric("Hit rate", f"{stats['hit_rate']:.0%}")
+        st.json(stats, expanded=False)
+    with col2:
+        st.markdown("### 🔥 Warm-up")
+        status = warmup.warmup_status()
+        st.metric("State", status["state"].title())
+        if status["timings"]:
+            st.bar_chart(pd.Series(status["timings"], name="seconds"))
+        if status["errors"]:
+            st.json(status["errors"])
+
+    col3, col4 = st.columns(2)
+    with col3:
+        st.markdown("### 📦 Module imports")
+        report = import_report()
+        if report:
+            st.dataframe(pd.DataFrame(report).set_index("module"), use_container_width=True)
+    with col4:
+        st.markdown("### 🧹 Saved_Predictions sweeper")
+        sweep = storage.sweeper_status()
+        if sweep:
+            st.json(sweep, expanded=False)
+        else:
+            st.info("No sweep has finished yet.")
+
+    themed_divider()
+    _memory_panel()
+    themed_divider()
+    _profiles_panel()
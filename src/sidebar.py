@@ -1,11 +1,13 @@
 import streamlit as st
 import os, json, random, time
-from utils.theme import apply_theme, themed_divider
+from utils.theme import themed_divider
 from utils.voice import add_intro_voice
-from src import about
+from utils.profiler import profiled_fragment
+from src import about, pages
 
 
 CACHE_FILE = ".cache/theme.json"
+CAPTION_INTERVAL = 120
 
 def save_theme(theme_name: str):
     os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
@@ -18,18 +20,38 @@ def load_theme() -> str:
             return json.load(f).get("theme", "Default")
     return "Default"
 
+def _on_theme_change():
+    theme = st.session_state["theme_select"].lower()
+    st.session_state["theme"] = theme
+    save_theme(theme)
+
+@profiled_fragment
+def _voice_panel():
+    add_intro_voice("audio/intro.mp3")
+
+@profiled_fragment(run_every=CAPTION_INTERVAL)
+def _rotating_caption():
+    # --- run_every can fire a moment before the interval has fully elapsed ---
+    elapsed = time.time() - st.session_state.get("caption_time", 0)
+    if "sidebar_caption" not in st.session_state or elapsed >= CAPTION_INTERVAL - 1:
+        st.session_state.sidebar_caption = random.choice(about.captions())
+        st.session_state.caption_time = time.time()
+    st.markdown(f"<small>{st.session_state.sidebar_caption}</small>", unsafe_allow_html=True)
+
 def render_sidebar():
     if "active_tab" not in st.session_state:
         st.session_state.active_tab = "About"
 
     # --- Navigation ---
     st.markdown("<h2>⏬ Navigation</h2>", unsafe_allow_html=True)
+    show_hidden = st.query_params.get("perf") == "1" or os.environ.get("FOREST_PERF_PAGE") == "1"
+    names = pages.page_names(include_hidden=show_hidden)
+    if st.session_state.active_tab not in names:
+        st.session_state.active_tab = "About"
     st.selectbox(
         "Go to:",
-        ["About", "Dataset Preview", "Single Patch Prediction", "Batch Prediction", "History"],
-        index=["About", "Dataset Preview", "Single Patch Prediction", "Batch Prediction", "History"].index(
-            st.session_state.get("active_tab", "About")
-        ),
+        names,
+        index=names.index(st.session_state.get("active_tab", "About")),
         key="active_tab"
     )
     themed_divider()
@@ -37,21 +59,14 @@ def render_sidebar():
     # --- Theme ---
     st.markdown("<h2>🎨 Theme</h2>", unsafe_allow_html=True)
 
-    theme = st.selectbox(
+    # --- Applied by main.py on the rerun this callback triggers ---
+    st.selectbox(
         "Select Theme",
         options=["Default", "Dark", "Tree"],
         index=["default", "dark", "tree"].index(st.session_state.get("theme", "default")),
-        key="theme_select"
-    ).lower()
-
-    # --- Only apply/save if changed ---
-    if theme != st.session_state.get("theme", "default"):
-        st.session_state["theme"] = theme
-        apply_theme(theme)
-        save_theme(theme)
-        st.rerun()
-
-    apply_theme(st.session_state["theme"])
+        key="theme_select",
+        on_change=_on_theme_change,
+    )
 
     if st.session_state["theme"] == "tree":
         st.markdown(
@@ -62,16 +77,9 @@ def render_sidebar():
     themed_divider()
 
     st.markdown("<h2>🎤 Voice Introduction</h2>", unsafe_allow_html=True)
-    add_intro_voice("audio/intro.mp3")
+    _voice_panel()
     themed_divider()
 
-    if "sidebar_caption" not in st.session_state:
-        st.session_state.sidebar_caption = random.choice(about.captions())
-        st.session_state.caption_time = time.time()
-    if time.time() - st.session_state.caption_time > 120:
-        st.session_state.sidebar_caption = random.choice(about.captions())
-        st.session_state.caption_time = time.time()
-        st.rerun()
-    st.markdown(f"<small>{st.session_state.sidebar_caption}</small>", unsafe_allow_html=True)
+    _rotating_caption()
     
     themed_divider()
\ No newline at end of file
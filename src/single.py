@@ -1,7 +1,7 @@
 import streamlit as st
 from pathlib import Path
 import json, numpy as np, pandas as pd
-from utils.model import load_model, predict_cover_type
+from utils.model import predict_cover_type
 from utils.data import prepare_input_data
 from datetime import datetime
 from utils.pdf import generate_single_patch_pdf
@@ -11,20 +11,12 @@ from utils.viz import (
     plot_patch_grid,
 )
 from utils.randomizer import randomize_inputs
-from utils.theme import apply_global_styles 
+from utils.perf import span
+from utils.profiler import profiled_fragment
+from utils.storage import ingest, new_run_dir
 from src.history import save_to_history
+from src.model_loader import MODEL_PATH, load_model_cached
 
-apply_global_styles()
-
-@st.cache_resource(show_spinner="Loading prediction model...")
-def load_model_cached(path: str):
-    try:
-        return load_model(path)
-    except Exception as e:
-        st.error(f"❌ Failed to load model: {e}")
-        st.stop()
-
-model = load_model_cached("model/xgb_model.pkl")
 SAVE_ROOT = Path("Saved_Predictions")
 
 cover_type_map = {
@@ -145,8 +137,12 @@ def get_user_input():
 
 def make_prediction(inputs: dict):
     with st.spinner("Predicting Cover Type..."):
-        input_data = prepare_input_data(inputs)
-        predicted_class, probabilities = predict_cover_type(model, input_data)
+        with span("single.load_model"):
+            model = load_model_cached(MODEL_PATH)
+        with span("single.encode"):
+            input_data = prepare_input_data(inputs)
+        with span("single.inference"):
+            predicted_class, probabilities = predict_cover_type(model, input_data)
         predicted_class += 1 
         return predicted_class, probabilities
             
@@ -159,8 +155,7 @@ def display_results(pred_class, probs, user_inputs):
     # ------------------------
     # Auto-save to history
     # ------------------------
-    save_dir = SAVE_ROOT / "single" / timestamp
-    save_dir.mkdir(parents=True, exist_ok=True)
+    save_dir = new_run_dir("single")
 
     record = sanitize({
         "timestamp": timestamp,
@@ -172,7 +167,7 @@ def display_results(pred_class, probs, user_inputs):
         "path": str(save_dir),
     })
 
-    with open(save_dir / "prediction.json", "w", encoding="utf-8") as f:
+    with span("single.write_json"), open(save_dir / "prediction.json", "w", encoding="utf-8") as f:
         json.dump(record, f, indent=2, ensure_ascii=False)
 
     if confidence > 95:
@@ -203,13 +198,16 @@ def display_results(pred_class, probs, user_inputs):
     with viz_tab1:
         _,col2,_ = st.columns([1,3,1])
         with col2:    
-            radar_chart = plot_probability_radar_chart(probs, cover_type_map, save_path=save_dir / "radar.png")
+            with span("single.chart.radar"):
+                plot_probability_radar_chart(probs, cover_type_map, save_path=save_dir / "radar.png")
     with viz_tab2:
         _,col2,_ = st.columns([1,2,1])
         with col2:    
-            grid_chart  = plot_patch_grid(probs, cover_type_map, save_path=save_dir / "grid.png")
+            with span("single.chart.grid"):
+                plot_patch_grid(probs, cover_type_map, save_path=save_dir / "grid.png")
     with viz_tab3:
-        plot_prediction_probabilities(probs, cover_type_map, save_path=save_dir / "bar.png")
+        with span("single.chart.bar"):
+            plot_prediction_probabilities(probs, cover_type_map, save_path=save_dir / "bar.png")
 
     try:        
         charts_paths = [
@@ -217,36 +215,44 @@ def display_results(pred_class, probs, user_inputs):
             str(save_dir / "grid.png"),
             str(save_dir / "bar.png"),
         ]
-        pdf_bytes = generate_single_patch_pdf(
-            user_inputs=user_inputs,
-            predicted_class=pred_class,
-            predicted_name=predicted_name,
-            probabilities=record["probabilities"],
-            cover_type_map=cover_type_map,
-            charts=charts_paths,
-        )
-        with open(save_dir / "prediction.pdf", "wb") as f:
-            f.write(pdf_bytes)
-
-        save_to_history("single", {
-            "timestamp": timestamp,
-            "path": str(save_dir),
-            "prediction": int(pred_class),
-            "prediction_name": predicted_name,
-            "confidence": confidence,
-            "probabilities": record["probabilities"],
-            "inputs": user_inputs,
-        })
+        with span("single.pdf"):
+            pdf_bytes = generate_single_patch_pdf(
+                user_inputs=user_inputs,
+                predicted_class=pred_class,
+                predicted_name=predicted_name,
+                probabilities=record["probabilities"],
+                cover_type_map=cover_type_map,
+                charts=charts_paths,
+            )
+            with open(save_dir / "prediction.pdf", "wb") as f:
+                f.write(pdf_bytes)
+        with span("single.dedupe"):
+            ingest(save_dir)
+
+        with span("single.history_save"):
+            save_to_history("single", {
+                "timestamp": timestamp,
+                "path": str(save_dir),
+                "prediction": int(pred_class),
+                "prediction_name": predicted_name,
+                "confidence": confidence,
+                "probabilities": record["probabilities"],
+                "inputs": user_inputs,
+            })
                 
         st.success("The Record has been saved successfully!")
     except Exception as e:
         st.error(f"The Generation can not be saved. ({e})")
                 
-def show():
-
+# --- Form submits and the randomize button only rerun this panel, not main.py ---
+@profiled_fragment
+def _prediction_panel():
     user_inputs = get_user_input()
 
     if user_inputs:
         with st.spinner("Running prediction..."):
             pred_class, probs = make_prediction(user_inputs)
-            display_results(pred_class, probs, user_inputs)
\ No newline at end of file
+            display_results(pred_class, probs, user_inputs)
+
+def show():
+    _prediction_panel()
\ No newline at end of file
@@ -0,0 +1,43 @@
+import shutil
+from pathlib import Path
+
+import streamlit as st
+
+from utils.cache import content_hash
+from utils.columnar import _atomic_write
+from utils.logger import log_error, log_info
+
+# --- Streamlit serves ./static/ at app/static/ when server.enableStaticServing is on ---
+STATIC_DIR = Path("static")
+STATIC_URL_PREFIX = "app/static"
+
+def static_serving_enabled() -> bool:
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+def publish_asset(src_path: str) -> str | None:
+    """Copy an asset into the static folder under a content-hashed name and return its URL.
+
+    The URL only changes when the file content does, so browsers keep their cached
+    copy (ETag / Last-Modified, plus a long max-age for ``?v=`` URLs on Tornado-based
+    Streamlit releases). Returns ``None`` when the file is missing or static serving
+    is disabled, so callers can fall back to inlining.
+    """
+    src = Path(src_path)
+    if not static_serving_enabled() or not src.exists():
+        return None
+
+    try:
+        digest = content_hash(str(src))
+        target = STATIC_DIR / f"{src.stem}.{digest}{src.suffix}"
+        if not target.exists():
+            STATIC_DIR.mkdir(parents=True, exist_ok=True)
+            with open(src, "rb") as fh:
+                _atomic_write(target, lambda out: shutil.copyfileobj(fh, out))
+            log_info("assets", f"Published {src} as {target}")
+        return f"{STATIC_URL_PREFIX}/{target.name}?v={digest}"
+    except Exception as e:
+        log_error("assets.publish_asset", e)
+        return None
@@ -1,19 +1,131 @@
+import base64
 import functools
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
 from PIL import Image
-import base64
 
-def cache_result(func):
-    """Simple caching decorator."""
-    return functools.lru_cache(maxsize=None)(func)
+DEFAULT_BUDGET_MB = 64
+
+
+def _sizeof(value) -> int:
+    """Approximate resident size of a cached value in bytes."""
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, Image.Image):
+        return value.width * value.height * len(value.getbands())
+    return sys.getsizeof(value)
+
+
+class AssetCache:
+    """Thread-safe LRU cache for file-derived values with a byte budget.
+
+    Entries are keyed on the resolved path plus a caller-supplied variant and
+    are only served while the file's mtime and size are unchanged.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes = 0
+
+    def get(self, path: str, loader, variant: tuple = ()):
+        stat = os.stat(path)
+        key = (os.path.realpath(path), variant)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == stamp:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self._drop(key)
+                self.invalidations += 1
+            self.misses += 1
+
+        value = loader()
+        nbytes = _sizeof(value)
+        if nbytes > self.max_bytes:
+            return value
 
-@cache_result
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (stamp, value, nbytes)
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+        return value
+
+    def _drop(self, key) -> None:
+        _, _, nbytes = self._entries.pop(key)
+        self.bytes -= nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+ASSET_CACHE = AssetCache(int(os.environ.get("FOREST_ASSET_CACHE_MB", DEFAULT_BUDGET_MB)) * 1024 * 1024)
+
+
+def cached_asset(func):
+    """Cache ``func(path, *args)`` in the shared asset cache, keyed on path, mtime and args."""
+    @functools.wraps(func)
+    def wrapper(path: str, *args):
+        return ASSET_CACHE.get(path, lambda: func(path, *args), variant=(func.__qualname__, *args))
+    return wrapper
+
+@cached_asset
+def read_asset_bytes(path: str) -> bytes:
+    """Raw file contents (cached)."""
+    with open(path, "rb") as f:
+        return f.read()
+
+@cached_asset
 def encode_image_base64(path: str) -> str:
     """Load image from path and return base64 string (cached)."""
     with open(path, "rb") as f:
         return base64.b64encode(f.read()).decode("utf-8")
 
-@cache_result
+@cached_asset
+def content_hash(path: str) -> str:
+    """Short SHA-256 of the file contents (cached)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+@cached_asset
 def resize_image(path: str, size: tuple[int, int]) -> Image.Image:
     """Resize image and cache the result."""
-    img = Image.open(path)
-    return img.resize(size)
+    with Image.open(path) as img:
+        return img.resize(size)
@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import content_hash
+from utils.logger import log_error, log_info
+
+# --- One directory per source CSV (<stem>_<path hash>): meta.json plus one .npy file per column ---
+CACHE_ROOT = Path("dataset/.cache")
+FORMAT_VERSION = 1
+
+
+def _downcast(values: pd.Series) -> np.ndarray:
+    """Smallest lossless dtype: bool for 0/1 flags, int8/16/32 for integers, float32 when exact."""
+    if pd.api.types.is_bool_dtype(values):
+        return values.to_numpy(dtype=bool)
+    if pd.api.types.is_integer_dtype(values):
+        if values.isin((0, 1)).all():
+            return values.to_numpy(dtype=bool)
+        return pd.to_numeric(values, downcast="integer").to_numpy()
+    if pd.api.types.is_float_dtype(values):
+        as32 = values.astype(np.float32)
+        if np.array_equal(as32.to_numpy(dtype=np.float64), values.to_numpy(), equal_nan=True):
+            return as32.to_numpy()
+        return values.to_numpy()
+    return values.astype(str).to_numpy(dtype=object)
+
+
+class ColumnarDataset:
+    """Read-only, memory-mapped column store built once from a CSV.
+
+    Columns are only paged in when read, so a preview of a few columns touches
+    a few kilobytes instead of parsing and holding the whole file.
+    """
+
+    def __init__(self, cache_dir: Path, meta: dict):
+        self.cache_dir = cache_dir
+        self.meta = meta
+        self.columns = [c["name"] for c in meta["columns"]]
+        self.n_rows = int(meta["rows"])
+        self._files = {c["name"]: cache_dir / c["file"] for c in meta["columns"]}
+        self._mapped: dict = {}
+
+    def column(self, name: str) -> np.ndarray:
+        arr = self._mapped.get(name)
+        if arr is None:
+            arr = np.load(self._files[name], mmap_mode="r", allow_pickle=True)
+            self._mapped[name] = arr
+        return arr
+
+    def frame(self, columns=None, rows=None) -> pd.DataFrame:
+        """DataFrame of ``columns`` (default all) for ``rows`` (a slice or index array; default all)."""
+        columns = self.columns if columns is None else list(columns)
+        rows = slice(None) if rows is None else rows
+        data = {name: np.asarray(self.column(name)[rows]) for name in columns}
+        index = np.arange(self.n_rows)[rows]
+        return pd.DataFrame(data, index=index, columns=columns)
+
+    # --- Row indexes: built on first use, saved next to the columns, memory-mapped afterwards ---
+    def _index(self, key: str, builder) -> np.ndarray:
+        arr = self._mapped.get(key)
+        if arr is None:
+            path = self.cache_dir / f"{key}.npy"
+            if not path.exists():
+                _atomic_write(path, lambda fh: np.save(fh, builder()))
+            arr = np.load(path, mmap_mode="r")
+            self._mapped[key] = arr
+        return arr
+
+    def _sorted(self, name: str):
+        """(row order, values in that order) for a column, via a stable argsort."""
+        order = self._index(f"order_{self._files[name].stem}", lambda: np.argsort(self.column(name), kind="stable").astype(np.int32))
+        return order, self._index(f"sorted_{self._files[name].stem}", lambda: np.asarray(self.column(name))[order])
+
+    def flag_rows(self, name: str) -> np.ndarray:
+        """Ascending row ids where a one-hot / boolean column is set."""
+        return self._index(f"flag_{self._files[name].stem}", lambda: np.flatnonzero(self.column(name)).astype(np.int32))
+
+    def value_rows(self, name: str, values) -> np.ndarray:
+        """Ascending row ids where ``name`` equals any of ``values``."""
+        order, ordered = self._sorted(name)
+        parts = [order[np.searchsorted(ordered, v, "left"):np.searchsorted(ordered, v, "right")] for v in values]
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int32)
+
+    def range_rows(self, name: str, low, high) -> np.ndarray:
+        """Ascending row ids where ``low <= name <= high``."""
+        order, ordered = self._sorted(name)
+        return np.sort(order[np.searchsorted(ordered, low, "left"):np.searchsorted(ordered, high, "right")])
+
+    def value_range(self, name: str):
+        """(min, max) of a column, read from the ends of its sorted index."""
+        _, ordered = self._sorted(name)
+        return (ordered[0], ordered[-1]) if len(ordered) else (None, None)
+
+    @property
+    def dtypes(self) -> pd.Series:
+        return pd.Series({c["name"]: c["dtype"] for c in self.meta["columns"]})
+
+    @property
+    def non_null(self) -> pd.Series:
+        return pd.Series({c["name"]: c["non_null"] for c in self.meta["columns"]})
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(c["nbytes"] for c in self.meta["columns"]))
+
+
+def intersect_rows(*row_sets) -> np.ndarray | None:
+    """Rows present in every given ascending row-id array; ``None`` entries mean "no filter"."""
+    result = None
+    for rows in row_sets:
+        if rows is None:
+            continue
+        result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+    return result
+
+
+def _atomic_write(path: Path, write) -> None:
+    """Write through a uniquely named temp file in the same directory, then rename into place.
+
+    Concurrent writers (sessions or processes) each get their own temp file, so a
+    reader only ever sees one complete version.
+    """
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _cache_dir(source: Path) -> Path:
+    """Cache directory for a source; the resolved-path hash keeps same-named CSVs apart."""
+    digest = hashlib.sha1(str(source.resolve()).encode("utf-8")).hexdigest()[:12]
+    return CACHE_ROOT / f"{source.stem}_{digest}"
+
+
+def _read_meta(cache_dir: Path) -> dict | None:
+    try:
+        with open(cache_dir / "meta.json", "r", encoding="utf-8") as fh:
+            meta = json.load(fh)
+        return meta if meta.get("version") == FORMAT_VERSION else None
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(cache_dir: Path, meta: dict) -> None:
+    _atomic_write(cache_dir / "meta.json", lambda fh: fh.write(json.dumps(meta, indent=1).encode("utf-8")))
+
+
+def build_columnar(source: Path, stamp: dict) -> dict:
+    """Convert ``source`` into a fresh cache directory and swap it into place."""
+    cache_dir = _cache_dir(source)
+    CACHE_ROOT.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{cache_dir.name}.", suffix=".building", dir=CACHE_ROOT))
+
+    try:
+        df = pd.read_csv(source)
+        df.columns = [str(c).strip() for c in df.columns]
+        columns = []
+        for i, name in enumerate(df.columns):
+            arr = _downcast(df[name])
+            fname = f"{i:04d}.npy"
+            np.save(tmp_dir / fname, arr, allow_pickle=arr.dtype == object)
+            columns.append({
+                "name": name,
+                "file": fname,
+                "dtype": str(arr.dtype),
+                "nbytes": int(arr.nbytes),
+                "non_null": int(df[name].notna().sum()),
+            })
+        meta = {"version": FORMAT_VERSION, "source": str(source), "rows": int(len(df)), "columns": columns, **stamp}
+        _write_meta(tmp_dir, meta)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+    # --- Caches used to be keyed by stem alone ---
+    legacy = CACHE_ROOT / source.stem
+    if legacy.is_dir() and (_read_meta(legacy) or {}).get("source") == str(source):
+        shutil.rmtree(legacy, ignore_errors=True)
+    log_info(
+        "columnar",
+        f"Cached {source} as {len(columns)} columns: "
+        f"{df.memory_usage(index=False).sum() / 1_048_576:.2f} MB -> {sum(c['nbytes'] for c in columns) / 1_048_576:.2f} MB",
+    )
+    return meta
+
+
+_datasets: dict = {}
+_datasets_lock = threading.Lock()
+
+
+def open_columnar(path: str) -> ColumnarDataset:
+    """Columnar view of a CSV, (re)built when the source changes.
+
+    mtime and size are checked on every call; only when they differ is the content
+    hash compared, so touching the file without changing it does not force a rebuild.
+    """
+    source = Path(path)
+    st_ = source.stat()
+    stamp = {"mtime_ns": st_.st_mtime_ns, "size": st_.st_size}
+
+    with _datasets_lock:
+        cached = _datasets.get(source)
+        if cached is not None and all(cached.meta.get(k) == v for k, v in stamp.items()):
+            return cached
+
+        cache_dir = _cache_dir(source)
+        meta = _read_meta(cache_dir)
+        if meta is None or any(meta.get(k) != v for k, v in stamp.items()):
+            digest = content_hash(str(source))
+            if meta is not None and meta.get("hash") == digest:
+                meta.update(stamp)
+                _write_meta(cache_dir, meta)
+            else:
+                try:
+                    meta = build_columnar(source, {**stamp, "hash": digest})
+                except Exception as exc:
+                    log_error("columnar.open_columnar", exc)
+                    raise
+        dataset = ColumnarDataset(cache_dir, meta)
+        _datasets[source] = dataset
+        return dataset
@@ -24,6 +24,11 @@ def prepare_input_data(user_inputs):
 
     return input_data
 
+def invalid_onehot_rows(data, prefix):
+    """Columns starting with ``prefix`` and a boolean mask of rows where they do not sum to exactly 1."""
+    cols = [col for col in data.columns if col.startswith(prefix)]
+    return cols, data[cols].to_numpy().sum(axis=1) != 1
+
 def validate_csv(data, st):
     expected_cols = 54
     model = load_model("model/xgb_model.pkl")
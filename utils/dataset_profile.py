@@ -0,0 +1,110 @@
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from utils.columnar import CACHE_ROOT, ColumnarDataset, _atomic_write, open_columnar
+from utils.logger import log_error, log_info
+
+# --- Profiles are stored as dataset/.cache/profile_<cache dir>_<content hash>.json ---
+PROFILE_VERSION = 1
+TARGET = "Cover_Type"
+ID_COLUMNS = ("S_No", "Id")
+HIST_BINS = 30
+QUANTILES = (0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0)
+CLASS_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def _round(arr, digits: int = 4):
+    return np.round(np.asarray(arr, dtype=np.float64), digits).tolist()
+
+
+def compute_profile(ds: ColumnarDataset) -> dict:
+    """Distributions, correlations and per-class summaries of a labelled dataset.
+
+    Numeric features are stacked into one matrix so quantiles, moments and
+    correlations are single NumPy calls; per-class means and one-hot rates
+    come from one matrix product with the class indicator matrix.
+    """
+    flags = [c for c, dtype in ds.dtypes.items() if dtype == "bool"]
+    numeric = [c for c in ds.columns if c not in flags and c != TARGET and c not in ID_COLUMNS]
+
+    X = np.column_stack([np.asarray(ds.column(c), dtype=np.float64) for c in numeric])
+    F = np.column_stack([np.asarray(ds.column(c), dtype=np.float64) for c in flags]) if flags else np.empty((ds.n_rows, 0))
+    profile = {
+        "version": PROFILE_VERSION,
+        "rows": ds.n_rows,
+        "numeric": numeric,
+        "flags": flags,
+        "quantile_levels": list(QUANTILES),
+        "quantiles": _round(np.quantile(X, QUANTILES, axis=0).T),
+        "mean": _round(X.mean(axis=0)),
+        "std": _round(X.std(axis=0)),
+        "correlation": _round(np.corrcoef(X, rowvar=False)),
+        "flag_counts": F.sum(axis=0).astype(int).tolist(),
+        "histograms": {},
+    }
+    for i, name in enumerate(numeric):
+        counts, edges = np.histogram(X[:, i], bins=HIST_BINS)
+        profile["histograms"][name] = {"counts": counts.tolist(), "edges": _round(edges, 2)}
+
+    if TARGET in ds.columns:
+        y = np.asarray(ds.column(TARGET))
+        classes, inverse = np.unique(y, return_inverse=True)
+        Y = np.zeros((len(y), len(classes)))
+        Y[np.arange(len(y)), inverse] = 1
+        counts = Y.sum(axis=0)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(classes) + 1))
+        profile["classes"] = {
+            "labels": classes.astype(int).tolist(),
+            "counts": counts.astype(int).tolist(),
+            "mean": _round((Y.T @ X) / counts[:, None]),
+            "flag_rates": _round((Y.T @ F) / counts[:, None]),
+            "quantile_levels": list(CLASS_QUANTILES),
+            # --- [class][quantile][feature], from contiguous per-class slices of the sorted rows ---
+            "quantiles": [
+                _round(np.quantile(X[order[bounds[k]:bounds[k + 1]]], CLASS_QUANTILES, axis=0))
+                for k in range(len(classes))
+            ],
+        }
+    return profile
+
+
+_profiles: dict = {}
+_profiles_lock = threading.Lock()
+
+
+def load_profile(path: str) -> dict:
+    """Profile of a CSV, computed once per file content and persisted next to its columnar cache."""
+    ds = open_columnar(path)
+    # --- Named after the columnar cache directory, so same-named sources keep separate profiles ---
+    stem = ds.cache_dir.name
+    key = (stem, ds.meta["hash"])
+    with _profiles_lock:
+        if key in _profiles:
+            return _profiles[key]
+
+        target = CACHE_ROOT / f"profile_{stem}_{ds.meta['hash']}.json"
+        profile = None
+        if target.exists():
+            try:
+                with open(target, "r", encoding="utf-8") as fh:
+                    profile = json.load(fh)
+                if profile.get("version") != PROFILE_VERSION:
+                    profile = None
+            except (OSError, ValueError) as exc:
+                log_error("dataset_profile.load_profile", exc)
+                profile = None
+
+        if profile is None:
+            profile = compute_profile(ds)
+            _atomic_write(target, lambda fh: fh.write(json.dumps(profile).encode("utf-8")))
+            for stale in CACHE_ROOT.glob(f"profile_{stem}_*.json"):
+                if stale != target:
+                    stale.unlink(missing_ok=True)
+            log_info("dataset_profile", f"Profiled {path} ({profile['rows']:,} rows) -> {target}")
+
+        _profiles[key] = profile
+        return profile
@@ -0,0 +1,123 @@
+import json
+import os
+import secrets
+import shutil
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+from utils.assets import STATIC_DIR, STATIC_URL_PREFIX, static_serving_enabled
+from utils.logger import log_error, log_info
+from utils.storage import open_artifact
+
+# --- Already-compressed formats are stored as-is; deflating them again only costs CPU ---
+STORED_SUFFIXES = (".png", ".jpg", ".jpeg", ".pdf", ".gz", ".zip")
+CHUNK_SIZE = 1 << 20
+
+# --- Published exports are served from disk by Streamlit's static route (capped at 200 MB there) ---
+EXPORT_DIR = STATIC_DIR / "exports"
+EXPORT_TTL_S = int(os.environ.get("FOREST_EXPORT_TTL_S", 3600))
+STATIC_MAX_BYTES = 200 * 1024 * 1024
+# --- Without static serving the archive goes through download_button, which keeps it in memory ---
+INLINE_MAX_BYTES = int(os.environ.get("FOREST_EXPORT_INLINE_MAX_MB", 50)) * 1024 * 1024
+
+
+def _zip_info(arcname: str, mtime: float) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(arcname, date_time=time.localtime(max(mtime, 315532800))[:6])
+    stored = Path(arcname).suffix.lower() in STORED_SUFFIXES
+    info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+    return info
+
+
+def _add_bytes(zf: zipfile.ZipFile, arcname: str, data: bytes) -> None:
+    zf.writestr(_zip_info(arcname, time.time()), data)
+
+
+def _add_file(zf: zipfile.ZipFile, arcname: str, path: Path) -> int:
+    """Copy one artifact into the archive in chunks; gzipped cold copies go in decompressed."""
+    info = _zip_info(arcname, path.stat().st_mtime)
+    with open_artifact(path) as src, zf.open(info, "w", force_zip64=True) as dst:
+        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+    return info.file_size
+
+
+def write_history_zip(records_by_tab: dict, out) -> dict:
+    """Write selected history records and their saved run files as a ZIP to the binary stream ``out``.
+
+    Layout: ``<tab>/records.json``, ``<tab>/records.csv`` and ``<tab>/<run>/<file>`` for every
+    predictions CSV, summary, chart and PDF that is still on disk. Files are streamed one
+    chunk at a time, so memory stays flat however large the saved runs are.
+    """
+    stats = {"records": 0, "files": 0, "bytes": 0, "missing_runs": 0}
+    with zipfile.ZipFile(out, "w", allowZip64=True) as zf:
+        for tab, records in records_by_tab.items():
+            if not records:
+                continue
+            stats["records"] += len(records)
+            _add_bytes(zf, f"{tab}/records.json", json.dumps(records, indent=2, default=str).encode("utf-8"))
+            _add_bytes(zf, f"{tab}/records.csv", pd.DataFrame(records).to_csv(index=False).encode("utf-8"))
+
+            for rec in records:
+                run_dir = Path(rec.get("path", ""))
+                if not rec.get("path") or not run_dir.is_dir():
+                    stats["missing_runs"] += 1
+                    continue
+                for path in sorted(run_dir.iterdir()):
+                    if not path.is_file():
+                        continue
+                    name = path.name[:-3] if path.suffix == ".gz" else path.name
+                    try:
+                        stats["bytes"] += _add_file(zf, f"{tab}/{run_dir.name}/{name}", path)
+                        stats["files"] += 1
+                    except Exception as exc:
+                        log_error("export.write_history_zip", exc)
+    log_info("export", f"Built history ZIP: {stats}")
+    return stats
+
+
+def prune_exports(now: float | None = None) -> None:
+    """Delete published exports older than EXPORT_TTL_S."""
+    if not EXPORT_DIR.exists():
+        return
+    cutoff = (now or time.time()) - EXPORT_TTL_S
+    for folder in EXPORT_DIR.iterdir():
+        try:
+            if folder.stat().st_mtime < cutoff:
+                shutil.rmtree(folder) if folder.is_dir() else folder.unlink()
+        except OSError as exc:
+            log_error("export.prune_exports", exc)
+
+
+def build_history_zip(records_by_tab: dict, file_name: str) -> dict:
+    """Write the history ZIP to disk and decide how it can be downloaded.
+
+    Returns ``{"size", "url"}`` when it was published under the static folder (streamed
+    from disk by the web server), ``{"size", "data"}`` when it is small enough to hand to
+    ``st.download_button`` (which holds it in memory for the session), or ``{"size"}`` only
+    when it exceeds both limits.
+    """
+    prune_exports()
+    publish = static_serving_enabled()
+    folder = EXPORT_DIR / secrets.token_urlsafe(12) if publish else None
+    if folder is not None:
+        folder.mkdir(parents=True)
+    fd, tmp_name = tempfile.mkstemp(suffix=".zip", dir=folder)
+    tmp = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write_history_zip(records_by_tab, fh)
+        size = tmp.stat().st_size
+        if publish and size <= STATIC_MAX_BYTES:
+            target = folder / file_name
+            tmp.replace(target)
+            return {"size": size, "url": f"{STATIC_URL_PREFIX}/exports/{folder.name}/{file_name}"}
+        if size <= INLINE_MAX_BYTES:
+            return {"size": size, "data": tmp.read_bytes()}
+        return {"size": size}
+    finally:
+        tmp.unlink(missing_ok=True)
+        if folder is not None and not any(folder.iterdir()):
+            folder.rmdir()
@@ -0,0 +1,576 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from utils.logger import log_error, log_info
+from utils.storage import load_batch_summary
+
+# -----------------------
+# Constants & Paths
+# -----------------------
+HISTORY_DB: Path = Path("dataset/history.db")
+LEGACY_HISTORY_FILE: Path = Path("dataset/history.json")
+HISTORY_BACKUP_DIR: Path = Path("dataset/history_backup")
+
+TABS = ("single", "batch")
+Cursor = Tuple[str, int]
+COMPACT_EVERY = 500
+SALVAGE_CHUNK = 64
+
+# --- Timestamp formats found in saved records (single saves used the folder stamp) ---
+TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y%m%d_%H%M%S")
+SEARCH_FIELDS = ("timestamp", "file", "prediction", "prediction_name")
+
+# --- Running aggregates: day "*" holds all-time totals, other days are YYYY-MM-DD ---
+ALL_TIME = "*"
+CONFIDENCE_BIN_WIDTH = 10
+
+# --- Substring search index: FTS5 trigram table over records.search_text ---
+SEARCH_INDEX = "records_fts"
+TRIGRAM = 3
+# --- A limited, newest-first read of a term with this many hits scans (ts, id) order instead ---
+DENSE_MATCHES = 1000
+
+
+def normalize_timestamp(value: Any) -> Optional[str]:
+    """ISO ``YYYY-MM-DD HH:MM:SS`` for any known record timestamp format, else None."""
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(str(value), fmt).strftime("%Y-%m-%d %H:%M:%S")
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def search_text(record: Dict[str, Any]) -> str:
+    """Lower-cased text that the History search matches against, built once at write time."""
+    parts = [str(record.get(k, "")) for k in SEARCH_FIELDS]
+    parts.append(normalize_timestamp(record.get("timestamp")) or "")
+    inputs = record.get("inputs")
+    if isinstance(inputs, dict):
+        parts.extend(str(v) for v in inputs.values())
+    return " ".join(p for p in parts if p).lower()
+
+
+def _backfill_index_columns(conn: sqlite3.Connection) -> None:
+    rows = conn.execute("SELECT id, payload FROM records").fetchall()
+    updates = []
+    for row in rows:
+        rec = json.loads(row[1])
+        updates.append((normalize_timestamp(rec.get("timestamp")), search_text(rec), row[0]))
+    conn.executemany("UPDATE records SET ts = ?, search_text = ? WHERE id = ?", updates)
+
+
+def _batch_class_counts(record: Dict[str, Any]) -> Dict[str, int]:
+    """Per-class row counts for a batch record; older records are counted from their saved run."""
+    counts = record.get("class_counts")
+    if isinstance(counts, dict):
+        return {str(k): int(v) for k, v in counts.items()}
+    try:
+        summary = load_batch_summary(record.get("path", ""))
+        return summary["class_counts"] if summary else {}
+    except Exception as exc:
+        log_error("history_store._batch_class_counts", exc)
+        return {}
+
+
+def aggregate_deltas(tab: str, record: Dict[str, Any]) -> List[Tuple[str, str, float]]:
+    """(metric, key, delta) increments one record contributes to the running aggregates."""
+    deltas: List[Tuple[str, str, float]] = [("records", "", 1)]
+    if tab == "single":
+        if record.get("prediction") is not None:
+            deltas.append(("class", str(record["prediction"]), 1))
+        conf = record.get("confidence")
+        if isinstance(conf, (int, float)):
+            bucket = min(int(conf // CONFIDENCE_BIN_WIDTH) * CONFIDENCE_BIN_WIDTH, 100 - CONFIDENCE_BIN_WIDTH)
+            deltas += [("confidence_sum", "", float(conf)), ("confidence_n", "", 1), ("confidence_bin", f"{bucket:03d}", 1)]
+    else:
+        rows = record.get("rows")
+        if isinstance(rows, (int, float)):
+            deltas.append(("rows", "", int(rows)))
+        deltas += [("class", k, v) for k, v in _batch_class_counts(record).items()]
+    return deltas
+
+
+def _backfill_aggregates(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM aggregates")
+    for row in conn.execute("SELECT tab, ts, payload FROM records").fetchall():
+        _apply_aggregates(conn, row[0], row[1], json.loads(row[2]))
+
+
+def _apply_aggregates(conn: sqlite3.Connection, tab: str, ts: Optional[str], record: Dict[str, Any], sign: int = 1) -> None:
+    days = [ALL_TIME] + ([ts[:10]] if ts else [])
+    conn.executemany(
+        """
+        INSERT INTO aggregates (tab, day, metric, key, value) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (tab, day, metric, key) DO UPDATE SET value = value + excluded.value
+        """,
+        [(tab, day, metric, key, sign * delta) for day in days for metric, key, delta in aggregate_deltas(tab, record)],
+    )
+
+
+def _create_search_index(conn: sqlite3.Connection) -> None:
+    """Trigram index for History search; SQLite builds without FTS5 keep the instr() scan."""
+    try:
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_INDEX} USING fts5("
+            "search_text, content='records', content_rowid='id', tokenize='trigram')"
+        )
+    except sqlite3.OperationalError as exc:
+        log_error("history_store._create_search_index", f"FTS5 trigram search unavailable: {exc}")
+        return
+    conn.execute(f"INSERT INTO {SEARCH_INDEX} ({SEARCH_INDEX}) VALUES ('rebuild')")
+
+
+def _has_search_index(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute(f"SELECT 1 FROM {SEARCH_INDEX} LIMIT 0")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _match_phrase(text: str) -> str:
+    """FTS5 phrase literal: with the trigram tokenizer it matches ``text`` as a substring."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+# --- Schema migrations, applied in order and tracked with PRAGMA user_version ---
+MIGRATIONS: List[Union[str, Callable[[sqlite3.Connection], None]]] = [
+    """
+    CREATE TABLE IF NOT EXISTS records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tab TEXT NOT NULL,
+        timestamp TEXT,
+        payload TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_records_tab ON records (tab, id);
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    """,
+    """
+    ALTER TABLE records ADD COLUMN ts TEXT;
+    ALTER TABLE records ADD COLUMN search_text TEXT NOT NULL DEFAULT '';
+    CREATE INDEX IF NOT EXISTS idx_records_tab_ts ON records (tab, ts, id);
+    """,
+    _backfill_index_columns,
+    # --- Keyset pagination compares (ts, id) row values, so ts must never be NULL ---
+    "UPDATE records SET ts = '' WHERE ts IS NULL",
+    """
+    CREATE TABLE IF NOT EXISTS aggregates (
+        tab TEXT NOT NULL,
+        day TEXT NOT NULL,
+        metric TEXT NOT NULL,
+        key TEXT NOT NULL DEFAULT '',
+        value REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (tab, day, metric, key)
+    ) WITHOUT ROWID;
+    """,
+    _backfill_aggregates,
+    _create_search_index,
+]
+
+
+class HistoryCorruptError(sqlite3.DatabaseError):
+    """The database opened but failed PRAGMA quick_check."""
+
+
+def _is_corruption(exc: sqlite3.DatabaseError) -> bool:
+    """True only for a damaged file (failed quick_check, SQLITE_CORRUPT, SQLITE_NOTADB)."""
+    if isinstance(exc, HistoryCorruptError):
+        return True
+    code = getattr(exc, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (sqlite3.SQLITE_CORRUPT, sqlite3.SQLITE_NOTADB)
+    message = str(exc).lower()
+    return "malformed" in message or "not a database" in message
+
+
+class HistoryStore:
+    """Append-only prediction history backed by SQLite in WAL mode.
+
+    Each save is a single-row INSERT, so its cost does not grow with the
+    size of the history. Connections are per thread; Streamlit runs every
+    session on its own thread. Writers serialise on SQLite's write lock
+    (BEGIN IMMEDIATE + busy timeout), which also holds across processes,
+    so concurrent sessions never overwrite each other's records.
+    """
+
+    def __init__(self, path: Path = HISTORY_DB, legacy_file: Optional[Path] = LEGACY_HISTORY_FILE):
+        self.path = Path(path)
+        self.legacy_file = Path(legacy_file) if legacy_file is not None else None
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._open_or_recover()
+
+    # -----------------------
+    # Connection & setup
+    # -----------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _close_local(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _open_or_recover(self) -> None:
+        try:
+            conn = self._connect()
+            status = conn.execute("PRAGMA quick_check").fetchone()[0]
+            if status != "ok":
+                raise HistoryCorruptError(f"quick_check failed: {status}")
+            self._migrate(conn)
+        except sqlite3.DatabaseError as exc:
+            # --- Lock timeouts and other operational errors leave a healthy file alone ---
+            if not _is_corruption(exc):
+                raise
+            self._close_local()
+            self._recover(exc)
+            self._migrate(self._connect())
+        self._import_legacy()
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        start = conn.execute("PRAGMA user_version").fetchone()[0]
+        for i, step in enumerate(MIGRATIONS[start:], start=start + 1):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # --- Another process may have applied this step since user_version was first read ---
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= i:
+                    conn.execute("COMMIT")
+                    continue
+                if callable(step):
+                    step(conn)
+                else:
+                    for statement in step.split(";"):
+                        if statement.strip():
+                            conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {i}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            log_info("history_store", f"Applied history schema migration {i}")
+        # --- Every insert path runs after a migrate, so this is set before the first write ---
+        self.indexed_search = _has_search_index(conn)
+
+    def _recover(self, exc: Exception) -> None:
+        """Move a damaged database aside and rebuild it from whatever rows are still readable."""
+        salvaged: List[tuple] = []
+        meta: List[tuple] = []
+        try:
+            conn = sqlite3.connect(self.path)
+        except Exception:
+            conn = None
+        if conn is not None:
+            try:
+                meta.extend(conn.execute("SELECT key, value FROM meta"))
+            except Exception:
+                pass
+            try:
+                max_id = conn.execute("SELECT max(id) FROM records").fetchone()[0] or 0
+            except Exception:
+                max_id = 0
+            # --- Read in id ranges so one damaged page only loses the rows stored on it ---
+            for start in range(0, max_id, SALVAGE_CHUNK):
+                try:
+                    salvaged.extend(conn.execute(
+                        "SELECT tab, timestamp, payload FROM records WHERE id > ? AND id <= ? ORDER BY id",
+                        (start, start + SALVAGE_CHUNK),
+                    ).fetchall())
+                except Exception:
+                    continue
+            conn.close()
+        if salvaged and not any(key == "legacy_imported" for key, _ in meta):
+            meta.append(("legacy_imported", "salvaged"))
+
+        HISTORY_BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_path = HISTORY_BACKUP_DIR / f"history_corrupt_{ts}.db"
+        n = 1
+        while backup_path.exists():
+            backup_path = HISTORY_BACKUP_DIR / f"history_corrupt_{ts}_{n}.db"
+            n += 1
+        for suffix in ("", "-wal", "-shm"):
+            src = Path(f"{self.path}{suffix}")
+            if src.exists():
+                shutil.move(str(src), f"{backup_path}{suffix}")
+        log_error("history_store._recover", f"Corrupted history backed up to {backup_path}: {exc}")
+
+        conn = self._connect()
+        self._migrate(conn)
+        if salvaged or meta:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta)
+            for tab, _, payload in salvaged:
+                self._insert(conn, tab, json.loads(payload))
+            conn.execute("COMMIT")
+            log_info("history_store._recover", f"Salvaged {len(salvaged)} history records")
+
+    def _import_legacy(self) -> None:
+        """One-time import of the old whole-file JSON history (skipped when ``legacy_file`` is None)."""
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+            return
+        records: List[tuple] = []
+        if self.legacy_file is not None and self.legacy_file.exists():
+            try:
+                with open(self.legacy_file, "r", encoding="utf-8") as fh:
+                    data = json.load(fh)
+                for tab in TABS:
+                    for rec in data.get(tab, []) if isinstance(data, dict) else []:
+                        records.append((tab, rec))
+            except Exception as exc:
+                log_error("history_store._import_legacy", exc)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+                for tab, rec in records:
+                    self._insert(conn, tab, rec)
+                conn.execute("INSERT INTO meta (key, value) VALUES ('legacy_imported', ?)", (str(len(records)),))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if records:
+            log_info("history_store", f"Imported {len(records)} records from {self.legacy_file}")
+
+    # -----------------------
+    # Writes
+    # -----------------------
+    def _insert(self, conn: sqlite3.Connection, tab: str, record: Dict[str, Any]) -> int:
+        """Insert a record and fold it into the running aggregates in the same transaction."""
+        ts = normalize_timestamp(record.get("timestamp")) or ""
+        text = search_text(record)
+        cur = conn.execute(
+            "INSERT INTO records (tab, timestamp, ts, search_text, payload) VALUES (?, ?, ?, ?, ?)",
+            (tab, record.get("timestamp"), ts, text, json.dumps(record, ensure_ascii=False)),
+        )
+        if self.indexed_search:
+            conn.execute(f"INSERT INTO {SEARCH_INDEX} (rowid, search_text) VALUES (?, ?)", (cur.lastrowid, text))
+        _apply_aggregates(conn, tab, ts, record)
+        return int(cur.lastrowid)
+
+    def append(self, tab: str, record: Dict[str, Any]) -> int:
+        if tab not in TABS:
+            raise ValueError("tab must be 'single' or 'batch'")
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            record_id = self._insert(conn, tab, record)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % COMPACT_EVERY == 0
+        if due:
+            self.compact()
+        return record_id
+
+    def forget_runs(self, run_dirs) -> int:
+        """Delete the records saved from ``run_dirs`` (pruned run folders) and take them out of the aggregates."""
+        paths = [str(Path(p)) for p in run_dirs]
+        if not paths:
+            return 0
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                f"SELECT id, tab, ts, search_text, payload FROM records WHERE json_extract(payload, '$.path') IN ({', '.join('?' * len(paths))})",
+                paths,
+            ).fetchall()
+            for row in rows:
+                _apply_aggregates(conn, row["tab"], row["ts"], json.loads(row["payload"]), sign=-1)
+            if self.indexed_search:
+                conn.executemany(
+                    f"INSERT INTO {SEARCH_INDEX} ({SEARCH_INDEX}, rowid, search_text) VALUES ('delete', ?, ?)",
+                    [(row["id"], row["search_text"]) for row in rows],
+                )
+            conn.executemany("DELETE FROM records WHERE id = ?", [(row["id"],) for row in rows])
+            conn.execute("DELETE FROM aggregates WHERE value = 0")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if rows:
+            log_info("history_store", f"Forgot {len(rows)} records of pruned runs")
+        return len(rows)
+
+    def compact(self, vacuum: bool = False) -> None:
+        """Fold the WAL back into the main file; optionally rebuild it to reclaim space."""
+        try:
+            conn = self._connect()
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            if vacuum:
+                conn.execute("VACUUM")
+            conn.execute("PRAGMA optimize")
+            log_info("history_store.compact", f"Compacted {self.path} (vacuum={vacuum})")
+        except Exception as exc:
+            log_error("history_store.compact", exc)
+
+    # -----------------------
+    # Change notification
+    # -----------------------
+    def version(self) -> int:
+        """Change token: the newest record id. Ids only grow, so any new save bumps it."""
+        row = self._connect().execute("SELECT max(id) FROM records").fetchone()
+        return int(row[0] or 0)
+
+    def count_since(self, after_id: int) -> Dict[str, int]:
+        """Records saved after ``after_id`` (a :meth:`version` token), counted per tab."""
+        rows = self._connect().execute(
+            "SELECT tab, count(*) FROM records WHERE id > ? GROUP BY tab", (after_id,)
+        ).fetchall()
+        return {row[0]: int(row[1]) for row in rows}
+
+    # -----------------------
+    # Reads
+    # -----------------------
+    def _filters(self, tab: str, text: Optional[str], date_from: Optional[date], date_to: Optional[date], limited: bool = False):
+        """WHERE clause over the indexed columns; date bounds are inclusive calendar days.
+
+        Search terms of three or more characters are looked up in the trigram
+        index, and the matching rows are fetched by id. For ``limited`` reads
+        of a common term, walking the (tab, ts, id) index and testing each row
+        fills a page sooner, so those (like terms under three characters and
+        SQLite builds without FTS5) use instr().
+        """
+        clauses, params = ["tab = ?"], [tab]
+        text = text.strip().lower() if text else ""
+        if text and self.indexed_search and len(text) >= TRIGRAM:
+            phrase = _match_phrase(text)
+            dense = limited and self._connect().execute(
+                f"SELECT count(*) FROM (SELECT 1 FROM {SEARCH_INDEX} WHERE {SEARCH_INDEX} MATCH ? LIMIT ?)",
+                (phrase, DENSE_MATCHES),
+            ).fetchone()[0] >= DENSE_MATCHES
+            if not dense:
+                # --- Unary + keeps the planner on the rowid lookups rather than the tab index ---
+                clauses = ["+tab = ?", f"id IN (SELECT rowid FROM {SEARCH_INDEX} WHERE {SEARCH_INDEX} MATCH ?)"]
+                params.append(phrase)
+                text = ""
+        if text:
+            clauses.append("instr(search_text, ?) > 0")
+            params.append(text)
+        if date_from:
+            clauses.append("ts >= ?")
+            params.append(f"{date_from.isoformat()} 00:00:00")
+        if date_to:
+            clauses.append("ts < ?")
+            params.append(f"{(date_to + timedelta(days=1)).isoformat()} 00:00:00")
+        return " AND ".join(clauses), params
+
+    def count(self, tab: str, text: Optional[str] = None, date_from: Optional[date] = None, date_to: Optional[date] = None) -> int:
+        where, params = self._filters(tab, text, date_from, date_to)
+        return int(self._connect().execute(f"SELECT count(*) FROM records WHERE {where}", params).fetchone()[0])
+
+    def query(
+        self,
+        tab: str,
+        text: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Matching records, newest first. Search and date filters run in SQLite."""
+        where, params = self._filters(tab, text, date_from, date_to, limited=limit is not None)
+        sql = f"SELECT payload FROM records WHERE {where} ORDER BY ts DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(r["payload"]) for r in self._connect().execute(sql, params).fetchall()]
+
+    def page(
+        self,
+        tab: str,
+        text: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        limit: int = 25,
+        before: Optional[Cursor] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+        """One page of matching records, newest first, plus the cursor for the next (older) page.
+
+        Keyset pagination on (ts, id): each page is an index range scan of
+        ``limit + 1`` rows, however deep into the history it is. Searches for
+        rarer terms fetch their trigram-index hits by id and sort those instead.
+        """
+        where, params = self._filters(tab, text, date_from, date_to, limited=True)
+        if before is not None:
+            where += " AND (ts, id) < (?, ?)"
+            params.extend(before)
+        rows = self._connect().execute(
+            f"SELECT id, ts, payload FROM records WHERE {where} ORDER BY ts DESC, id DESC LIMIT ?",
+            [*params, limit + 1],
+        ).fetchall()
+        next_cursor = (rows[limit - 1]["ts"], rows[limit - 1]["id"]) if len(rows) > limit else None
+        return [json.loads(r["payload"]) for r in rows[:limit]], next_cursor
+
+    def summary(self, tab: str) -> Dict[str, Dict[str, float]]:
+        """All-time aggregates for a tab as ``{metric: {key: value}}``; one indexed lookup."""
+        out: Dict[str, Dict[str, float]] = {}
+        rows = self._connect().execute(
+            "SELECT metric, key, value FROM aggregates WHERE tab = ? AND day = ?", (tab, ALL_TIME)
+        ).fetchall()
+        for row in rows:
+            out.setdefault(row["metric"], {})[row["key"]] = row["value"]
+        return out
+
+    def daily_totals(self, tab: str, metric: str = "records", since: Optional[date] = None) -> Dict[str, float]:
+        """Per-day totals of one aggregate metric, oldest day first."""
+        params: List[Any] = [tab, metric, ALL_TIME]
+        sql = "SELECT day, sum(value) FROM aggregates WHERE tab = ? AND metric = ? AND day != ?"
+        if since is not None:
+            sql += " AND day >= ?"
+            params.append(since.isoformat())
+        sql += " GROUP BY day ORDER BY day"
+        return {row[0]: row[1] for row in self._connect().execute(sql, params).fetchall()}
+
+    def load(self, tab: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Records for a tab in insertion order, optionally only the newest ``limit``."""
+        conn = self._connect()
+        if limit is None:
+            rows = conn.execute("SELECT payload FROM records WHERE tab = ? ORDER BY id", (tab,)).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT payload FROM (SELECT id, payload FROM records WHERE tab = ? ORDER BY id DESC LIMIT ?) ORDER BY id",
+                (tab, limit),
+            ).fetchall()
+        return [json.loads(r["payload"]) for r in rows]
+
+    def load_all(self, limit: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        return {tab: self.load(tab, limit) for tab in TABS}
+
+
+_store: Optional[HistoryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """Process-wide history store, opened (and recovered / migrated) on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = HistoryStore()
+        return _store
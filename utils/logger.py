@@ -1,28 +1,151 @@
+import atexit
+import copy
+import gzip
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
+from datetime import date, datetime
 from pathlib import Path
-from datetime import datetime
 
 # --- Create logs directory ---
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 
-LOG_FILE = LOG_DIR / f"app_{datetime.now().strftime('%Y-%m-%d')}.log"
+LOG_FILE = LOG_DIR / "app.log"
 
-# --- Configure logger ---
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.DEBUG,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+# --- Tunables (environment) ---
+LOG_LEVEL = os.environ.get("FOREST_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("FOREST_LOG_FORMAT", "text").lower()
+LOG_MAX_BYTES = int(float(os.environ.get("FOREST_LOG_MAX_MB", 10)) * 1024 * 1024)
+LOG_BACKUP_COUNT = int(os.environ.get("FOREST_LOG_BACKUPS", 14))
 
-console = logging.StreamHandler()
-console.setLevel(logging.INFO)
-console.setFormatter(logging.Formatter("%(levelname)s | %(message)s"))
-logging.getLogger("").addHandler(console)
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "component": getattr(record, "component", None),
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RotatingLogHandler(logging.handlers.RotatingFileHandler):
+    """Rolls the log over at midnight or when it reaches ``maxBytes``.
+
+    Rotated files are gzipped to ``app_<stamp>.log.gz`` and only the newest
+    ``backupCount`` archives are kept. Runs on the queue listener thread, so
+    rotation never blocks a request.
+    """
+
+    def __init__(self, filename, max_bytes: int, backup_count: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        path = Path(self.baseFilename)
+        self._day = date.fromtimestamp(path.stat().st_mtime) if path.exists() else date.today()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if date.today() != self._day and os.path.exists(self.baseFilename):
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        base = Path(self.baseFilename)
+        if base.exists() and base.stat().st_size > 0:
+            stamp = datetime.fromtimestamp(base.stat().st_mtime).strftime("%Y-%m-%d_%H%M%S")
+            target = base.with_name(f"{base.stem}_{stamp}.log.gz")
+            n = 1
+            while target.exists():
+                target = base.with_name(f"{base.stem}_{stamp}_{n}.log.gz")
+                n += 1
+            self.rotate(str(base), str(target))
+            self._prune()
+        self._day = date.today()
+        if not self.delay:
+            self.stream = self._open()
+
+    def rotator(self, source: str, dest: str) -> None:
+        with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+    def _prune(self) -> None:
+        base = Path(self.baseFilename)
+        # --- Only archives doRollover wrote; plain app_*.log files (e.g. the committed ones) are left alone ---
+        archives = sorted(base.parent.glob(f"{base.stem}_*.log.gz"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in archives[self.backupCount:]:
+            old.unlink(missing_ok=True)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener with the message merged and the traceback kept as ``exc_text``."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TRACEBACKS.formatException(record.exc_info)
+            record.exc_info = None
+        if not hasattr(record, "component"):
+            record.component = None
+        return record
+
+
+_TRACEBACKS = logging.Formatter()
+
+
+def _stop_listener(listener: logging.handlers.QueueListener) -> None:
+    """Flush queued records on shutdown; safe to call more than once."""
+    if getattr(listener, "_thread", None) is not None:
+        listener.stop()
+
+
+def _configure() -> None:
+    """Route the root logger through a queue; file and console I/O happen on a listener thread."""
+    root = logging.getLogger()
+    if getattr(root, "_forest_listener", None) is not None:
+        return
+
+    file_handler = RotatingLogHandler(LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT)
+    file_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+
+    console = logging.StreamHandler()
+    console.setLevel(logging.INFO)
+    console.setFormatter(logging.Formatter("%(levelname)s | %(message)s"))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, file_handler, console, respect_handler_level=True)
+    listener.start()
+    atexit.register(_stop_listener, listener)
+
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+    root._forest_listener = listener
+
+
+_configure()
 
 def log_error(module: str, error: Exception) -> None:
-    logging.error(f"[{module}] {error}", exc_info=True)
+    logging.error(f"[{module}] {error}", exc_info=True, extra={"component": module})
 
 def log_info(module: str, message: str) -> None:
-    logging.info(f"[{module}] {message}")
+    logging.info(f"[{module}] {message}", extra={"component": module})
@@ -0,0 +1,276 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from utils.logger import log_error, log_info
+
+# --- Tunables (environment); tracemalloc costs CPU and memory, so it is opt-in ---
+MEMTRACE = os.environ.get("FOREST_MEMTRACE") == "1"
+MEMTRACE_FRAMES = int(os.environ.get("FOREST_MEMTRACE_FRAMES", 1))
+REPORT_INTERVAL_S = float(os.environ.get("FOREST_MEMORY_REPORT_S", 600))
+SESSION_SAMPLE_S = 30
+SESSION_TTL_S = 3600
+MAX_DEPTH = 4
+
+_lock = threading.Lock()
+_pages: dict = {}
+_sessions: dict = {}
+_figures = {"opened": 0, "closed": 0}
+_baseline = None
+_reporter = None
+
+
+# --- Figure lifecycle ---
+@contextmanager
+def managed_figure(nrows: int = 1, ncols: int = 1, subplot_kw=None, gridspec_kw=None, **fig_kw):
+    """A standalone ``Figure`` and its axes, like ``plt.subplots`` but outside pyplot.
+
+    pyplot's figure manager is global state shared by every session thread, so
+    figures are built directly and only live as long as the ``with`` block: use
+    (save / render) the figure inside it. On exit its artists are cleared.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(**fig_kw)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots(nrows, ncols, subplot_kw=subplot_kw, gridspec_kw=gridspec_kw)
+    with _lock:
+        _figures["opened"] += 1
+    try:
+        yield fig, ax
+    finally:
+        fig.clear()
+        with _lock:
+            _figures["closed"] += 1
+
+
+def live_figures() -> int:
+    """Figures still registered with pyplot; the app's own charts never are, so this should stay 0."""
+    plt = sys.modules.get("matplotlib.pyplot")
+    return len(plt.get_fignums()) if plt is not None else 0
+
+
+# --- Process memory ---
+def rss_bytes() -> int | None:
+    """Current resident set size; peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "r") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+def start_tracing() -> None:
+    """Start tracemalloc (FOREST_MEMTRACE=1) and keep a baseline snapshot for :func:`top_growth`."""
+    global _baseline
+    if not MEMTRACE or tracemalloc.is_tracing():
+        return
+    tracemalloc.start(MEMTRACE_FRAMES)
+    _baseline = tracemalloc.take_snapshot()
+    log_info("memory", f"tracemalloc started ({MEMTRACE_FRAMES} frame(s))")
+
+
+@contextmanager
+def page(tab: str):
+    """Record the traced-memory delta of rendering ``tab``.
+
+    Deltas are process-wide, so concurrent sessions blur them; the running
+    total per page is what points at a leak.
+    """
+    if not tracemalloc.is_tracing():
+        yield
+        return
+    before = tracemalloc.get_traced_memory()[0]
+    try:
+        yield
+    finally:
+        delta = tracemalloc.get_traced_memory()[0] - before
+        with _lock:
+            stats = _pages.setdefault(tab, {"renders": 0, "last": 0, "total": 0, "max": 0})
+            stats["renders"] += 1
+            stats["last"] = delta
+            stats["total"] += delta
+            stats["max"] = max(stats["max"], delta)
+
+
+def top_growth(limit: int = 10) -> list:
+    """Source lines whose traced allocations grew most since tracing started."""
+    if _baseline is None or not tracemalloc.is_tracing():
+        return []
+    diff = tracemalloc.take_snapshot().compare_to(_baseline, "lineno")
+    return [
+        {"where": str(stat.traceback), "size_diff": stat.size_diff, "count_diff": stat.count_diff, "size": stat.size}
+        for stat in diff[:limit]
+    ]
+
+
+# --- Session state ---
+def deep_size(value, _seen=None, _depth=0) -> int:
+    """Approximate bytes held by ``value``, following containers a few levels deep."""
+    _seen = set() if _seen is None else _seen
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    # --- pandas/numpy are only checked for once something has imported them ---
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if hasattr(value, "getbuffer"):
+        return int(value.getbuffer().nbytes)
+    size = sys.getsizeof(value)
+    if _depth < MAX_DEPTH:
+        if isinstance(value, dict):
+            size += sum(deep_size(k, _seen, _depth + 1) + deep_size(v, _seen, _depth + 1) for k, v in value.items())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            size += sum(deep_size(v, _seen, _depth + 1) for v in value)
+    return size
+
+
+def session_state_size(session_state) -> dict:
+    """Bytes per session-state key, largest first."""
+    sizes = {}
+    for key in list(session_state.keys()):
+        try:
+            sizes[str(key)] = deep_size(session_state[key])
+        except Exception:
+            continue
+    return dict(sorted(sizes.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def track_session(session_state) -> None:
+    """Remember this session's state size, measured at most every SESSION_SAMPLE_S seconds."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    now = time.time()
+    with _lock:
+        entry = _sessions.get(ctx.session_id)
+        if entry is not None and now - entry["measured"] < SESSION_SAMPLE_S:
+            entry["seen"] = now
+            return
+    sizes = session_state_size(session_state)
+    with _lock:
+        _sessions[ctx.session_id] = {
+            "bytes": sum(sizes.values()),
+            "keys": len(sizes),
+            "largest": list(sizes.items())[:3],
+            "measured": now,
+            "seen": now,
+        }
+        for sid in [s for s, e in _sessions.items() if now - e["seen"] > SESSION_TTL_S]:
+            del _sessions[sid]
+
+
+# --- Caches ---
+def _streamlit_cache_bytes() -> dict:
+    """Bytes per st.cache_data / st.cache_resource function (Streamlit's stats API differs across versions)."""
+    from streamlit.runtime.caching import cache_data_api, cache_resource_api
+
+    totals: dict = {}
+    for provider in (cache_data_api.get_data_cache_stats_provider(), cache_resource_api.get_resource_cache_stats_provider()):
+        stats = provider.get_stats()
+        entries = [s for family in stats.values() for s in family] if isinstance(stats, dict) else stats
+        for stat in entries:
+            name = f"{stat.category_name}:{stat.cache_name}"
+            totals[name] = totals.get(name, 0) + stat.byte_length
+    return totals
+
+
+def cache_stats() -> dict:
+    """Entry counts and sizes of the in-process caches."""
+    from utils.cache import ASSET_CACHE
+
+    stats = {"asset_cache": ASSET_CACHE.stats()}
+    theme = sys.modules.get("utils.theme")
+    if theme is not None:
+        stats["theme_css"] = theme._compile.cache_info()._asdict()
+    columnar = sys.modules.get("utils.columnar")
+    if columnar is not None:
+        stats["columnar_datasets"] = len(columnar._datasets)
+    profiles = sys.modules.get("utils.dataset_profile")
+    if profiles is not None:
+        stats["dataset_profiles"] = len(profiles._profiles)
+    try:
+        stats["streamlit"] = _streamlit_cache_bytes()
+    except Exception as exc:
+        log_error("memory.cache_stats", exc)
+    return stats
+
+
+# --- Report ---
+def report() -> dict:
+    with _lock:
+        sessions = [dict(e) for e in _sessions.values()]
+        pages = {tab: dict(s) for tab, s in _pages.items()}
+        figures = dict(_figures)
+    traced = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else None
+    return {
+        "rss_bytes": rss_bytes(),
+        "traced_bytes": traced[0] if traced else None,
+        "traced_peak_bytes": traced[1] if traced else None,
+        "live_figures": live_figures(),
+        "figures_opened": figures["opened"],
+        "figures_closed": figures["closed"],
+        "sessions": len(sessions),
+        "session_bytes_total": sum(s["bytes"] for s in sessions),
+        "session_bytes_max": max((s["bytes"] for s in sessions), default=0),
+        "pages": pages,
+        "caches": cache_stats(),
+    }
+
+
+def _mb(value) -> str:
+    return "n/a" if value is None else f"{value / 1_048_576:.1f} MB"
+
+
+def log_report() -> dict:
+    data = report()
+    assets = data["caches"]["asset_cache"]
+    log_info(
+        "memory",
+        f"RSS {_mb(data['rss_bytes'])}, traced {_mb(data['traced_bytes'])}, "
+        f"live figures {data['live_figures']}, sessions {data['sessions']} "
+        f"({_mb(data['session_bytes_total'])}, max {_mb(data['session_bytes_max'])}), "
+        f"asset cache {assets['entries']} entries / {_mb(assets['bytes'])}",
+    )
+    if data["live_figures"]:
+        log_info("memory", f"{data['live_figures']} matplotlib figure(s) were never closed")
+    return data
+
+
+def _loop(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            log_report()
+        except Exception as exc:
+            log_error("memory._loop", exc)
+
+
+def start_reporter(interval: float = REPORT_INTERVAL_S) -> None:
+    """Log :func:`report` every ``interval`` seconds in a daemon thread (once per process)."""
+    global _reporter
+    start_tracing()
+    with _lock:
+        if _reporter is not None or interval <= 0:
+            return
+        _reporter = threading.Thread(target=_loop, args=(interval,), name="memory-reporter", daemon=True)
+        _reporter.start()
@@ -1,6 +1,10 @@
 import pickle
+import threading
 from utils.logger import log_error
 
+_models = {}
+_models_lock = threading.Lock()
+
 def load_model(model_path):
     try:
         with open(model_path, "rb") as file:
@@ -10,6 +14,13 @@ def load_model(model_path):
         log_error("Failed to load model", e)
         raise
 
+def get_model(model_path):
+    """Load a model once per process; concurrent callers wait for the first load."""
+    with _models_lock:
+        if model_path not in _models:
+            _models[model_path] = load_model(model_path)
+        return _models[model_path]
+
 def predict_cover_type(model, input_data):
     try:
         predicted_class = model.predict(input_data)[0]
@@ -1,9 +1,9 @@
 from fpdf import FPDF
 import tempfile
-import matplotlib.pyplot as plt
 from datetime import datetime
 import os
 from utils.logger import log_error
+from utils.memory import managed_figure
 
 def generate_single_patch_pdf(user_inputs, predicted_class, predicted_name, probabilities, cover_type_map, charts=None):
     charts = charts or []
@@ -55,15 +55,17 @@ def generate_single_patch_pdf(user_inputs, predicted_class, predicted_name, prob
     probs = list(probabilities) if probabilities is not None else []
     if len(probs) > 0:
         labels = [cover_type_map.get(i + 1, str(i + 1)) for i in range(len(probs))]
-        fig, ax = plt.subplots(figsize=(5, 3))
-        ax.barh(labels, probs)
-        ax.set_xlabel("Probability")
-        ax.set_title("Prediction Probabilities")
-        plt.tight_layout()
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmpfile:
-            plt.savefig(tmpfile.name, format="PNG", bbox_inches="tight")
-            plt.close(fig)
+        with managed_figure(figsize=(5, 3)) as (fig, ax):
+            ax.barh(labels, probs)
+            ax.set_xlabel("Probability")
+            ax.set_title("Prediction Probabilities")
+            fig.tight_layout()
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmpfile:
+                fig.savefig(tmpfile.name, format="PNG", bbox_inches="tight")
+        try:
             pdf.image(tmpfile.name, x=30, w=150)
+        finally:
+            os.remove(tmpfile.name)
         pdf.ln(10)
 
     if charts:
@@ -0,0 +1,144 @@
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from utils.logger import log_error
+
+# --- Rolling window of recent durations per stage; totals are kept for Prometheus counters ---
+WINDOW = int(os.environ.get("FOREST_PERF_WINDOW", 1024))
+QUANTILES = (0.5, 0.95, 0.99)
+METRICS_FILE = Path(os.environ.get("FOREST_METRICS_FILE", "logs/metrics.prom"))
+EXPORT_INTERVAL_S = float(os.environ.get("FOREST_METRICS_INTERVAL_S", 15))
+
+
+class _Stage:
+    __slots__ = ("samples", "count", "total", "errors")
+
+    def __init__(self):
+        self.samples = deque(maxlen=WINDOW)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+
+_stages: dict = {}
+_lock = threading.Lock()
+_exporter = None
+
+
+def record(stage: str, seconds: float, error: bool = False) -> None:
+    with _lock:
+        s = _stages.get(stage)
+        if s is None:
+            s = _stages[stage] = _Stage()
+        s.samples.append(seconds)
+        s.count += 1
+        s.total += seconds
+        s.errors += int(error)
+
+
+@contextmanager
+def span(stage: str):
+    """Time a block as ``stage``; exceptions are counted and re-raised."""
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        record(stage, time.perf_counter() - start, error=failed)
+
+
+def timed(stage: str):
+    """Decorator form of :func:`span`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot() -> list:
+    """Per-stage count, mean and rolling p50/p95/p99/max in seconds, slowest p95 first."""
+    with _lock:
+        items = [(name, list(s.samples), s.count, s.total, s.errors) for name, s in _stages.items()]
+    rows = []
+    for name, samples, count, total, errors in items:
+        arr = np.asarray(samples)
+        p50, p95, p99 = np.quantile(arr, QUANTILES) if len(arr) else (0.0, 0.0, 0.0)
+        rows.append({
+            "stage": name,
+            "count": count,
+            "errors": errors,
+            "mean": total / count if count else 0.0,
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "max": float(arr.max()) if len(arr) else 0.0,
+        })
+    return sorted(rows, key=lambda r: r["p95"], reverse=True)
+
+
+def reset() -> None:
+    with _lock:
+        _stages.clear()
+
+
+def prometheus_text() -> str:
+    """Stages as a Prometheus summary (quantiles over the rolling window, lifetime sum/count)."""
+    lines = [
+        "# HELP forest_stage_seconds Duration of instrumented app stages.",
+        "# TYPE forest_stage_seconds summary",
+    ]
+    errors = [
+        "# HELP forest_stage_errors_total Instrumented stages that raised.",
+        "# TYPE forest_stage_errors_total counter",
+    ]
+    with _lock:
+        items = [(name, list(s.samples), s.count, s.total, s.errors) for name, s in sorted(_stages.items())]
+    for name, samples, count, total, err in items:
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        if samples:
+            for q, v in zip(QUANTILES, np.quantile(samples, QUANTILES)):
+                lines.append(f'forest_stage_seconds{{stage="{label}",quantile="{q}"}} {v:.6f}')
+        lines.append(f'forest_stage_seconds_sum{{stage="{label}"}} {total:.6f}')
+        lines.append(f'forest_stage_seconds_count{{stage="{label}"}} {count}')
+        errors.append(f'forest_stage_errors_total{{stage="{label}"}} {err}')
+    return "\n".join(lines + errors) + "\n"
+
+
+def write_prometheus(path: Path = METRICS_FILE) -> None:
+    """Atomically write the textfile-collector file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(prometheus_text(), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _export_loop(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            write_prometheus()
+        except Exception as exc:
+            log_error("perf._export_loop", exc)
+
+
+def start_exporter(interval: float = EXPORT_INTERVAL_S) -> None:
+    """Rewrite METRICS_FILE every ``interval`` seconds in a daemon thread (once per process)."""
+    global _exporter
+    with _lock:
+        if _exporter is not None or interval <= 0:
+            return
+        _exporter = threading.Thread(target=_export_loop, args=(interval,), name="perf-exporter", daemon=True)
+        _exporter.start()
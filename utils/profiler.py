@@ -0,0 +1,198 @@
+import functools
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import streamlit as st
+
+from utils.logger import log_error, log_info
+
+# --- Opt-in sampling profiler: one collapsed-stack file per full or fragment rerun ---
+# Enable with FOREST_PROFILE=1 or ?profile=1; render with flamegraph.pl or speedscope.
+PROFILE_ENV = os.environ.get("FOREST_PROFILE") == "1"
+PROFILE_DIR = Path(os.environ.get("FOREST_PROFILE_DIR", "logs/profiles"))
+SAMPLE_INTERVAL_S = float(os.environ.get("FOREST_PROFILE_INTERVAL_MS", 5)) / 1000
+PROFILE_KEEP = int(os.environ.get("FOREST_PROFILE_KEEP", 200))
+# --- Stacks start just below Streamlit's ScriptRunner, so fragment reruns (which skip main.py) are kept ---
+RUNNER_FILE = "script_runner.py"
+
+_STATE_KEY = "_profiler_widget_state"
+_SIMPLE_TYPES = (str, int, float, bool, type(None))
+_active: dict = {}
+_lock = threading.Lock()
+
+
+def enabled(query_params=None) -> bool:
+    return PROFILE_ENV or (query_params is not None and query_params.get("profile") == "1")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    label = f"{Path(code.co_filename).stem}.{code.co_qualname}"
+    return label.replace(";", ":").replace(" ", "_")
+
+
+def _stack(frame) -> str | None:
+    """Root-first ``a;b;c`` stack of the script code, trimmed to start below the ScriptRunner."""
+    labels = []
+    root = None
+    while frame is not None:
+        if root is None and Path(frame.f_code.co_filename).name == RUNNER_FILE:
+            root = len(labels)
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    if not root:
+        return None
+    return ";".join(reversed(labels[:root]))
+
+
+class RerunSampler:
+    """Samples one thread's Python stack every ``interval`` seconds until stopped."""
+
+    def __init__(self, target: threading.Thread, interval: float = SAMPLE_INTERVAL_S):
+        self.target = target
+        self.thread_id = target.ident
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rerun-profiler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or not self.target.is_alive():
+                # --- The script thread ended without finish_rerun; its ident may be reused, so stop ---
+                self._stop.set()
+                with _lock:
+                    if _active.get(self.thread_id) is self:
+                        del _active[self.thread_id]
+                return
+            stack = _stack(frame)
+            if stack:
+                self.samples[stack] += 1
+
+    def start(self) -> "RerunSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return self.samples
+
+
+def _widget_state(session_state) -> dict:
+    return {
+        str(k): repr(v)[:80]
+        for k, v in session_state.items()
+        if isinstance(v, _SIMPLE_TYPES) and not str(k).startswith("_")
+    }
+
+
+def _rerun_action(session_state) -> str:
+    """Session-state keys changed since the end of the last profiled rerun, i.e. what the user touched."""
+    previous = session_state.get(_STATE_KEY)
+    if previous is None:
+        return "start"
+    current = _widget_state(session_state)
+    changed = sorted(k for k, v in current.items() if previous.get(k) != v)
+    if not changed:
+        return "rerun"
+    return "+".join(changed[:3]) + (f"+{len(changed) - 3}more" if len(changed) > 3 else "")
+
+
+def start_rerun(session_state) -> str:
+    """Begin sampling the calling (script) thread and return the rerun's action label.
+
+    Pair with :func:`finish_rerun` in a ``finally`` block: ``st.rerun``/``st.stop``
+    raise BaseExceptions that skip the rest of the script.
+    """
+    action = _rerun_action(session_state)
+    thread = threading.current_thread()
+    with _lock:
+        stale = _active.pop(thread.ident, None)
+        _active[thread.ident] = RerunSampler(thread).start()
+    if stale is not None:
+        stale.stop()
+    return action
+
+
+def profiled_fragment(func=None, **fragment_kwargs):
+    """``st.fragment`` whose own reruns are profiled too, labelled ``<page>.<fragment>``.
+
+    During a full rerun main.py's sampler already covers the fragment body.
+    """
+    if func is None:
+        return lambda f: profiled_fragment(f, **fragment_kwargs)
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        with _lock:
+            nested = threading.get_ident() in _active
+        if nested or not enabled(st.query_params):
+            return func(*args, **kwargs)
+        action = start_rerun(st.session_state)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            finish_rerun(st.session_state, f"{st.session_state.get('active_tab', 'About')}.{func.__name__}", action)
+
+    return st.fragment(run, **fragment_kwargs)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.+-]+", "-", text).strip("-")[:60] or "none"
+
+
+def _prune() -> None:
+    files = sorted(PROFILE_DIR.glob("*.collapsed"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in files[PROFILE_KEEP:]:
+        old.unlink(missing_ok=True)
+
+
+def finish_rerun(session_state, tab: str, action: str) -> Path | None:
+    """Stop sampling and write ``<time>_<tab>_<action>.collapsed`` under PROFILE_DIR.
+
+    Interrupted reruns are written too, so the work done before ``st.rerun`` shows up.
+    """
+    session_state[_STATE_KEY] = _widget_state(session_state)
+    with _lock:
+        sampler = _active.pop(threading.get_ident(), None)
+    if sampler is None:
+        return None
+    samples = sampler.stop()
+    if not samples:
+        return None
+    try:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
+        path = PROFILE_DIR / f"{stamp}_{_slug(tab)}_{_slug(action)}.collapsed"
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, count in samples.most_common():
+                fh.write(f"{stack} {count}\n")
+        _prune()
+        log_info(
+            "profiler",
+            f"Rerun [{tab} / {action}] took {sampler.elapsed * 1000:.0f} ms, "
+            f"{sum(samples.values())} samples -> {path}",
+        )
+        return path
+    except OSError as exc:
+        log_error("profiler.finish_rerun", exc)
+        return None
+
+
+def recent_profiles(limit: int = 20) -> list:
+    """Newest profile files first."""
+    if not PROFILE_DIR.exists():
+        return []
+    return sorted(PROFILE_DIR.glob("*.collapsed"), key=lambda p: p.stat().st_mtime, reverse=True)[:limit]
@@ -1,4 +1,29 @@
 import random
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# --- Batch CSV columns, in the training data's order ---
+NUMERIC_RANGES = {
+    "Elevation": (1500, 4500),
+    "Aspect": (0, 360),
+    "Slope": (0, 75),
+    "Horizontal_Distance_To_Hydrology": (0, 2000),
+    "Vertical_Distance_To_Hydrology": (-200, 800),
+    "Horizontal_Distance_To_Roadways": (0, 8000),
+    "Hillshade_9am": (0, 255),
+    "Hillshade_Noon": (0, 255),
+    "Hillshade_3pm": (0, 255),
+    "Horizontal_Distance_To_Fire_Points": (0, 8000),
+}
+NUMERIC_COLUMNS = list(NUMERIC_RANGES)
+WILDERNESS_COLUMNS = [f"Wilderness_Area{i}" for i in range(1, 5)]
+SOIL_COLUMNS = [f"Soil_Type{i}" for i in range(1, 41)]
+FEATURE_COLUMNS = NUMERIC_COLUMNS + WILDERNESS_COLUMNS + SOIL_COLUMNS
+ID_COLUMN = "S_No"
+CHUNK_ROWS = 250_000
+
 
 def randomize_inputs():
     return {
@@ -16,26 +41,97 @@ def randomize_inputs():
         "soil_type": f"Soil_Type{random.randint(1, 40)}"
     }
 
-def randomize_batch_row(s_no: int, columns: list):
-    inp = randomize_inputs()
-    
-    row = [
-        s_no,
-        inp["elevation"],
-        inp["aspect"],
-        inp["slope"],
-        inp["horz_dist_hydro"],
-        inp["vert_dist_hydro"],
-        inp["horz_dist_road"],
-        inp["hillshade_9am"],
-        inp["hillshade_noon"],
-        inp["hillshade_3pm"],
-        inp["horz_dist_fire"]
-    ]
-    
-    wilderness = [1 if f"Wilderness_Area{i}" == inp["wilderness_area"] else 0 for i in range(1, 5)]
-    row.extend(wilderness)
-    soil = [1 if f"Soil_Type{i}" == inp["soil_type"] else 0 for i in range(1, 41)]
-    row.extend(soil)
-    
-    return row
\ No newline at end of file
+
+# --- Vectorised batch rows ---
+def _onehot_probabilities(profile: dict, columns: list) -> np.ndarray:
+    counts = dict(zip(profile["flags"], profile["flag_counts"]))
+    p = np.array([counts.get(c, 0) for c in columns], dtype=np.float64)
+    return p / p.sum() if p.sum() else np.full(len(columns), 1 / len(columns))
+
+
+def random_features(n: int, rng: np.random.Generator, profile: dict | None = None) -> np.ndarray:
+    """``n`` valid rows as an int16 matrix in FEATURE_COLUMNS order.
+
+    Without ``profile`` every numeric feature is uniform over the single-patch
+    form's slider range and the one-hot groups are uniform. With a training
+    profile (utils.dataset_profile.load_profile) numerics are drawn from its
+    histograms and the one-hot groups follow its observed frequencies; features
+    are sampled independently, so per-class correlations are not reproduced.
+    """
+    X = np.zeros((n, len(FEATURE_COLUMNS)), dtype=np.int16)
+    rows = np.arange(n)
+    if profile is None:
+        low, high = np.array(list(NUMERIC_RANGES.values())).T
+        X[:, :len(NUMERIC_COLUMNS)] = rng.integers(low, high + 1, (n, len(NUMERIC_COLUMNS)))
+        wilderness = rng.integers(0, len(WILDERNESS_COLUMNS), n)
+        soil = rng.integers(0, len(SOIL_COLUMNS), n)
+    else:
+        for j, name in enumerate(NUMERIC_COLUMNS):
+            hist = profile["histograms"][name]
+            counts, edges = np.asarray(hist["counts"], dtype=np.float64), np.asarray(hist["edges"])
+            bins = rng.choice(len(counts), n, p=counts / counts.sum())
+            values = edges[bins] + rng.random(n) * (edges[bins + 1] - edges[bins])
+            X[:, j] = np.clip(np.rint(values), *NUMERIC_RANGES[name])
+        wilderness = rng.choice(len(WILDERNESS_COLUMNS), n, p=_onehot_probabilities(profile, WILDERNESS_COLUMNS))
+        soil = rng.choice(len(SOIL_COLUMNS), n, p=_onehot_probabilities(profile, SOIL_COLUMNS))
+    X[rows, len(NUMERIC_COLUMNS) + wilderness] = 1
+    X[rows, len(NUMERIC_COLUMNS) + len(WILDERNESS_COLUMNS) + soil] = 1
+    return X
+
+
+def random_batch(n: int, seed=None, profile: dict | None = None, start: int = 1, with_id: bool = True) -> pd.DataFrame:
+    """``n`` random rows shaped like a batch upload, numbered from ``start`` in S_No."""
+    X = random_features(n, np.random.default_rng(seed), profile)
+    df = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+    if with_id:
+        df.insert(0, ID_COLUMN, np.arange(start, start + n, dtype=np.int64))
+    return df
+
+
+def iter_random_batches(n: int, chunk_rows: int = CHUNK_ROWS, seed=None, profile: dict | None = None, with_id: bool = True):
+    """``n`` rows as consecutive DataFrames of at most ``chunk_rows``, with S_No continuing across chunks."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, chunk_rows):
+        size = min(chunk_rows, n - start)
+        df = pd.DataFrame(random_features(size, rng, profile), columns=FEATURE_COLUMNS)
+        if with_id:
+            df.insert(0, ID_COLUMN, np.arange(start + 1, start + size + 1, dtype=np.int64))
+        yield df
+
+
+def write_random_batch(path, n: int, chunk_rows: int = CHUNK_ROWS, seed=None, profile: dict | None = None, with_id: bool = True) -> Path:
+    """Stream ``n`` random rows to a .csv or .parquet file chunk by chunk; memory stays at one chunk."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    chunks = iter_random_batches(n, chunk_rows, seed, profile, with_id)
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Writing Parquet needs pyarrow (pip install pyarrow); use a .csv path instead.") from exc
+        writer = None
+        try:
+            for df in chunks:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                writer = writer or pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pcsv
+        except ImportError:
+            pa = None
+        with open(path, "wb") as fh:
+            for i, df in enumerate(chunks):
+                if i == 0:
+                    fh.write((",".join(df.columns) + "\n").encode("utf-8"))
+                # --- pyarrow's CSV writer is ~4x faster than DataFrame.to_csv on these integer frames ---
+                if pa is not None:
+                    pcsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), fh, pcsv.WriteOptions(include_header=False))
+                else:
+                    fh.write(df.to_csv(index=False, header=False, lineterminator="\n").encode("utf-8"))
+    return path
@@ -0,0 +1,48 @@
+import importlib
+import sys
+import time
+
+from utils.logger import log_info
+
+# --- Budget for the first full script run of a fresh server process ---
+COLD_START_BUDGET_S = 3.0
+
+_import_costs: dict = {}
+_cold_start_reported = False
+
+
+def timed_import(module_name: str):
+    """Import a module, recording its wall time and how many modules it pulled in."""
+    if module_name in sys.modules:
+        # --- import_module waits if another session's thread is still initialising it ---
+        return importlib.import_module(module_name)
+
+    before = len(sys.modules)
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed = time.perf_counter() - start
+
+    _import_costs[module_name] = {
+        "module": module_name,
+        "seconds": elapsed,
+        "new_modules": len(sys.modules) - before,
+    }
+    log_info("startup", f"Imported {module_name} in {elapsed * 1000:.0f} ms ({len(sys.modules) - before} new modules)")
+    return module
+
+
+def import_report() -> list:
+    """Per-module import costs, most expensive first."""
+    return sorted(_import_costs.values(), key=lambda r: r["seconds"], reverse=True)
+
+
+def report_cold_start(elapsed: float) -> None:
+    """Log the first script run's duration and import breakdown, once per process."""
+    global _cold_start_reported
+    if _cold_start_reported:
+        return
+    _cold_start_reported = True
+
+    status = "within" if elapsed <= COLD_START_BUDGET_S else "OVER"
+    lines = [f"{r['module']}: {r['seconds'] * 1000:.0f} ms, {r['new_modules']} modules" for r in import_report()]
+    log_info("startup", f"Cold start took {elapsed:.2f}s ({status} {COLD_START_BUDGET_S:.1f}s budget); imports: " + "; ".join(lines))
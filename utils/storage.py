@@ -0,0 +1,326 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import stat
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from utils.columnar import _atomic_write
+from utils.logger import log_error, log_info
+
+# --- Saved_Predictions/<kind>/<YYYYMMDD_HHMMSS_ffffff>/ run folders, plus a shared blob store ---
+SAVE_ROOT = Path("Saved_Predictions")
+BLOB_DIR = SAVE_ROOT / ".blobs"
+RUN_KINDS = ("single", "batch")
+RUN_STAMP = "%Y%m%d_%H%M%S"
+
+# --- Retention and compression are opt-in: pruned runs lose their files and History rows ---
+RETENTION_DAYS = float(os.environ.get("FOREST_RETENTION_DAYS", 0))
+RETENTION_MAX_RUNS = int(os.environ.get("FOREST_RETENTION_MAX_RUNS", 0))
+RETENTION_MAX_MB = float(os.environ.get("FOREST_RETENTION_MAX_MB", 0))
+COMPRESS_AFTER_DAYS = float(os.environ.get("FOREST_COMPRESS_AFTER_DAYS", 0))
+SWEEP_INTERVAL_S = float(os.environ.get("FOREST_SWEEP_INTERVAL_S", 3600))
+
+# --- Text artifacts compress well; PNG and PDF are already compressed ---
+COMPRESSIBLE_SUFFIXES = (".csv", ".json")
+# --- Runs younger than this may still be being written; the sweeper leaves them alone ---
+SETTLE_SECONDS = 60
+
+# --- Batch runs keep a small summary next to the full CSV for History previews ---
+SUMMARY_FILE = "summary.json"
+SUMMARY_ROWS = 10
+PREDICTION_COLUMN = "Predicted_Cover_Type_Number"
+
+_lock = threading.Lock()
+_stop = threading.Event()
+_thread = None
+_last_sweep: dict = {}
+
+
+def new_run_dir(kind: str) -> Path:
+    """Create a fresh run folder; the microsecond stamp keeps two saves in the same second apart."""
+    base = SAVE_ROOT / kind
+    base.mkdir(parents=True, exist_ok=True)
+    while True:
+        run = base / datetime.now().strftime(f"{RUN_STAMP}_%f")
+        try:
+            run.mkdir()
+            return run
+        except FileExistsError:
+            continue
+
+
+def artifact_path(path) -> Path | None:
+    """The stored file for ``path``: itself, or its gzipped cold copy, or None if pruned."""
+    path = Path(path)
+    if path.exists():
+        return path
+    gz = path.with_name(path.name + ".gz")
+    return gz if gz.exists() else None
+
+
+def open_artifact(path):
+    """Open a stored artifact for binary reading, transparently gunzipping cold copies."""
+    found = artifact_path(path)
+    if found is None:
+        raise FileNotFoundError(path)
+    return gzip.open(found, "rb") if found.suffix == ".gz" else open(found, "rb")
+
+
+def write_batch_summary(data, run_dir) -> None:
+    """Head/tail rows and class counts of a scored batch, so History never has to reparse the CSV."""
+    counts = data[PREDICTION_COLUMN].value_counts().sort_index() if PREDICTION_COLUMN in data else {}
+    summary = {
+        "rows": int(len(data)),
+        "columns": [str(c) for c in data.columns],
+        "head": json.loads(data.head(SUMMARY_ROWS).to_json(orient="values")),
+        "tail": json.loads(data.tail(SUMMARY_ROWS).to_json(orient="values")),
+        "class_counts": {str(k): int(v) for k, v in dict(counts).items()},
+    }
+    _atomic_write(Path(run_dir) / SUMMARY_FILE, lambda fh: fh.write(json.dumps(summary).encode("utf-8")))
+
+
+def load_batch_summary(run_dir) -> dict | None:
+    """The stored batch summary; runs saved before summaries existed get a projected CSV read instead."""
+    run_dir = Path(run_dir)
+    try:
+        with open_artifact(run_dir / SUMMARY_FILE) as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        pass
+    csv_path = artifact_path(run_dir / "predictions.csv")
+    if csv_path is None:
+        return None
+
+    import pandas as pd
+
+    head = pd.read_csv(csv_path, nrows=SUMMARY_ROWS)
+    counts = {}
+    if PREDICTION_COLUMN in head.columns:
+        col = pd.read_csv(csv_path, usecols=[PREDICTION_COLUMN])[PREDICTION_COLUMN]
+        counts = {str(k): int(v) for k, v in col.value_counts().sort_index().items()}
+    return {
+        "rows": int(sum(counts.values())) if counts else None,
+        "columns": [str(c) for c in head.columns],
+        "head": json.loads(head.to_json(orient="values")),
+        "tail": None,
+        "class_counts": counts,
+    }
+
+
+def concat_csv_artifacts(paths, out) -> None:
+    """Stream CSVs with identical headers into ``out`` (binary), keeping the first header only."""
+    header = None
+    for path in paths:
+        with open_artifact(path) as fh:
+            first = fh.readline()
+            if header is None:
+                header = first
+                out.write(first)
+            elif first != header:
+                raise ValueError(f"{path} has different columns")
+            shutil.copyfileobj(fh, out, 1 << 20)
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_only(path: Path) -> None:
+    mode = path.stat().st_mode
+    os.chmod(path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+def _dedupe(path: Path) -> bool:
+    """Replace ``path`` with a hardlink to the blob holding the same bytes. True if space was saved.
+
+    Blobs are made read-only: every link shares one inode, so an in-place write
+    through any run's path would change them all. Writers replace files instead
+    (utils.columnar._atomic_write), which only swaps that run's link.
+    """
+    st_ = path.stat()
+    if st_.st_nlink > 1:
+        return False
+    blob = BLOB_DIR / (_file_hash(path) + path.suffix)
+    try:
+        if not blob.exists():
+            BLOB_DIR.mkdir(parents=True, exist_ok=True)
+            os.link(path, blob)
+            _read_only(blob)
+            return False
+        _read_only(blob)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.link")
+        os.link(blob, tmp)
+        os.replace(tmp, path)
+        return True
+    except OSError as exc:
+        # --- Filesystems without hardlinks simply keep their own copy ---
+        log_error("storage._dedupe", exc)
+        return False
+
+
+def _compress(path: Path) -> Path:
+    """Gzip a cold text artifact in place. mtime=0 keeps identical inputs byte-identical for dedup."""
+    target = path.with_name(path.name + ".gz")
+
+    def write(raw) -> None:
+        with open(path, "rb") as src, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as dst:
+            shutil.copyfileobj(src, dst)
+
+    _atomic_write(target, write)
+    path.unlink()
+    return target
+
+
+def ingest(run_dir) -> None:
+    """Deduplicate a freshly written run folder against the blob store."""
+    try:
+        for path in Path(run_dir).iterdir():
+            if path.is_file():
+                _dedupe(path)
+    except Exception as exc:
+        log_error("storage.ingest", exc)
+
+
+def _runs() -> list:
+    """All run folders, oldest first (folder names are timestamps)."""
+    runs = []
+    for kind in RUN_KINDS:
+        base = SAVE_ROOT / kind
+        if base.exists():
+            runs.extend(p for p in base.iterdir() if p.is_dir())
+    return sorted(runs, key=lambda p: (p.name, p.parent.name))
+
+
+def _run_created(run: Path) -> float:
+    """Creation time from the folder's timestamp name; adding files changes the dir mtime, not this."""
+    try:
+        return datetime.strptime(run.name[:15], RUN_STAMP).timestamp()
+    except ValueError:
+        return run.stat().st_mtime
+
+
+def _exclusive_bytes(run: Path) -> int:
+    """Bytes freed by deleting ``run``: files not shared with other runs (the blob link is ignored)."""
+    total = 0
+    for path in run.rglob("*"):
+        if path.is_file():
+            st_ = path.stat()
+            if st_.st_nlink <= 2:
+                total += st_.st_size
+    return total
+
+
+def disk_usage() -> int:
+    """Bytes used under SAVE_ROOT, counting hardlinked files once."""
+    seen, total = set(), 0
+    for path in SAVE_ROOT.rglob("*"):
+        if path.is_file():
+            st_ = path.stat()
+            if (st_.st_dev, st_.st_ino) not in seen:
+                seen.add((st_.st_dev, st_.st_ino))
+                total += st_.st_size
+    return total
+
+
+def _force_remove(func, path, _exc_info) -> None:
+    """rmtree error hook: deduped files are read-only, which Windows refuses to delete."""
+    try:
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+    except OSError:
+        pass
+
+
+def sweep(now: float | None = None) -> dict:
+    """One retention pass: prune old/excess runs, gzip cold text files, dedupe and drop orphan blobs."""
+    now = time.time() if now is None else now
+    stats = {"removed_runs": 0, "forgotten_records": 0, "compressed": 0, "deduped": 0, "orphan_blobs": 0}
+    runs = _runs()
+
+    def remove(run: Path) -> None:
+        # --- History rows first: batch aggregates may still need the run's summary ---
+        from utils.history_store import get_history_store
+
+        stats["forgotten_records"] += get_history_store().forget_runs([run])
+        shutil.rmtree(run, onerror=_force_remove)
+        stats["removed_runs"] += 1
+
+    if RETENTION_DAYS > 0:
+        cutoff = now - RETENTION_DAYS * 86400
+        for run in [r for r in runs if _run_created(r) < cutoff]:
+            remove(run)
+            runs.remove(run)
+    if RETENTION_MAX_RUNS > 0:
+        while len(runs) > RETENTION_MAX_RUNS:
+            remove(runs.pop(0))
+
+    cold = now - COMPRESS_AFTER_DAYS * 86400 if COMPRESS_AFTER_DAYS > 0 else None
+    for run in runs:
+        if _run_created(run) > now - SETTLE_SECONDS:
+            continue
+        for path in list(run.iterdir()):
+            if not path.is_file():
+                continue
+            if cold is not None and path.suffix in COMPRESSIBLE_SUFFIXES and path.stat().st_mtime < cold:
+                path = _compress(path)
+                stats["compressed"] += 1
+            if _dedupe(path):
+                stats["deduped"] += 1
+
+    if RETENTION_MAX_MB > 0:
+        budget = RETENTION_MAX_MB * 1024 * 1024
+        usage = disk_usage()
+        while usage > budget and runs:
+            run = runs.pop(0)
+            usage -= _exclusive_bytes(run)
+            remove(run)
+
+    # --- Blobs whose only remaining link is the blob store itself ---
+    if BLOB_DIR.exists():
+        for blob in BLOB_DIR.iterdir():
+            if blob.is_file() and blob.stat().st_nlink == 1:
+                blob.unlink()
+                stats["orphan_blobs"] += 1
+
+    stats.update(finished=now, bytes=disk_usage(), runs=len(runs))
+    _last_sweep.clear()
+    _last_sweep.update(stats)
+    log_info("storage.sweep", f"Swept {SAVE_ROOT}: {stats}")
+    return stats
+
+
+def _loop(interval: float) -> None:
+    while not _stop.is_set():
+        try:
+            sweep()
+        except Exception as exc:
+            log_error("storage._loop", exc)
+        _stop.wait(interval)
+
+
+def start_sweeper(interval: float = SWEEP_INTERVAL_S) -> None:
+    """Start the background sweeper once per process; later calls are no-ops."""
+    global _thread
+    with _lock:
+        if _thread is not None or interval <= 0:
+            return
+        _thread = threading.Thread(target=_loop, args=(interval,), name="storage-sweeper", daemon=True)
+        _thread.start()
+
+
+def stop_sweeper() -> None:
+    _stop.set()
+
+
+def sweeper_status() -> dict:
+    """Result of the most recent sweep (empty until the first one finishes)."""
+    return dict(_last_sweep)
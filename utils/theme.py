@@ -1,17 +1,18 @@
 import streamlit as st
-import base64
+import functools
 import os
+import re
 from utils.colors import get_palette
+from utils.assets import publish_asset
+from utils.cache import encode_image_base64
 
 def get_base64_img(img_path: str) -> str:
     if not os.path.exists(img_path):
         return ""
-    with open(img_path, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode()
+    return encode_image_base64(img_path)
 
-def home_style():
-    st.markdown(
-        """
+# --- Static style blocks, bundled into every theme by compile_theme_css ---
+_BASE_CSS = """
         <style>
             body { background-color: #f9f9f9; }
             .main { padding: 20px; }
@@ -39,13 +40,9 @@ def home_style():
                 transition: 0.3s;
             }
         </style>
-        """,
-        unsafe_allow_html=True
-    )
-
-def apply_global_styles():
-    st.markdown(
         """
+
+_GLOBAL_CSS = """
         <style>
         html, body, .stApp {
             font-family: 'Segoe UI', Tahoma, sans-serif;
@@ -68,13 +65,9 @@ def apply_global_styles():
             opacity: 0.7;
         }
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
-def apply_batch_styles():
-    st.markdown(
         """
+
+_BATCH_CSS = """
         <style>
         .stFileUploader > div {
             border: 2px dashed #4CAF50;
@@ -100,9 +93,26 @@ def apply_batch_styles():
         .custom-sub { font-size: 15px; color: #555; }
         .highlight { font-weight: 600; color: #1b5e20; }
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
+
+_VOICE_CSS = """
+        <style>
+        div.stButton > button {
+            background-color: #0dcaf0;
+            color: #1e1e1e;
+            border-radius: 6px;
+            padding: 6px 14px;
+            font-size: 14px;
+            font-weight: 500;
+            border: none;
+            transition: background-color 0.3s ease;
+        }
+        div.stButton > button:hover {
+            background-color: #0bb2d4;
+            color: #ffffff;
+        }
+        </style>
+        """
 
 def section_divider(title: str, emoji="✨"):
     if "theme" not in st.session_state:
@@ -140,7 +150,7 @@ def themed_divider():
         unsafe_allow_html=True
     )
 
-def apply_theme(selected_theme: str): 
+def _theme_css(selected_theme: str, bg_url: str) -> str:
     palette = get_palette(selected_theme)
 
     css = ""
@@ -352,7 +362,6 @@ def apply_theme(selected_theme: str):
         """
 
     elif selected_theme.lower() == "tree":
-        img_base64 = get_base64_img("img/treebg-min.jpg")
         css = f"""
         <style>
             html, body, .stApp {{
@@ -398,7 +407,7 @@ def apply_theme(selected_theme: str):
                 content: "";
                 position: fixed; top: 0; left: 0;
                 width: 100%; height: 100%;
-                background: url("data:image/jpg;base64,{img_base64}") no-repeat center center fixed;
+                background: url("{bg_url}") no-repeat center center fixed;
                 background-size: cover;
                 opacity: 0.8;
             }}
@@ -522,7 +531,7 @@ def apply_theme(selected_theme: str):
             }}
                         
         </style>
-        """ if img_base64 else """
+        """ if bg_url else """
         <style>
             .stApp::before {
                 content: "";
@@ -533,5 +542,34 @@ def apply_theme(selected_theme: str):
         </style>
         """
 
-    if css:
-        st.markdown(css, unsafe_allow_html=True)
+    return css
+
+def _tree_background_url() -> str:
+    bg_url = publish_asset("img/treebg-min.jpg")
+    if bg_url is None:
+        img_base64 = get_base64_img("img/treebg-min.jpg")
+        bg_url = f"data:image/jpg;base64,{img_base64}" if img_base64 else ""
+    return bg_url
+
+def _minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", css).strip()
+
+@functools.lru_cache(maxsize=16)
+def _compile(selected_theme: str, bg_url: str) -> str:
+    blocks = (_BASE_CSS, _GLOBAL_CSS, _BATCH_CSS, _theme_css(selected_theme, bg_url), _VOICE_CSS)
+    rules = "".join(
+        _minify_css(b.replace("<style>", "").replace("</style>", "")) for b in blocks
+    )
+    return f"<style>{rules}</style>"
+
+def compile_theme_css(selected_theme: str) -> str:
+    """Full app stylesheet for a theme, built once and cached per theme/background."""
+    theme = selected_theme.lower()
+    bg_url = _tree_background_url() if theme == "tree" else ""
+    return _compile(theme, bg_url)
+
+def apply_theme(selected_theme: str):
+    """Inject the compiled stylesheet. Called once per rerun, from main.py."""
+    st.markdown(compile_theme_css(selected_theme), unsafe_allow_html=True)
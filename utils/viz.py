@@ -1,5 +1,8 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
+import io
+from pathlib import Path
+
+import matplotlib
+from matplotlib.patches import Rectangle
 import pandas as pd
 import numpy as np
 import streamlit as st
@@ -7,7 +10,9 @@ import plotly.express as px
 import plotly.graph_objects as go
 import plotly.io as pio
 
+from utils.columnar import _atomic_write
 from utils.logger import log_error, log_info
+from utils.memory import managed_figure
 from utils.colors import get_palette
 from utils.exceptions import VisualizationError
 
@@ -18,7 +23,9 @@ pio.kaleido.scope.default_height = 600
 # --- UTILITY ---
 def save_plotly(fig, save_path):
     try:
-        fig.write_image(save_path)
+        path = Path(save_path)
+        png = fig.to_image(format=path.suffix.lstrip(".") or "png")
+        _atomic_write(path, lambda fh: fh.write(png))
         log_info("viz", f"Plotly figure saved at {save_path}")
     except Exception as e:
         log_error("viz", e)
@@ -28,16 +35,38 @@ def save_plotly(fig, save_path):
 def save_matplotlib(fig, save_path):
     try:
         fig.tight_layout()
-        fig.savefig(save_path, bbox_inches="tight")
+        path = Path(save_path)
+        _atomic_write(path, lambda fh: fig.savefig(fh, format=path.suffix.lstrip(".") or "png", bbox_inches="tight"))
         log_info("viz", f"Matplotlib figure saved at {save_path}")
     except Exception as e:
         log_error("viz", e)
         raise VisualizationError(f"Could not save Matplotlib figure: {e}") from e
+
+
+def render_matplotlib(fig, save_path=None, preview=True) -> bytes:
+    """Render ``fig`` to PNG once, then write it to ``save_path`` (path or binary stream) and/or show it."""
+    try:
+        fig.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", bbox_inches="tight")
+        png = buf.getvalue()
+        if save_path is not None:
+            if hasattr(save_path, "write"):
+                save_path.write(png)
+            else:
+                _atomic_write(Path(save_path), lambda fh: fh.write(png))
+            log_info("viz", f"Matplotlib figure saved at {save_path}")
+    except Exception as e:
+        log_error("viz", e)
+        raise VisualizationError(f"Could not save Matplotlib figure: {e}") from e
+    if preview:
+        st.image(png)
+    return png
     
 # -------------------------------
 # --- Single Patch Prediction ---
 # -------------------------------
-def plot_probability_radar_chart(probabilities, cover_type_map, save_path=None, theme="dark"):
+def plot_probability_radar_chart(probabilities, cover_type_map, save_path=None, theme="dark", preview=True):
     try:
         labels = list(cover_type_map.values())
         values = list(probabilities) + [probabilities[0]]
@@ -46,82 +75,78 @@ def plot_probability_radar_chart(probabilities, cover_type_map, save_path=None,
 
         palette = get_palette(theme)
 
-        fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-        fig.patch.set_facecolor(palette["BACKGROUND"])
-        ax.set_facecolor("#121212")
+        with managed_figure(figsize=(6, 6), subplot_kw=dict(polar=True)) as (fig, ax):
+            fig.patch.set_facecolor(palette["BACKGROUND"])
+            ax.set_facecolor("#121212")
 
-        ax.plot(angles, values, color=palette["PRIMARY"], linewidth=2, marker="o")
-        ax.fill(angles, values, color=palette["PRIMARY"], alpha=0.3)
+            ax.plot(angles, values, color=palette["PRIMARY"], linewidth=2, marker="o")
+            ax.fill(angles, values, color=palette["PRIMARY"], alpha=0.3)
 
-        ax.set_theta_offset(np.pi / 2)
-        ax.set_theta_direction(-1)
-        ax.set_xticks(angles[:-1])
-        ax.set_xticklabels(labels, fontsize=10, fontweight="bold", color=palette["TEXT"])
+            ax.set_theta_offset(np.pi / 2)
+            ax.set_theta_direction(-1)
+            ax.set_xticks(angles[:-1])
+            ax.set_xticklabels(labels, fontsize=10, fontweight="bold", color=palette["TEXT"])
 
-        ax.set_yticks([0.2, 0.4, 0.6, 0.8, 1.0])
-        ax.set_yticklabels([f"{int(y*100)}%" for y in [0.2, 0.4, 0.6, 0.8, 1.0]], color=palette["TEXT"])
-        ax.grid(color="#555555", linestyle="--", linewidth=0.7)
+            ax.set_yticks([0.2, 0.4, 0.6, 0.8, 1.0])
+            ax.set_yticklabels([f"{int(y*100)}%" for y in [0.2, 0.4, 0.6, 0.8, 1.0]], color=palette["TEXT"])
+            ax.grid(color="#555555", linestyle="--", linewidth=0.7)
 
-        for label, angle in zip(ax.get_xticklabels(), angles):
-            label.set_horizontalalignment("center")
-            label.set_rotation(angle * 180 / np.pi - 90)
-            label.set_rotation_mode("anchor")
+            for label, angle in zip(ax.get_xticklabels(), angles):
+                label.set_horizontalalignment("center")
+                label.set_rotation(angle * 180 / np.pi - 90)
+                label.set_rotation_mode("anchor")
 
-        ax.set_title("Prediction Probabilities", fontsize=16, fontweight="bold", color=palette["TEXT"], pad=20)
-        ax.spines["polar"].set_visible(False)
-
-        if save_path:
-            save_matplotlib(fig, save_path)
+            ax.set_title("Prediction Probabilities", fontsize=16, fontweight="bold", color=palette["TEXT"], pad=20)
+            ax.spines["polar"].set_visible(False)
 
-        st.pyplot(fig)
-        log_info("viz", "Radar chart rendered")
-        return fig
+            # --- The figure is cleared when the block exits, so hand back the rendered PNG ---
+            png = render_matplotlib(fig, save_path, preview)
+            log_info("viz", "Radar chart rendered")
+            return png
 
     except Exception as e:
         log_error("viz", e)
         raise VisualizationError("Failed to render radar chart") from e
 
-def plot_patch_grid(probabilities, cover_type_map, grid_size=(30, 30), save_path=None, theme="dark"):
+def plot_patch_grid(probabilities, cover_type_map, grid_size=(30, 30), save_path=None, theme="dark", preview=True):
     try:
         palette = get_palette(theme)
 
-        fig, ax = plt.subplots(figsize=(7, 7))
-        fig.patch.set_facecolor(palette["BACKGROUND"])
-        ax.set_facecolor("#121212")
+        with managed_figure(figsize=(7, 7)) as (fig, ax):
+            fig.patch.set_facecolor(palette["BACKGROUND"])
+            ax.set_facecolor("#121212")
 
-        cmap = plt.cm.get_cmap("Set3", len(probabilities))
-        num_cells = grid_size[0] * grid_size[1]
-        class_counts = (probabilities * num_cells).astype(int)
+            cmap = matplotlib.colormaps["Set3"].resampled(len(probabilities))
+            num_cells = grid_size[0] * grid_size[1]
+            class_counts = (probabilities * num_cells).astype(int)
 
-        flat_data = []
-        for class_idx, count in enumerate(class_counts):
-            flat_data += [class_idx] * count
-        while len(flat_data) < num_cells:
-            flat_data.append(np.argmax(probabilities))
+            flat_data = []
+            for class_idx, count in enumerate(class_counts):
+                flat_data += [class_idx] * count
+            while len(flat_data) < num_cells:
+                flat_data.append(np.argmax(probabilities))
 
-        np.random.shuffle(flat_data)
-        data = np.array(flat_data).reshape(grid_size)
+            np.random.shuffle(flat_data)
+            data = np.array(flat_data).reshape(grid_size)
 
-        ax.imshow(data, cmap=cmap, aspect="equal")
-        ax.set_title("30x30 Forest Cover Patch", fontsize=16, fontweight="bold", color=palette["TEXT"], pad=15)
+            ax.imshow(data, cmap=cmap, aspect="equal")
+            ax.set_title("30x30 Forest Cover Patch", fontsize=16, fontweight="bold", color=palette["TEXT"], pad=15)
 
-        ax.set_xticks(np.arange(-0.5, grid_size[0], 1), minor=True)
-        ax.set_yticks(np.arange(-0.5, grid_size[1], 1), minor=True)
-        ax.grid(which="minor", color="#555555", linestyle="-", linewidth=0.5, alpha=0.5)
+            ax.set_xticks(np.arange(-0.5, grid_size[0], 1), minor=True)
+            ax.set_yticks(np.arange(-0.5, grid_size[1], 1), minor=True)
+            ax.grid(which="minor", color="#555555", linestyle="-", linewidth=0.5, alpha=0.5)
 
-        ax.tick_params(which="both", bottom=False, left=False, labelbottom=False, labelleft=False)
+            ax.tick_params(which="both", bottom=False, left=False, labelbottom=False, labelleft=False)
 
-        handles = [plt.Rectangle((0, 0), 1, 1, color=cmap(i)) for i in range(len(probabilities))]
-        labels = [f"{cover_type_map[i+1]} ({probabilities[i]*100:.1f}%)" for i in range(len(probabilities))]
-        ax.legend(handles, labels, loc="upper center", bbox_to_anchor=(0.5, -0.15),
-                  fontsize=9, ncol=2, frameon=True, facecolor="#121212", edgecolor="#888", labelcolor=palette["TEXT"])
+            handles = [Rectangle((0, 0), 1, 1, color=cmap(i)) for i in range(len(probabilities))]
+            labels = [f"{cover_type_map[i+1]} ({probabilities[i]*100:.1f}%)" for i in range(len(probabilities))]
+            ax.legend(handles, labels, loc="upper center", bbox_to_anchor=(0.5, -0.15),
+                      fontsize=9, ncol=2, frameon=True, facecolor="#121212", edgecolor="#888", labelcolor=palette["TEXT"])
 
-        if save_path:
-            save_matplotlib(fig, save_path)
-
-        st.pyplot(fig)
-        log_info("viz", "Patch grid rendered")
-        return fig
+            # --- The figure is cleared when the block exits, so hand back the rendered PNG ---
+            png = render_matplotlib(fig, save_path, preview)
+            log_info("viz", "Patch grid rendered")
+            return png
 
     except Exception as e:
         log_error("viz", e)
@@ -169,13 +194,12 @@ def plot_prediction_probabilities(probabilities, cover_type_map, save_path=None,
             st.plotly_chart(fig_plotly, use_container_width=True, key="prediction_probabilities")
 
         if save_path:
-            fig, ax = plt.subplots(figsize=(8, 5))
-            ax.bar(cover_types, probabilities, color="forestgreen", edgecolor="darkgreen")
-            ax.set_title("Prediction Probabilities")
-            ax.set_xlabel("Cover Type")
-            ax.set_ylabel("Probability")
-            save_matplotlib(fig, save_path)
-            plt.close(fig)
+            with managed_figure(figsize=(8, 5)) as (fig, ax):
+                ax.bar(cover_types, probabilities, color="forestgreen", edgecolor="darkgreen")
+                ax.set_title("Prediction Probabilities")
+                ax.set_xlabel("Cover Type")
+                ax.set_ylabel("Probability")
+                save_matplotlib(fig, save_path)
 
         return fig_plotly
     except Exception as e:
@@ -221,13 +245,12 @@ def plot_batch_bar_chart(predictions, cover_type_map, save_path=None, preview=Tr
         )
 
         if save_path:
-            fig, ax = plt.subplots(figsize=(8, 5))
-            ax.bar(df["Cover Type"], df["Count"], color="forestgreen", edgecolor="darkgreen")
-            ax.set_title("Cover Type Distribution")
-            ax.set_xlabel("Cover Type")
-            ax.set_ylabel("Count")
-            save_matplotlib(fig, save_path)
-            plt.close(fig)
+            with managed_figure(figsize=(8, 5)) as (fig, ax):
+                ax.bar(df["Cover Type"], df["Count"], color="forestgreen", edgecolor="darkgreen")
+                ax.set_title("Cover Type Distribution")
+                ax.set_xlabel("Cover Type")
+                ax.set_ylabel("Count")
+                save_matplotlib(fig, save_path)
 
         return fig_plotly
     except Exception as e:
@@ -268,48 +291,104 @@ def plot_batch_pie_chart(predictions, cover_type_map, save_path=None, preview=Tr
 
 
         if save_path:
-            fig, ax = plt.subplots(figsize=(6, 6))
-            ax.pie(df["Count"], labels=df["Cover Type"], autopct="%1.1f%%", startangle=90)
-            ax.set_title("Cover Type Percentage")
-            save_matplotlib(fig, save_path)
-            plt.close(fig)
+            with managed_figure(figsize=(6, 6)) as (fig, ax):
+                ax.pie(df["Count"], labels=df["Cover Type"], autopct="%1.1f%%", startangle=90)
+                ax.set_title("Cover Type Percentage")
+                save_matplotlib(fig, save_path)
 
         return fig_plotly
     except Exception as e:
         log_error("viz.plot_batch_pie_chart", e)
         return None
 
-def plot_feature_boxplots(data, predictions, cover_type_map, features=None, save_path=None, preview=True):
+def _box_summaries(values, groups, order, whis=1.5, max_outliers=200, seed=42):
+    """Per-class quartiles, Tukey whiskers and a stratified outlier sample, computed in one vectorized pass."""
+    values = pd.Series(np.asarray(values, dtype=float))
+    groups = pd.Series(np.asarray(groups))
+    valid = values.notna().to_numpy()
+    values, groups = values[valid].reset_index(drop=True), groups[valid].reset_index(drop=True)
+
+    quartiles = values.groupby(groups).quantile([0.25, 0.5, 0.75]).unstack()
+    quartiles.columns = ["q1", "median", "q3"]
+    iqr = quartiles["q3"] - quartiles["q1"]
+    lo_fence = (quartiles["q1"] - whis * iqr).reindex(groups).to_numpy()
+    hi_fence = (quartiles["q3"] + whis * iqr).reindex(groups).to_numpy()
+
+    inside = (values.to_numpy() >= lo_fence) & (values.to_numpy() <= hi_fence)
+    whiskers = values[inside].groupby(groups[inside]).agg(["min", "max"])
+    counts = groups.value_counts()
+
+    outliers = pd.DataFrame({"group": groups[~inside], "value": values[~inside]})
+    if max_outliers is not None and len(outliers):
+        rng = np.random.default_rng(seed)
+        outliers = outliers.iloc[rng.permutation(len(outliers))]
+        outliers = outliers[outliers.groupby("group").cumcount() < max_outliers]
+    fliers = outliers.groupby("group")["value"].apply(np.asarray)
+
+    stats = []
+    for key in order:
+        if key not in quartiles.index:
+            continue
+        q = quartiles.loc[key]
+        stats.append({
+            "key": key,
+            "q1": float(q["q1"]),
+            "med": float(q["median"]),
+            "q3": float(q["q3"]),
+            "whislo": float(whiskers["min"].get(key, q["q1"])),
+            "whishi": float(whiskers["max"].get(key, q["q3"])),
+            "fliers": fliers.get(key, np.empty(0)),
+            "count": int(counts.get(key, 0)),
+        })
+    return stats
+
+def plot_feature_boxplots(data, predictions, cover_type_map, features=None, save_path=None, preview=True, max_outliers=200):
     try:
-        df = data.copy()
-        df["Predicted Cover Type"] = [cover_type_map.get(i, "Unknown") for i in predictions]
+        predictions = np.asarray(predictions)
+        order = sorted(pd.unique(predictions))
+        colors = px.colors.qualitative.Plotly
 
         if features is None:
             features = ["Elevation"]
 
         figs = []
         for feature in features:
-            if feature not in df.columns:
+            if feature not in data.columns:
                 if preview:
                     st.warning(f"⚠️ Feature '{feature}' not found in dataset.")
                 continue
 
-            fig_plotly = px.box(
-                df,
-                x="Predicted Cover Type",
-                y=feature,
-                color="Predicted Cover Type",
-                title=f"📊 {feature} by Predicted Cover Type",
-                template="plotly_dark",
-                points="all",
-            )
+            stats = _box_summaries(data[feature].to_numpy(), predictions, order, max_outliers=max_outliers)
+            names = [cover_type_map.get(s["key"], "Unknown") for s in stats]
+
+            fig_plotly = go.Figure()
+            for i, (s, name) in enumerate(zip(stats, names)):
+                color = colors[i % len(colors)]
+                fig_plotly.add_trace(go.Box(
+                    x=[name],
+                    q1=[s["q1"]],
+                    median=[s["med"]],
+                    q3=[s["q3"]],
+                    lowerfence=[s["whislo"]],
+                    upperfence=[s["whishi"]],
+                    name=name,
+                    marker_color=color,
+                    whiskerwidth=0.2,
+                    hovertemplate=f"<b>{name}</b><br>n = {s['count']:,}<extra></extra>",
+                ))
+                if len(s["fliers"]):
+                    fig_plotly.add_trace(go.Scatter(
+                        x=[name] * len(s["fliers"]),
+                        y=s["fliers"],
+                        mode="markers",
+                        name=name,
+                        marker=dict(color=color, size=4, opacity=0.6),
+                        hovertemplate=f"<b>%{{x}}</b><br>{feature}: %{{y}}<extra></extra>",
+                    ))
 
-            fig_plotly.update_traces(
-                hovertemplate=f"<b>%{{x}}</b><br>{feature}: %{{y}}<extra></extra>",
-                jitter=0.5,
-                whiskerwidth=0.2,
-            )
             fig_plotly.update_layout(
+                title=f"📊 {feature} by Predicted Cover Type",
+                template="plotly_dark",
                 xaxis_title="Predicted Cover Type",
                 yaxis_title=feature,
                 transition=dict(duration=300, easing="cubic-in-out"),
@@ -322,13 +401,63 @@ def plot_feature_boxplots(data, predictions, cover_type_map, features=None, save
             figs.append(fig_plotly)
 
             if save_path:
-                fig, ax = plt.subplots(figsize=(8, 5))
-                sns.boxplot(x="Predicted Cover Type", y=feature, data=df, palette="Set3", ax=ax)
-                ax.set_title(f"{feature} by Predicted Cover Type")
-                save_matplotlib(fig, save_path)
-                plt.close(fig)
+                with managed_figure(figsize=(8, 5)) as (fig, ax):
+                    bxp_stats = [{**s, "label": name} for s, name in zip(stats, names)]
+                    boxes = ax.bxp(bxp_stats, patch_artist=True, flierprops=dict(marker="o", markersize=3, alpha=0.5))
+                    for i, patch in enumerate(boxes["boxes"]):
+                        patch.set_facecolor(matplotlib.colormaps["Set3"](i % 12))
+                    ax.set_title(f"{feature} by Predicted Cover Type")
+                    ax.set_xlabel("Predicted Cover Type")
+                    ax.set_ylabel(feature)
+                    save_matplotlib(fig, save_path)
 
         return figs
     except Exception as e:
         log_error("viz.plot_feature_boxplots", e)
-        return []
\ No newline at end of file
+        return []
+
+def plot_correlation_heatmap(correlation, labels):
+    try:
+        fig_plotly = go.Figure(go.Heatmap(
+            z=correlation,
+            x=labels,
+            y=labels,
+            zmin=-1,
+            zmax=1,
+            colorscale="RdBu",
+            reversescale=True,
+            hovertemplate="%{y} × %{x}<br>r = %{z:.2f}<extra></extra>",
+        ))
+        fig_plotly.update_layout(
+            title="🔗 Feature Correlations",
+            template="plotly_dark",
+            height=560,
+            xaxis=dict(tickangle=-45),
+        )
+        return fig_plotly
+    except Exception as e:
+        log_error("viz.plot_correlation_heatmap", e)
+        return None
+
+def plot_class_feature_summary(class_profile, feature_index, feature, cover_type_map):
+    """Per-class boxes drawn from precomputed 5/25/50/75/95th percentiles."""
+    try:
+        fig_plotly = go.Figure()
+        for label, q in zip(class_profile["labels"], class_profile["quantiles"]):
+            p05, q1, med, q3, p95 = (row[feature_index] for row in q)
+            fig_plotly.add_trace(go.Box(
+                name=cover_type_map.get(label, str(label)),
+                q1=[q1], median=[med], q3=[q3], lowerfence=[p05], upperfence=[p95],
+                boxpoints=False,
+            ))
+        fig_plotly.update_layout(
+            title=f"📦 {feature} by Cover Type (whiskers: 5th–95th percentile)",
+            template="plotly_dark",
+            xaxis_title="Cover Type",
+            yaxis_title=feature,
+            showlegend=False,
+        )
+        return fig_plotly
+    except Exception as e:
+        log_error("viz.plot_class_feature_summary", e)
+        return None
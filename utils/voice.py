@@ -3,49 +3,30 @@ from streamlit.components.v1 import html
 import base64
 import os
 from utils.logger import log_error
+from utils.assets import publish_asset
+from utils.cache import read_asset_bytes
 
 def add_intro_voice(audio_file_path: str) -> None:
     if not os.path.exists(audio_file_path):
         log_error("Audio file not found", audio_file_path)
         st.warning("⚠️ Intro audio file is missing.")
         return
-    st.markdown(
-        """
-        <style>
-        div.stButton > button {
-            background-color: #0dcaf0;
-            color: #1e1e1e;
-            border-radius: 6px;
-            padding: 6px 14px;
-            font-size: 14px;
-            font-weight: 500;
-            border: none;
-            transition: background-color 0.3s ease;
-        }
-        div.stButton > button:hover {
-            background-color: #0bb2d4;
-            color: #ffffff;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    try:
-        with open(audio_file_path, "rb") as audio_file:
-            audio_bytes = audio_file.read()
-        encoded_audio = base64.b64encode(audio_bytes).decode()
-    except Exception as e:
-        log_error("Failed to load audio file", e)
-        st.warning("⚠️ Could not load intro audio.")
-        return
-
     if st.button("▶️ Play Intro Brief"):
+        # --- Served by URL when static serving is on; only inlined as a fallback ---
+        audio_src = publish_asset(audio_file_path)
+        try:
+            if audio_src is None:
+                audio_src = "data:audio/mp3;base64," + base64.b64encode(read_asset_bytes(audio_file_path)).decode()
+        except Exception as e:
+            log_error("Failed to load audio file", e)
+            st.warning("⚠️ Could not load intro audio.")
+            return
+
         try:
             html(
                 f"""
                 <script>
-                    var audio = new Audio("data:audio/mp3;base64,{encoded_audio}");
+                    var audio = new Audio("{audio_src}");
                     audio.play();
                 </script>
                 """,
@@ -53,4 +34,4 @@ def add_intro_voice(audio_file_path: str) -> None:
             )
         except Exception as e:
             log_error("Failed to play intro audio", e)
-            st.audio(audio_bytes, format="audio/mp3")
\ No newline at end of file
+            st.audio(audio_file_path, format="audio/mp3")
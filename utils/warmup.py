@@ -0,0 +1,120 @@
+import io
+import threading
+import time
+
+import numpy as np
+
+from utils.logger import log_error, log_info
+
+COVER_TYPE_MAP = {
+    1: "Spruce/Fir",
+    2: "Lodgepole Pine",
+    3: "Ponderosa Pine",
+    4: "Cottonwood/Willow",
+    5: "Aspen",
+    6: "Douglas-fir",
+    7: "Krummholz",
+}
+
+_lock = threading.Lock()
+_ready = threading.Event()
+_thread = None
+_status = {"state": "idle", "started": None, "finished": None, "timings": {}, "errors": {}}
+
+
+def _warm_model(model_path):
+    from utils.data import prepare_input_data
+    from utils.model import get_model, predict_cover_type
+    from utils.randomizer import randomize_inputs
+
+    model = get_model(model_path)
+    _, probs = predict_cover_type(model, prepare_input_data(randomize_inputs()))
+    return probs
+
+
+def _warm_single_charts(probs):
+    from utils.viz import plot_patch_grid, plot_prediction_probabilities, plot_probability_radar_chart
+
+    plot_probability_radar_chart(probs, COVER_TYPE_MAP, save_path=io.BytesIO(), preview=False)
+    plot_patch_grid(probs, COVER_TYPE_MAP, save_path=io.BytesIO(), preview=False)
+    fig = plot_prediction_probabilities(probs, COVER_TYPE_MAP, save_path=io.BytesIO(), preview=False)
+    if fig is not None:
+        fig.to_json()
+
+
+def _warm_batch_charts():
+    import pandas as pd
+    from utils.viz import plot_batch_bar_chart, plot_batch_pie_chart, plot_feature_boxplots
+
+    predictions = np.arange(1, 8).repeat(20)
+    data = pd.DataFrame({"Elevation": np.linspace(2000, 3500, len(predictions))})
+    for fig in (
+        plot_batch_bar_chart(predictions, COVER_TYPE_MAP, save_path=io.BytesIO()),
+        plot_batch_pie_chart(predictions, COVER_TYPE_MAP, save_path=io.BytesIO()),
+        *plot_feature_boxplots(data, predictions, COVER_TYPE_MAP, save_path=io.BytesIO(), preview=False),
+    ):
+        if fig is not None:
+            fig.to_json()
+
+
+def _warm_pdf(probs):
+    from utils.pdf import generate_single_patch_pdf
+    from utils.randomizer import randomize_inputs
+
+    generate_single_patch_pdf(
+        user_inputs=randomize_inputs(),
+        predicted_class=int(np.argmax(probs)) + 1,
+        predicted_name=COVER_TYPE_MAP[int(np.argmax(probs)) + 1],
+        probabilities=list(probs),
+        cover_type_map=COVER_TYPE_MAP,
+    )
+
+
+def _run(model_path):
+    _status.update(state="running", started=time.time())
+    probs = np.full(len(COVER_TYPE_MAP), 1 / len(COVER_TYPE_MAP))
+
+    stages = [
+        ("model", lambda: _warm_model(model_path)),
+        ("single_charts", lambda: _warm_single_charts(probs)),
+        ("batch_charts", _warm_batch_charts),
+        ("pdf", lambda: _warm_pdf(probs)),
+    ]
+    for name, stage in stages:
+        start = time.perf_counter()
+        try:
+            result = stage()
+            if name == "model":
+                probs = result
+        except Exception as e:
+            _status["errors"][name] = str(e)
+            log_error(f"warmup.{name}", e)
+        _status["timings"][name] = time.perf_counter() - start
+
+    _status.update(state="ready", finished=time.time())
+    _ready.set()
+    summary = ", ".join(f"{k} {v:.2f}s" for k, v in _status["timings"].items())
+    log_info("warmup", f"Warm-up finished in {_status['finished'] - _status['started']:.2f}s ({summary})")
+
+
+def start_warmup(model_path: str) -> None:
+    """Start the background warm-up once per process; later calls are no-ops."""
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _thread = threading.Thread(target=_run, args=(model_path,), name="warmup", daemon=True)
+        _thread.start()
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def wait_until_ready(timeout: float | None = None) -> bool:
+    return _ready.wait(timeout)
+
+
+def warmup_status() -> dict:
+    """Snapshot of the warm-up state, per-stage timings (seconds) and errors."""
+    return {**_status, "timings": dict(_status["timings"]), "errors": dict(_status["errors"])}